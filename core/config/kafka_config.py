@@ -1,5 +1,6 @@
 import os
-from typing import List
+from typing import Dict, List
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -23,10 +24,52 @@ class KafkaConfig(BaseSettings):
     consumer_group_id: str = "llm-service-group"
     # 오프셋이 없을 때 읽기 시작 위치 (earliest=처음부터, latest=최신부터)
     consumer_auto_offset_reset: str = "latest"  
-    # 오프셋 자동 커밋 여부 (True시 자동으로 읽은 위치 저장)
-    consumer_enable_auto_commit: bool = True
+    # 오프셋 자동 커밋 여부
+    # True: 읽은 위치를 주기적으로 자동 저장 (처리 중 장애 시 메시지 유실 가능)
+    # False: 처리가 끝난 메시지까지만 모아서 커밋 (at-least-once)
+    consumer_enable_auto_commit: bool = False
     # 자동 커밋 간격 (밀리초, 5초마다 오프셋 커밋)
     consumer_auto_commit_interval_ms: int = 5000
+    # at-least-once 모드 커밋 간격 (밀리초) / 이 개수만큼 완료되면 간격과 상관없이 커밋
+    consumer_commit_interval_ms: int = 1000
+    consumer_commit_batch_size: int = 100
+    # 토픽별로 받아 둘 최대 메시지 수 (실행 대기 + 실행 중)
+    consumer_max_in_flight: int = 20
+    # 모든 토픽을 합친 최대 동시 처리 수 (슬롯이 부족하면 토픽 가중치 비율로 배분)
+    consumer_max_in_flight_total: int = 20
+    # 토픽 종류별 가중치 (overview가 가장 먼저 보이는 화면이므로 가장 높게, v1/v2 토픽에 같은 값 사용)
+    consumer_overview_weight: int = 4
+    consumer_idea_weight: int = 2
+    consumer_analysis_weight: int = 1
+    # 토픽 이름별 가중치 (비우면 아래 토픽 설정 값을 키로 위 종류별 가중치를 채우고, 지정한 토픽은 지정한 값 사용)
+    consumer_topic_weights: Dict[str, int] = {}
+    # 메시지 수신 사이 최대 간격 (밀리초, 초과 시 그룹에서 제외되어 리밸런스 발생)
+    consumer_max_poll_interval_ms: int = 300000
+    # Prometheus 메트릭 포트 (워커 프로세스마다 포트 + 워커 번호, 0이면 사용 안 함)
+    consumer_metrics_port: int = 9100
+    # 리포트 파이프라인 단계별 제한 시간 (초)
+    consumer_pipeline_step_timeouts: Dict[str, float] = {
+        "transcript": 120,
+        "summary": 600,
+        "comments_fetch": 300,
+        "classification": 600,
+        "comment_summary": 600,
+        "metrics": 300,
+        "leave_analysis": 600,
+        "optimization": 600,
+        "trends": 600,
+        "ideas": 600,
+    }
+    # 파이프라인 단계 하나가 실패했을 때 나머지 단계 처리 방식 (cancel: 취소 / keep: 끝까지 실행해 결과 저장)
+    consumer_pipeline_failure_policy: str = "keep"
+    # 다른 consumer가 실행 중인 파이프라인 단계를 기다릴 때 완료 이벤트가 없어도 결과를 다시 확인하는 간격 (초)
+    consumer_pipeline_recheck_interval_seconds: float = 30.0
+    # 메시지 처리 선점 유효 시간 (초, 처리 중이던 consumer가 죽으면 이 시간 이후 다른 consumer가 다시 처리)
+    consumer_claim_lease_seconds: int = 1800
+
+    # 재시도 설정
+    # 일시적인 오류 발생 시 재시도 토픽 지연 시간 (초, <topic>.retry.1m -> <topic>.retry.10m -> <topic>.dlq)
+    retry_delays_seconds: List[int] = [60, 600]
   
 
     # 토픽 설정
@@ -39,6 +82,25 @@ class KafkaConfig(BaseSettings):
     analysis_topic_v2: str = "analysis-topic-v2"
     idea_topic_v2: str = "idea-topic-v2"
 
+    # 파이프라인 단계 완료 이벤트 토픽 (모든 consumer 프로세스가 group 없이 구독)
+    report_step_ready_topic: str = "report-step-ready"
+    # 생성 중인 영상 요약(완성된 구간까지) 전달 토픽 (개요 탭에 요약을 먼저 보여주기 위한 용도)
+    report_summary_progress_topic: str = "report-summary-progress"
+
+    @model_validator(mode="after")
+    def _fill_topic_weights(self) -> "KafkaConfig":
+        # 토픽 이름을 환경 변수로 바꿔도 가중치가 유지되도록 설정된 토픽 이름을 키로 사용
+        defaults = {
+            self.overview_topic: self.consumer_overview_weight,
+            self.idea_topic: self.consumer_idea_weight,
+            self.analysis_topic: self.consumer_analysis_weight,
+            self.overview_topic_v2: self.consumer_overview_weight,
+            self.idea_topic_v2: self.consumer_idea_weight,
+            self.analysis_topic_v2: self.consumer_analysis_weight,
+        }
+        self.consumer_topic_weights = {**defaults, **self.consumer_topic_weights}
+        return self
+
     class Config:
         # 환경 변수에서 설정값을 읽어옴
         env_prefix = "KAFKA_"
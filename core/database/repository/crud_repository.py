@@ -3,6 +3,7 @@ from abc import ABC, abstractmethod
 from sqlmodel import SQLModel, select
 from sqlalchemy import update
 from core.config.database_config import MySQLSessionLocal
+from core.utils.metrics import DB_WRITE, observe_stage
 
 
 T = TypeVar("T", bound=SQLModel)
@@ -24,15 +25,20 @@ class CRUDRepository(Generic[T], ABC):
         returns:
             T - 저장된 모델 인스턴스
         """
-        if "id" in data and data["id"] is not None:
-            # UPDATE - 기존 레코드 부분 업데이트
-            return await self._update_partial(data)
-        else:
-            # INSERT - 새 레코드 생성
-            return await self._create_new(data)
+        with observe_stage(DB_WRITE):
+            if "id" in data and data["id"] is not None:
+                # UPDATE - 기존 레코드 부분 업데이트
+                return await self._update_partial(data)
+            else:
+                # INSERT - 새 레코드 생성
+                return await self._create_new(data)
 
     async def save_bulk(self, data_list: List[Dict[str, Any]]) -> List[T]:
         """여러 엔티티를 한 번에 저장"""
+        with observe_stage(DB_WRITE):
+            return await self._save_bulk(data_list)
+
+    async def _save_bulk(self, data_list: List[Dict[str, Any]]) -> List[T]:
         async with MySQLSessionLocal() as session:
             # 딕셔너리를 모델 인스턴스로 변환
             instances = []
@@ -9,6 +9,11 @@ from sqlmodel import SQLModel
 from sqlalchemy import text
 from domain.content_chunk.model.content_chunk import ContentChunk
 from core.enums.source_type import SourceTypeEnum
+from core.utils.metrics import DB_WRITE, EMBEDDING, observe_stage, record_api_error
+from core.utils.quota_state import trip_on_openai_error
+from core.utils import usage_ledger
+from core.utils.rate_limiter import embedding_rate_limiter, estimate_tokens
+import time
 load_dotenv()
 
 T = TypeVar("T", bound=SQLModel)
@@ -42,11 +47,36 @@ class VectorRepository(Generic[T], ABC):
     
     async def generate_embedding(self, text: str) -> List[float]:
         """OpenAI API를 사용해서 텍스트(청크)의 임베딩 생성"""
-        response = await self.openai_client.embeddings.create(
-            model=self.embedding_model,
-            input=text
+        return (await self.generate_embeddings([text]))[0]
+
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """여러 텍스트의 임베딩을 API 호출 한 번으로 생성 (입력 순서와 같은 순서로 반환)"""
+        if not texts:
+            return []
+        reserved = sum(estimate_tokens(text) for text in texts)
+        await embedding_rate_limiter.acquire_tokens(reserved)
+        start = time.perf_counter()
+        try:
+            with observe_stage(EMBEDDING):
+                response = await self.openai_client.embeddings.create(
+                    model=self.embedding_model,
+                    input=texts
+                )
+        except Exception as e:
+            embedding_rate_limiter.settle(0, reserved)
+            record_api_error("openai", e)
+            trip_on_openai_error(e)
+            raise
+        usage = getattr(response, "usage", None)
+        embedding_rate_limiter.settle(getattr(usage, "prompt_tokens", 0) or 0, reserved)
+        usage_ledger.record_usage(
+            usage_ledger.EMBEDDING,
+            getattr(response, "model", None) or self.embedding_model,
+            getattr(usage, "prompt_tokens", 0) or 0,
+            0,
+            time.perf_counter() - start,
         )
-        return response.data[0].embedding
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
     
     def chunk_text(self, text: str, chunk_size: int = 150, overlap: int = 15) -> List[str]:
         """텍스트를 청크로 분할"""
@@ -67,14 +97,15 @@ class VectorRepository(Generic[T], ABC):
 
     async def save(self, data: Dict[str, Any]) -> T:
         
-        async with PGSessionLocal() as session:
-            
-            # 모델 인스턴스 생성
-            instance = self.model_class()(**data)
-            session.add(instance)
-            await session.commit()
-            await session.refresh(instance)
-            return instance
+        with observe_stage(DB_WRITE):
+            async with PGSessionLocal() as session:
+                
+                # 모델 인스턴스 생성
+                instance = self.model_class()(**data)
+                session.add(instance)
+                await session.commit()
+                await session.refresh(instance)
+                return instance
     
     async def save_context(self, source_type: SourceTypeEnum, source_id: int, context: str, meta: Dict[str, any] = None):
         """
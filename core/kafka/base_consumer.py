@@ -1,11 +1,34 @@
+import asyncio
 import logging
-from typing import Any, Dict, Optional, Callable, List
+import time
+from typing import Any, Dict, Iterable, Optional, Callable, Hashable, List, Set, Tuple
 from abc import ABC, abstractmethod
+from aiokafka import AIOKafkaConsumer, ConsumerRecord
+from faststream import Context
 from faststream.kafka import KafkaBroker
+from faststream.kafka.message import KafkaMessage
 from core.config.kafka_config import KafkaConfig
+from core.kafka import retry_policy
+from core.kafka.message import Priority
+from core.kafka.scheduler import WeightedFairScheduler
+from core.kafka.offset_tracker import BatchedOffsetCommitter, CommitOnRevokeListener, OffsetTracker
+from core.kafka.worker_pool import KeyedWorkerPool
+from core.utils import metrics
+from core.utils.quota_state import quota_state
+from core.utils.rate_limiter import request_priority
+from core.utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
+# 메시지 우선순위별 실행 순서 (Message.priority 값 기준)
+PRIORITY_RANKS = {
+    Priority.interactive.value: 0,
+    Priority.bulk.value: 1,
+}
+
+# 요청 한도 상태 확인, 메트릭 갱신 주기 (초)
+WATCH_INTERVAL_SECONDS = 1.0
+
 
 class BaseConsumer(ABC):
     """공통 Kafka Consumer 클래스"""
@@ -16,30 +39,249 @@ class BaseConsumer(ABC):
         # 어떤 토픽을 구독할지 핸들러를 저장하는 딕셔너리
         # 키: 토픽 이름, 값: 메시지 처리 함수
         self._message_handlers: Dict[str, Callable] = {}
+        # 토픽별 워커 풀 (토픽별 작업 수 제한 + report_id 단위 순서 보장)
+        self._worker_pools: Dict[str, KeyedWorkerPool] = {}
+        # 모든 토픽이 공유하는 실행 슬롯 (토픽 가중치 + interactive/bulk 우선순위로 배분)
+        self._scheduler = WeightedFairScheduler(self.config.consumer_max_in_flight_total)
+        # 완료된 메시지까지만 오프셋을 커밋하기 위한 추적기
+        self._offset_tracker = OffsetTracker()
+        # 커밋할 오프셋을 모아서 주기적으로 커밋 (at-least-once 모드)
+        self._offset_committer = BatchedOffsetCommitter(
+            commit_interval_ms=self.config.consumer_commit_interval_ms,
+            commit_batch_size=self.config.consumer_commit_batch_size,
+        )
+        # 토픽별 FastStream subscriber (종료 시 파티션 수신 중단에 사용)
+        self._subscribers: Dict[str, Any] = {}
+        # 구독 토픽(재시도 토픽 포함) -> 핸들러가 등록된 원본 토픽
+        self._subscriber_topics: Dict[str, str] = {}
+        # 토픽별 핸들러가 사용하는 외부 API 리소스 (None이면 모든 리소스)
+        self._topic_resources: Dict[str, Optional[Tuple[str, ...]]] = {}
+        # 요청 한도 초과로 수신을 멈춘 구독 토픽
+        self._quota_paused: Set[str] = set()
+        # 요청 한도 확인 + lag/처리 중 메시지 수 메트릭 갱신 작업
+        self._watch_task: Optional[asyncio.Task] = None
     
-    def register_handler(self, topic: str, handler: Callable[[Dict[str, Any]], None]):
-        """토픽별 메시지 처리 핸들러 등록"""
+    def register_handler(
+        self,
+        topic: str,
+        handler: Callable[[Dict[str, Any]], None],
+        max_in_flight: Optional[int] = None,
+        weight: Optional[int] = None,
+        resources: Optional[Iterable[str]] = None,
+    ):
+        """
+        토픽별 메시지 처리 핸들러 등록
+
+        Args:
+            topic: 구독할 토픽
+            handler: 메시지 처리 함수
+            max_in_flight: 토픽에서 받아 둘 최대 메시지 수 (기본값: KafkaConfig.consumer_max_in_flight)
+            weight: 슬롯이 부족할 때 토픽 간 배분 가중치 (기본값: KafkaConfig.consumer_topic_weights, 없으면 1)
+            resources: 핸들러가 사용하는 외부 API 리소스 (quota_state 리소스 이름, 기본값: 모든 리소스)
+                이 리소스들의 요청 한도를 초과한 동안에만 토픽 수신을 멈추고 처리를 기다림
+        """
+        weight = weight or self.config.consumer_topic_weights.get(topic, 1)
         self._message_handlers[topic] = handler
-        logger.info(f"핸들러 등록됨: {topic}")
+        self._topic_resources[topic] = tuple(resources) if resources is not None else None
+        self._worker_pools[topic] = KeyedWorkerPool(
+            name=topic,
+            max_in_flight=max_in_flight or self.config.consumer_max_in_flight,
+            scheduler=self._scheduler,
+            weight=weight,
+        )
+        logger.info(
+            f"핸들러 등록됨: {topic} "
+            f"(최대 동시 처리: {self._worker_pools[topic].max_in_flight}, 가중치: {weight})"
+        )
     
     async def start_consuming(self, topics: List[str]):
-        """지정된 토픽들에 대한 소비 시작"""
+        """지정된 토픽들에 대한 소비 시작 (재시도 토픽 포함)"""
         for topic in topics:
             if topic in self._message_handlers:
                 await self._subscribe_to_topic(topic)
+                for delay_seconds in self.config.retry_delays_seconds:
+                    await self._subscribe_to_topic(
+                        topic,
+                        source_topic=retry_policy.retry_topic(topic, delay_seconds),
+                        max_poll_interval_ms=max(
+                            self.config.consumer_max_poll_interval_ms,
+                            (delay_seconds + 60) * 1000,
+                        ),
+                    )
             else:
                 logger.warning(f"토픽 {topic}에 대한 핸들러가 없습니다")
+        if self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch_loop())
     
-    async def _subscribe_to_topic(self, topic: str):
-        """특정 토픽 구독 설정"""
+    async def _subscribe_to_topic(
+        self,
+        topic: str,
+        source_topic: Optional[str] = None,
+        max_poll_interval_ms: Optional[int] = None,
+    ):
+        """
+        특정 토픽 구독 설정
+
+        Args:
+            topic: 핸들러가 등록된 원본 토픽
+            source_topic: 실제로 구독할 토픽 (재시도 토픽인 경우 지정, 기본값: topic)
+            max_poll_interval_ms: 메시지 수신 사이 최대 간격 (재시도 대기 시간보다 길어야 함)
+        """
         handler = self._message_handlers[topic]
-        
-        @self.broker.subscriber(topic)
-        async def message_processor(message: Dict[str, Any]):
-            try:
+        pool = self._worker_pools[topic]
+        source_topic = source_topic or topic
+
+        if self.config.consumer_enable_auto_commit:
+            # 자동 커밋 모드: 처리 완료와 관계없이 주기적으로 커밋 (처리 중 장애 시 메시지 유실 가능)
+            commit_options = {
+                "auto_commit": True,
+                "auto_commit_interval_ms": self.config.consumer_auto_commit_interval_ms,
+            }
+        else:
+            # at-least-once 모드: 워커가 처리를 끝낸 메시지까지만 모아서 직접 커밋
+            commit_options = {
+                "auto_commit": False,
+                "no_ack": True,
+                "listener": CommitOnRevokeListener(self._offset_committer),
+            }
+
+        subscriber = self.broker.subscriber(
+            source_topic,
+            group_id=self.config.consumer_group_id,
+            auto_offset_reset=self.config.consumer_auto_offset_reset,
+            max_poll_interval_ms=max_poll_interval_ms or self.config.consumer_max_poll_interval_ms,
+            **commit_options,
+        )
+        self._subscribers[source_topic] = subscriber
+        self._subscriber_topics[source_topic] = topic
+
+        @subscriber
+        async def message_processor(
+            message: Dict[str, Any],
+            kafka_message: KafkaMessage = Context("message"),
+        ):
+            record: ConsumerRecord = kafka_message.raw_message
+            headers = kafka_message.headers
+
+            # 재시도 메시지는 예정된 시각까지 대기 (재시도 토픽은 시간 순서로 쌓이므로 앞 메시지만 기다리면 됨)
+            wait_seconds = retry_policy.seconds_until_due(headers)
+            if wait_seconds > 0:
+                logger.info(f"재시도 대기: {source_topic}, {wait_seconds:.0f}초 후 처리")
+                await asyncio.sleep(wait_seconds)
+
+            if not self.config.consumer_enable_auto_commit:
+                self._offset_tracker.track(record.topic, record.partition, record.offset)
+
+            # 풀에 빈 슬롯이 생길 때까지 대기 후 바로 다음 메시지 수신
+            await pool.submit(
+                key=self._message_key(message),
+                job=lambda: self._run_handler(topic, message, handler, headers),
+                on_done=lambda: self._commit_offset(kafka_message.consumer, record),
+                priority=self._message_priority(message),
+            )
+
+    def _message_key(self, message: Dict[str, Any]) -> Optional[Hashable]:
+        """순서를 보장할 메시지 키 (같은 보고서의 메시지는 순서대로 처리)"""
+        if isinstance(message, dict):
+            return message.get("report_id")
+        return None
+
+    def _message_priority(self, message: Dict[str, Any]) -> int:
+        """메시지 우선순위 (interactive: 0, bulk: 1 / 작을수록 먼저 실행)"""
+        priority = message.get("priority") if isinstance(message, dict) else None
+        return PRIORITY_RANKS.get(priority, 0)
+
+    async def _run_handler(
+        self,
+        topic: str,
+        message: Dict[str, Any],
+        handler: Callable,
+        headers: Optional[Dict[str, Any]] = None,
+    ):
+        """워커에서 실행되는 메시지 처리 단위"""
+        step = message.get("step", "unknown") if isinstance(message, dict) else "unknown"
+        start = time.perf_counter()
+        outcome = "success"
+        try:
+            # 수신을 멈추기 전에 받아 둔 메시지도 토픽이 사용하는 리소스의 요청 한도가 풀릴 때까지 기다렸다가 처리
+            await quota_state.wait_until_available(self._topic_resources.get(topic))
+            start = time.perf_counter()
+            # 메시지 하나가 trace 하나 (report_id, task_id는 하위 구간에도 전달)
+            # OpenAI 요청 한도 대기열에서도 메시지 우선순위(interactive 먼저) 적용
+            with tracer.span(f"consume {topic}", topic=topic, step=step) as span, request_priority(self._message_priority(message)):
+                if isinstance(message, dict):
+                    for key in ("report_id", "task_id"):
+                        if message.get(key) is not None:
+                            span.set_trace_attribute(key, message[key])
                 await self._process_message(topic, message, handler)
+        except Exception as e:
+            outcome = "error"
+            await self._handle_error(topic, message, e, headers)
+        finally:
+            metrics.HANDLER_DURATION.labels(topic, step, outcome).observe(time.perf_counter() - start)
+
+    def _assigned_consumers(self, source_topics: Optional[Iterable[str]] = None) -> List[AIOKafkaConsumer]:
+        """파티션을 할당받은 aiokafka consumer 목록 (source_topics: 구독 토픽 제한, 기본값: 전체)"""
+        consumers = []
+        for source_topic in self._subscribers if source_topics is None else source_topics:
+            consumer = getattr(self._subscribers.get(source_topic), "consumer", None)
+            if isinstance(consumer, AIOKafkaConsumer) and consumer.assignment():
+                consumers.append(consumer)
+        return consumers
+
+    async def _watch_loop(self):
+        """주기적으로 요청 한도 상태를 반영하고 메트릭 갱신"""
+        while True:
+            await asyncio.sleep(WATCH_INTERVAL_SECONDS)
+            self._apply_quota_backpressure()
+            try:
+                await self._record_metrics()
             except Exception as e:
-                await self._handle_error(topic, message, e)
+                logger.debug(f"메트릭 갱신 실패: {e!r}")
+
+    async def _record_metrics(self):
+        """파티션별 lag, 토픽별 처리 중 메시지 수 갱신"""
+        for topic, pool in self._worker_pools.items():
+            metrics.MESSAGES_IN_FLIGHT.labels(topic).set(pool.in_flight)
+        for consumer in self._assigned_consumers():
+            for tp in consumer.assignment():
+                highwater = consumer.highwater(tp)
+                if highwater is None:
+                    continue
+                position = await consumer.position(tp)
+                metrics.CONSUMER_LAG.labels(tp.topic, str(tp.partition)).set(max(0, highwater - position))
+
+    def _apply_quota_backpressure(self):
+        """
+        외부 API 요청 한도를 초과한 동안 그 리소스를 사용하는 토픽만 파티션 수신을 멈추고, 대기 시간이 끝나면 다시 수신
+
+        (예: YouTube Analytics 일일 할당량 초과가 OpenAI만 사용하는 토픽의 수신을 멈추지 않도록 함)
+        """
+        for source_topic, topic in self._subscriber_topics.items():
+            remaining = quota_state.remaining(self._topic_resources.get(topic))
+            if remaining > 0:
+                # 리밸런스로 새로 할당받은 파티션도 멈추도록 매번 확인
+                for consumer in self._assigned_consumers([source_topic]):
+                    unpaused = consumer.assignment() - consumer.paused()
+                    if unpaused:
+                        consumer.pause(*unpaused)
+                if source_topic not in self._quota_paused:
+                    self._quota_paused.add(source_topic)
+                    logger.warning(f"⏸️ 요청 한도 초과로 메시지 수신 중단: {source_topic} ({remaining:.0f}초 후 재개)")
+            elif source_topic in self._quota_paused:
+                for consumer in self._assigned_consumers([source_topic]):
+                    consumer.resume(*consumer.assignment())
+                self._quota_paused.discard(source_topic)
+                logger.info(f"▶️ 요청 한도 대기 종료, 메시지 수신 재개: {source_topic}")
+
+    async def _commit_offset(self, consumer: Any, record: ConsumerRecord):
+        """완료된 메시지까지 연속으로 끝난 지점이 앞으로 이동했으면 커밋 대상으로 등록"""
+        if self.config.consumer_enable_auto_commit:
+            return
+        committable = self._offset_tracker.complete(record.topic, record.partition, record.offset)
+        if committable is None or not isinstance(consumer, AIOKafkaConsumer):
+            return
+        await self._offset_committer.mark(consumer, record.topic, record.partition, committable)
     
     async def _process_message(
         self, 
@@ -64,18 +306,85 @@ class BaseConsumer(ABC):
         """메시지 유효성 검증 (서브클래스에서 오버라이드 가능)"""
         return isinstance(message, dict) and len(message) > 0
     
-    async def _handle_error(self, topic: str, message: Dict[str, Any], error: Exception):
-        """에러 처리"""
-        logger.error(f"메시지 처리 실패: {topic}, 오류: {error}")
-        
-        
-        
+    async def _handle_error(
+        self,
+        topic: str,
+        message: Dict[str, Any],
+        error: Exception,
+        headers: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        에러 처리
+
+        - 일시적인 오류: 다음 재시도 토픽(<topic>.retry.1m, <topic>.retry.10m ...)으로 발행
+        - 재시도 소진 또는 영구적인 오류: DLQ(<topic>.dlq)로 발행 후 _on_dead_letter 호출
+        - DLQ 발행까지 실패: 예외를 다시 발생시켜 오프셋을 완료 처리하지 않음
+          (커밋 지점이 이 메시지를 넘지 않으므로 재시작/리밸런스 후 다시 전달됨, at-least-once)
+        """
+        logger.error(f"메시지 처리 실패: {topic}, 오류: {error!r}")
+
+        attempt = retry_policy.get_attempt(headers)
+        delays = self.config.retry_delays_seconds
+        key = self._message_key(message)
+        key_bytes = str(key).encode() if key is not None else None
+
+        if retry_policy.is_transient_error(error) and attempt < len(delays):
+            delay_seconds = delays[attempt]
+            target_topic = retry_policy.retry_topic(topic, delay_seconds)
+            try:
+                await self.broker.publish(
+                    message,
+                    topic=target_topic,
+                    key=key_bytes,
+                    headers=retry_policy.retry_headers(topic, attempt + 1, delay_seconds, error),
+                )
+                logger.warning(f"🔁 재시도 토픽으로 이동: {target_topic} (시도 {attempt + 1}/{len(delays)})")
+                return
+            except Exception as e:
+                logger.error(f"재시도 토픽 발행 실패: {target_topic}, 오류: {e!r}")
+
+        target_topic = retry_policy.dead_letter_topic(topic)
+        try:
+            await self.broker.publish(
+                message,
+                topic=target_topic,
+                key=key_bytes,
+                headers={
+                    retry_policy.ATTEMPT_HEADER: str(attempt),
+                    retry_policy.ORIGINAL_TOPIC_HEADER: topic,
+                    retry_policy.ERROR_HEADER: repr(error)[:500],
+                },
+            )
+            logger.error(f"☠️ DLQ로 이동: {target_topic} (재시도 {attempt}회 후 실패)")
+        except Exception as e:
+            logger.error(f"DLQ 발행 실패, 오프셋을 커밋하지 않고 재전달을 기다림: {target_topic}, 오류: {e!r}")
+            raise
+
+        # 메시지는 이미 DLQ에 있으므로 후처리 실패로 원본 메시지를 다시 처리하지 않음
+        try:
+            await self._on_dead_letter(topic, message, error)
+        except Exception as e:
+            logger.error(f"DLQ 후처리 실패: {topic}, 오류: {e!r}")
+
+    async def _on_dead_letter(self, topic: str, message: Dict[str, Any], error: Exception):
+        """메시지가 최종 실패했을 때 호출 (서브클래스에서 오버라이드 가능)"""
+        pass
+
+
     async def stop_consuming(self):
         """소비 중단"""
         logger.info("Consumer 중단")
         # FastStream은 브로커 close로 처리됨
+        # 새 메시지 수신을 멈추고, 처리 중인 메시지는 끝까지 처리하고 오프셋을 커밋한 뒤 종료
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            self._watch_task = None
+        for consumer in self._assigned_consumers():
+            consumer.pause(*consumer.assignment())
+        for pool in self._worker_pools.values():
+            await pool.drain()
+        await self._offset_committer.close()
     
     
     
     
-
@@ -2,7 +2,7 @@ import json
 import logging
 import asyncio
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from faststream.kafka import KafkaBroker
 from core.config.kafka_config import KafkaConfig
 from core.kafka.message import Message
@@ -61,6 +61,71 @@ class BaseProducer:
         
         return False
 
+    async def send_batch(
+        self,
+        messages: List[Tuple[str, Message]]
+    ) -> bool:
+        """
+        여러 메시지를 동시에 Kafka 토픽에 발행 (재시도 로직 공유)
+
+        모든 메시지를 한 번에 발행하고, 실패한 메시지만 모아서 지수 백오프로 다시 발행합니다.
+        producer가 메시지를 한 배치로 묶어 보내므로 브로커 왕복이 메시지 수만큼 늘어나지 않습니다.
+
+        Args:
+            messages: (토픽, 메시지) 목록
+
+        Returns:
+            모든 메시지 발행 성공 시 True
+        """
+        pending = [
+            (topic, self.add_metadata(message.model_dump()), self._message_key(message))
+            for topic, message in messages
+        ]
+
+        for attempt in range(self.config.producer_retries):
+            results = await asyncio.gather(
+                *[
+                    self.broker.publish(message=enriched_message, topic=topic, key=key)
+                    for topic, enriched_message, key in pending
+                ],
+                return_exceptions=True
+            )
+
+            failed = [
+                (item, result) for item, result in zip(pending, results)
+                if isinstance(result, Exception)
+            ]
+            if not failed:
+                logger.info(
+                    f"✅ 메시지 일괄 발행 성공: {[topic for topic, _ in messages]} "
+                    f"(시도 {attempt + 1}/{self.config.producer_retries})"
+                )
+                return True
+
+            pending = [item for item, _ in failed]
+            failed_topics = [topic for topic, _, _ in pending]
+            if attempt < self.config.producer_retries - 1:
+                retry_delay = 2 ** attempt  # 지수 백오프: 1초, 2초, 4초...
+                logger.warning(
+                    f"⚠️ 메시지 일괄 발행 일부 실패: {failed_topics}, "
+                    f"시도 {attempt + 1}/{self.config.producer_retries}, "
+                    f"오류: {failed[0][1]}, "
+                    f"{retry_delay}초 후 재시도..."
+                )
+                await asyncio.sleep(retry_delay)
+            else:
+                logger.error(
+                    f"❌ 메시지 일괄 발행 최종 실패: {failed_topics}, "
+                    f"모든 재시도 소진 ({self.config.producer_retries}회), "
+                    f"오류: {failed[0][1]}"
+                )
+
+        return False
+
+    def _message_key(self, message: Message) -> bytes:
+        """파티션 키 (같은 보고서의 메시지는 같은 파티션으로)"""
+        return str(message.report_id).encode()
+
     def add_metadata(self, message: Dict[str, Any]) -> Dict[str, Any]:
         """메시지에 공통 메타데이터 추가"""
         return {
@@ -2,6 +2,19 @@ from faststream.kafka import KafkaBroker
 from core.config.kafka_config import kafka_config
 
 
+def _producer_acks(acks: str):
+    """acks 설정값 변환 ("all" 또는 0, 1)"""
+    return acks if acks == "all" else int(acks)
+
+
+def _compression_type(compression_type: str):
+    """압축 방식 설정값 변환 ("none"이면 압축 안함)"""
+    return None if compression_type in ("", "none") else compression_type
+
 
 # 전역 Kafka Broker 설정 (기존 인스턴스 사용)
-kafka_broker = KafkaBroker(kafka_config.bootstrap_servers)
\ No newline at end of file
+kafka_broker = KafkaBroker(
+    kafka_config.bootstrap_servers,
+    acks=_producer_acks(kafka_config.producer_acks),
+    compression_type=_compression_type(kafka_config.producer_compression_type),
+)
\ No newline at end of file
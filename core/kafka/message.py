@@ -10,6 +10,12 @@ class Step(Enum):
     idea= "idea"
 
 
+class Priority(Enum):
+    """메시지 처리 우선순위"""
+    interactive = "interactive"  # 사용자가 요청한 보고서 (먼저 처리)
+    bulk = "bulk"  # 재분석, DLQ 재처리 등 일괄 작업
+
+
 class Message(BaseModel):
     """Kafka 메시지의 기본 클래스"""
     task_id: int
@@ -17,5 +23,6 @@ class Message(BaseModel):
     step: Step
     google_access_token: Optional[str] = None
     skip_vector_save: Optional[bool] = False
+    priority: Priority = Priority.interactive
 
 
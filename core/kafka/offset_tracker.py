@@ -0,0 +1,140 @@
+import asyncio
+import heapq
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+from aiokafka import ConsumerRebalanceListener, TopicPartition
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionOffsetTracker:
+    """
+    파티션 하나의 처리 중인 오프셋을 추적하는 클래스
+
+    워커 풀에서는 메시지가 순서와 상관없이 끝나기 때문에,
+    '앞의 메시지가 전부 끝난 지점'까지만 커밋해야 재시작 시 메시지가 유실되지 않습니다.
+    """
+
+    def __init__(self):
+        # 아직 커밋 기준선을 넘지 못한 오프셋들 (최소 힙)
+        self._pending: List[int] = []
+        # 처리가 끝났지만 앞 오프셋이 남아 있어 커밋하지 못한 오프셋들
+        self._done: Set[int] = set()
+        # 마지막으로 계산된 커밋 가능 오프셋 (다음에 읽을 오프셋)
+        self.committable: Optional[int] = None
+
+    def track(self, offset: int):
+        """처리 시작한 오프셋 등록"""
+        heapq.heappush(self._pending, offset)
+
+    def complete(self, offset: int) -> Optional[int]:
+        """
+        처리 완료한 오프셋 반영
+
+        Returns:
+            커밋 기준선이 앞으로 이동했으면 새 커밋 오프셋, 아니면 None
+        """
+        self._done.add(offset)
+
+        advanced = None
+        while self._pending and self._pending[0] in self._done:
+            finished = heapq.heappop(self._pending)
+            self._done.discard(finished)
+            advanced = finished + 1
+
+        if advanced is not None:
+            self.committable = advanced
+        return advanced
+
+    @property
+    def in_flight(self) -> int:
+        """아직 커밋되지 않은 오프셋 수"""
+        return len(self._pending)
+
+
+class OffsetTracker:
+    """(토픽, 파티션)별 PartitionOffsetTracker 모음"""
+
+    def __init__(self):
+        self._partitions: Dict[Tuple[str, int], PartitionOffsetTracker] = {}
+
+    def track(self, topic: str, partition: int, offset: int):
+        self._partitions.setdefault((topic, partition), PartitionOffsetTracker()).track(offset)
+
+    def complete(self, topic: str, partition: int, offset: int) -> Optional[int]:
+        tracker = self._partitions.get((topic, partition))
+        if tracker is None:
+            return None
+        return tracker.complete(offset)
+
+
+class BatchedOffsetCommitter:
+    """
+    커밋 가능한 오프셋을 모아 두었다가 한 번에 커밋하는 클래스
+
+    메시지마다 커밋하면 브로커 왕복이 많아지므로,
+    commit_batch_size 개가 쌓이거나 commit_interval_ms 가 지나면 파티션별 최신 오프셋만 커밋합니다.
+    """
+
+    def __init__(self, commit_interval_ms: int, commit_batch_size: int):
+        self.commit_interval_ms = commit_interval_ms
+        self.commit_batch_size = commit_batch_size
+        # consumer별 {TopicPartition: 커밋할 오프셋}
+        self._pending: Dict[Any, Dict[TopicPartition, int]] = {}
+        self._pending_count = 0
+        self._lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def mark(self, consumer: Any, topic: str, partition: int, offset: int):
+        """커밋할 오프셋 등록 (배치 크기를 넘으면 즉시 커밋)"""
+        self._ensure_flush_loop()
+        partitions = self._pending.setdefault(consumer, {})
+        partitions[TopicPartition(topic, partition)] = offset
+        self._pending_count += 1
+        if self._pending_count >= self.commit_batch_size:
+            await self.flush()
+
+    async def flush(self):
+        """모아 둔 오프셋 커밋"""
+        async with self._lock:
+            pending, self._pending = self._pending, {}
+            self._pending_count = 0
+            for consumer, offsets in pending.items():
+                if not offsets:
+                    continue
+                try:
+                    await consumer.commit(offsets)
+                    logger.debug(f"오프셋 커밋: {offsets}")
+                except Exception as e:
+                    # 리밸런스 중에는 커밋이 실패할 수 있음 (재할당 후 재전달되고, 중복 처리는 consumer에서 방지)
+                    logger.warning(f"오프셋 커밋 실패: {offsets}, 오류: {e!r}")
+
+    def _ensure_flush_loop(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.commit_interval_ms / 1000)
+            if self._pending_count:
+                await self.flush()
+
+    async def close(self):
+        """남은 오프셋을 커밋하고 주기적 커밋 중단"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+
+class CommitOnRevokeListener(ConsumerRebalanceListener):
+    """파티션이 회수되기 전에 모아 둔 오프셋을 커밋하는 리밸런스 리스너"""
+
+    def __init__(self, committer: BatchedOffsetCommitter):
+        self.committer = committer
+
+    async def on_partitions_revoked(self, revoked):
+        await self.committer.flush()
+
+    async def on_partitions_assigned(self, assigned):
+        pass
@@ -0,0 +1,113 @@
+import time
+from typing import Any, Dict, List, Optional
+
+# 재시도 메시지 헤더
+ATTEMPT_HEADER = "x-retry-attempt"  # 지금까지 재시도한 횟수
+NOT_BEFORE_HEADER = "x-retry-not-before"  # 이 시각(epoch ms) 이후에 처리
+ORIGINAL_TOPIC_HEADER = "x-original-topic"  # 최초 수신 토픽
+ERROR_HEADER = "x-error"  # 마지막 실패 사유
+
+# 일시적인 네트워크/한도 초과 오류로 보는 예외 이름
+TRANSIENT_ERROR_NAMES = {
+    "ConnectTimeout",
+    "ReadTimeout",
+    "WriteTimeout",
+    "PoolTimeout",
+    "ConnectError",
+    "ConnectionError",
+    "TimeoutError",
+    "RemoteProtocolError",
+    "RateLimitError",
+    "APITimeoutError",
+    "APIConnectionError",
+    "InternalServerError",
+}
+
+# 다시 시도하면 성공할 수 있는 HTTP 상태 코드
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """예외에서 HTTP 상태 코드 추출 (FastAPI HTTPException, OpenAI, Google API 오류)"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "resp", None), "status", None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """재시도하면 성공할 수 있는 일시적인 오류인지 판단 (원인 예외까지 확인)"""
+    current: Optional[BaseException] = error
+    for _ in range(5):
+        if current is None:
+            break
+        if current.__class__.__name__ in TRANSIENT_ERROR_NAMES:
+            return True
+        if _status_code(current) in TRANSIENT_STATUS_CODES:
+            return True
+        # 일일 할당량 초과처럼 재개 시각을 알려 준 오류 (예: 403 quotaExceeded)
+        if (getattr(current, "headers", None) or {}).get("Retry-After"):
+            return True
+        current = current.__cause__
+    return False
+
+
+def delay_label(seconds: int) -> str:
+    """재시도 지연 시간을 토픽 접미사로 변환 (60 -> 1m, 600 -> 10m, 3600 -> 1h)"""
+    if seconds % 3600 == 0:
+        return f"{seconds // 3600}h"
+    if seconds % 60 == 0:
+        return f"{seconds // 60}m"
+    return f"{seconds}s"
+
+
+def retry_topic(topic: str, delay_seconds: int) -> str:
+    """재시도 토픽 이름 (예: overview-topic-v2.retry.1m)"""
+    return f"{topic}.retry.{delay_label(delay_seconds)}"
+
+
+def dead_letter_topic(topic: str) -> str:
+    """DLQ 토픽 이름 (예: overview-topic-v2.dlq)"""
+    return f"{topic}.dlq"
+
+
+def retry_headers(topic: str, attempt: int, delay_seconds: int, error: BaseException) -> Dict[str, str]:
+    """재시도 토픽으로 보낼 메시지 헤더 생성"""
+    return {
+        ATTEMPT_HEADER: str(attempt),
+        NOT_BEFORE_HEADER: str(int((time.time() + delay_seconds) * 1000)),
+        ORIGINAL_TOPIC_HEADER: topic,
+        ERROR_HEADER: repr(error)[:500],
+    }
+
+
+def get_attempt(headers: Optional[Dict[str, Any]]) -> int:
+    """헤더에서 재시도 횟수 조회 (없으면 0)"""
+    value = (headers or {}).get(ATTEMPT_HEADER)
+    if isinstance(value, bytes):
+        value = value.decode()
+    try:
+        return int(value) if value is not None else 0
+    except ValueError:
+        return 0
+
+
+def seconds_until_due(headers: Optional[Dict[str, Any]]) -> float:
+    """재시도 메시지를 처리하기까지 남은 시간(초)"""
+    value = (headers or {}).get(NOT_BEFORE_HEADER)
+    if isinstance(value, bytes):
+        value = value.decode()
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, int(value) / 1000 - time.time())
+    except ValueError:
+        return 0.0
+
+
+def retry_tiers(topic: str, delays_seconds: List[int]) -> List[str]:
+    """토픽의 재시도 토픽 목록 (지연 시간 순서)"""
+    return [retry_topic(topic, delay) for delay in delays_seconds]
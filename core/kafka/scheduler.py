@@ -0,0 +1,96 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class WeightedFairScheduler:
+    """
+    여러 토픽(레인)이 공유하는 처리 슬롯 스케줄러
+
+    - 전체 동시 처리 수를 max_in_flight 로 제한합니다.
+    - 슬롯이 부족하면 레인별 가중치 비율로 슬롯을 배분합니다. (stride scheduling)
+      예: overview 4, idea 2, analysis 1 이면 대기 중인 작업이 모두 있을 때 4:2:1 비율로 실행
+    - 우선순위 값이 작은 작업(interactive)이 큰 작업(bulk)보다 항상 먼저 실행됩니다.
+      대기 중인 bulk 작업은 새로 들어온 interactive 작업에 자리를 양보합니다. (실행 중인 작업은 중단하지 않음)
+    """
+
+    def __init__(self, max_in_flight: int):
+        self.max_in_flight = max_in_flight
+        self._in_flight = 0
+        self._weights: Dict[str, int] = {}
+        # 레인별 가상 시간 (실행할 때마다 1/가중치 만큼 증가, 가장 작은 레인이 다음 차례)
+        self._pass: Dict[str, float] = {}
+        self._virtual_time = 0.0
+        # 레인별 대기열: (우선순위, 순번, future)
+        self._waiters: Dict[str, List[Tuple[int, int, asyncio.Future]]] = {}
+        self._sequence = itertools.count()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for waiters in self._waiters.values() for _, _, future in waiters if not future.done())
+
+    def register_lane(self, lane: str, weight: int = 1):
+        """레인(토픽) 등록"""
+        self._weights[lane] = max(1, weight)
+        self._pass.setdefault(lane, self._virtual_time)
+        self._waiters.setdefault(lane, [])
+
+    async def acquire(self, lane: str, priority: int = 0):
+        """처리 슬롯 획득 (차례가 올 때까지 대기)"""
+        if lane not in self._weights:
+            self.register_lane(lane)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self._waiters[lane], (priority, next(self._sequence), future))
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 슬롯을 받은 직후 취소된 경우 반납
+                self.release()
+            else:
+                future.cancel()
+            raise
+
+    def release(self):
+        """처리 슬롯 반납"""
+        self._in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        while self._in_flight < self.max_in_flight:
+            lane = self._next_lane()
+            if lane is None:
+                return
+            _, _, future = heapq.heappop(self._waiters[lane])
+            self._in_flight += 1
+            self._virtual_time = self._pass[lane]
+            self._pass[lane] += 1.0 / self._weights[lane]
+            future.set_result(None)
+
+    def _next_lane(self):
+        """우선순위가 가장 높은 작업이 있는 레인 중 가상 시간이 가장 작은 레인 선택"""
+        candidates = []
+        for lane, waiters in self._waiters.items():
+            # 취소된 대기 작업 정리
+            while waiters and waiters[0][2].done():
+                heapq.heappop(waiters)
+            if waiters:
+                # 오래 쉬던 레인이 밀린 가상 시간으로 슬롯을 독점하지 않도록 보정
+                self._pass[lane] = max(self._pass[lane], self._virtual_time)
+                candidates.append((waiters[0][0], self._pass[lane], lane))
+
+        if not candidates:
+            return None
+        return min(candidates)[2]
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+from core.kafka.scheduler import WeightedFairScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class KeyedWorkerPool:
+    """
+    동시 처리 개수를 제한하는 토픽별 워커 풀
+
+    - 최대 max_in_flight 개의 메시지를 동시에 처리합니다.
+    - 같은 키(report_id)의 메시지는 들어온 순서대로 하나씩 처리합니다.
+    - 풀이 가득 차면 submit이 대기하므로 구독 루프에 자연스럽게 배압이 걸립니다.
+    - scheduler를 지정하면 실제 실행 슬롯은 다른 토픽과 공유하는 스케줄러에서 가중치/우선순위에 따라 받습니다.
+      (이 경우 max_in_flight는 토픽별로 받아 둘 수 있는 작업 수(대기 + 실행) 상한)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_in_flight: int,
+        scheduler: Optional[WeightedFairScheduler] = None,
+        weight: int = 1,
+    ):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.scheduler = scheduler
+        if scheduler is not None:
+            scheduler.register_lane(name, weight)
+        self._slots = asyncio.Semaphore(max_in_flight)
+        # 키별 마지막 작업 (같은 키의 다음 작업은 이 작업이 끝난 뒤 실행)
+        self._key_tails: Dict[Hashable, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def in_flight(self) -> int:
+        """현재 처리 중(대기 포함)인 작업 수"""
+        return len(self._tasks)
+
+    async def submit(
+        self,
+        key: Optional[Hashable],
+        job: Callable[[], Awaitable[Any]],
+        on_done: Optional[Callable[[], Awaitable[None]]] = None,
+        priority: int = 0,
+    ) -> asyncio.Task:
+        """
+        작업을 풀에 등록 (빈 슬롯이 생길 때까지 대기)
+
+        Args:
+            key: 순서를 보장할 키 (None이면 순서 보장 없음)
+            job: 실행할 코루틴 함수
+            on_done: 작업이 예외 없이 끝난 뒤 호출할 콜백 (오프셋 커밋 등)
+                작업이 예외로 끝나면 호출하지 않으므로 오프셋이 커밋되지 않고 메시지가 다시 전달됨
+            priority: 스케줄러 우선순위 (작을수록 먼저 실행)
+        """
+        await self._slots.acquire()
+
+        previous = self._key_tails.get(key) if key is not None else None
+        task = asyncio.create_task(self._run(key, previous, job, on_done, priority))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        if key is not None:
+            self._key_tails[key] = task
+        return task
+
+    async def _run(
+        self,
+        key: Optional[Hashable],
+        previous: Optional[asyncio.Task],
+        job: Callable[[], Awaitable[Any]],
+        on_done: Optional[Callable[[], Awaitable[None]]],
+        priority: int,
+    ):
+        acquired = False
+        succeeded = False
+        try:
+            # 같은 키의 이전 작업이 끝날 때까지 대기 (이전 작업의 실패는 무시)
+            if previous is not None and not previous.done():
+                await asyncio.wait([previous])
+            if self.scheduler is not None:
+                await self.scheduler.acquire(self.name, priority)
+                acquired = True
+            await job()
+            succeeded = True
+        except Exception as e:
+            logger.error(f"[{self.name}] 워커 작업 실패, 완료 처리하지 않음 (key={key}): {e!r}")
+        finally:
+            if acquired:
+                self.scheduler.release()
+            self._slots.release()
+            if key is not None and self._key_tails.get(key) is asyncio.current_task():
+                del self._key_tails[key]
+            if succeeded and on_done is not None:
+                try:
+                    await on_done()
+                except Exception as e:
+                    logger.error(f"[{self.name}] 작업 완료 콜백 실패 (key={key}): {e!r}")
+
+    async def drain(self):
+        """처리 중인 모든 작업이 끝날 때까지 대기"""
+        while self._tasks:
+            logger.info(f"[{self.name}] 처리 중인 작업 {len(self._tasks)}개 완료 대기")
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
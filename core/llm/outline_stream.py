@@ -0,0 +1,81 @@
+import re
+
+# 개요 구간 제목 줄 (I. 도입 (0:00 - 0:25), II. ..., 줄 앞의 마크다운 #, * 허용)
+_SECTION_HEADER = re.compile(r"^[ \t#*]*[IVXLC]+\.[ \t]", re.MULTILINE)
+# 구간 제목의 번호 부분 (번호를 다시 매길 때 사용)
+_SECTION_NUMBER = re.compile(r"^([ \t#*]*)[IVXLC]+\.(?=[ \t])", re.MULTILINE)
+
+
+class OutlineStreamBuffer:
+    """
+    스트리밍으로 받는 영상 요약(I., II., ... 구간 개요)을 구간 단위로 모으는 버퍼
+
+    다음 구간 제목이 나오면 앞 구간이 완성된 것으로 보고, completed_text는 완성된 구간까지의 요약을 반환합니다.
+    (마지막 구간은 응답이 끝난 뒤 text로 확인)
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.sections = 0
+        self._completed_end = 0
+        self._header_seen = False
+        # 아직 확인하지 않은 위치 (줄 단위로 확인하므로 마지막 줄바꿈 다음부터)
+        self._scan_from = 0
+
+    def feed(self, chunk: str) -> int:
+        """응답 조각 추가 후 새로 완성된 구간 수 반환"""
+        self.text += chunk
+        # 제목 줄이 끝까지 들어온 뒤에 확인 (II 까지만 받은 상태에서 I. 로 잘못 보지 않도록)
+        scan_to = self.text.rfind("\n") + 1
+        if scan_to <= self._scan_from:
+            return 0
+        completed = 0
+        for match in _SECTION_HEADER.finditer(self.text, self._scan_from, scan_to):
+            if self._header_seen:
+                self._completed_end = match.start()
+                completed += 1
+            self._header_seen = True
+        self._scan_from = scan_to
+        self.sections += completed
+        return completed
+
+    @property
+    def completed_text(self) -> str:
+        """완성된 구간까지의 요약 (아직 완성된 구간이 없으면 빈 문자열)"""
+        return self.text[:self._completed_end].strip()
+
+
+_ROMAN_NUMERALS = ((100, "C"), (90, "XC"), (50, "L"), (40, "XL"), (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I"))
+
+
+def _to_roman(number: int) -> str:
+    result = ""
+    for value, numeral in _ROMAN_NUMERALS:
+        count, number = divmod(number, value)
+        result += numeral * count
+    return result
+
+
+class OutlineMerger:
+    """
+    자막 구간별로 따로 만든 개요(I., II., ...)를 하나의 개요로 합치는 도구
+
+    구간 순서대로 add()에 넣으면 번호를 이어서 다시 매긴 개요 조각을 반환합니다.
+    (첫 구간 앞의 안내 문장은 유지하고, 이후 구간의 안내 문장은 제외)
+    """
+
+    def __init__(self):
+        self.sections = 0
+
+    def add(self, outline: str) -> str:
+        first = _SECTION_HEADER.search(outline)
+        if first is None:
+            # 구간 제목이 없는 응답은 그대로 이어 붙임
+            return outline.strip() + "\n\n"
+        body = outline[first.start():] if self.sections else outline
+        renumbered = _SECTION_NUMBER.sub(self._renumber, body)
+        return renumbered.strip() + "\n\n"
+
+    def _renumber(self, match: "re.Match[str]") -> str:
+        self.sections += 1
+        return f"{match.group(1)}{_to_roman(self.sections)}."
@@ -69,8 +69,43 @@ II. 글쓰기와 재능 (0:25 - 0:59)
             질문: {input}
             문서 내용: {context}
             답변:""".strip()
-    
-    
+
+    @staticmethod
+    def get_comment_batch_reaction_prompt() -> str:
+        """여러 댓글을 한 번에 분류하는 댓글 반응 분석용 프롬프트 템플릿"""
+        return """
+            당신은 유튜브 댓글을 분석 전문 AI입니다.
+            문서 내용으로 id와 content를 가진 댓글 목록(JSON 배열)이 주어집니다. 각 댓글의 감정을 분석하고 결과 배열을 items에 담아 백틱(```)이나 설명 없이 순수 JSON으로 출력하세요.
+
+            반드시 지켜야 할 지침:
+
+            - 댓글의 감정은 긍정, 부정, 중립,조언 및 의견으로 분류해주세요. (긍정: 1, 부정: 2, 중립: 3, 조언 및 의견: 4)
+            - 입력된 모든 댓글에 대해 id당 정확히 하나의 결과를 입력 순서대로 출력하세요.
+            - id는 입력 값을 그대로 사용하고, 댓글 내용은 출력하지 마세요.
+            - JSON 외의 다른 설명 문장은 포함하지 마세요.
+
+            출력 포맷 요구 항목:
+
+            id: 입력 댓글의 id
+            emotion: 댓글의 감정 상태 숫자 (긍정: 1, 부정: 2, 중립: 3, 조언 및 의견: 4)
+
+            출력 예시 (JSON 형식):
+            {{
+                "items": [
+                    {{"id": 0, "emotion": 1}},
+                    {{"id": 1, "emotion": 4}}
+                ]
+            }}
+
+            주의사항:
+            - 반드시 주석(// 등) 없이 유효한 JSON 형식으로만 출력
+            - 백틱(```)이나 추가 설명 없이 JSON만 출력
+
+            질문: {input}
+            문서 내용: {context}
+            답변:""".strip()
+
+
 
     @staticmethod
     def get_sumarlize_comment_prompt() -> str:
@@ -83,18 +118,20 @@ II. 글쓰기와 재능 (0:25 - 0:59)
 
         - content에는 해당 댓글들의 주요한 내용을 담아서 제공해주세요
         - content에 들어가는 글자는 최대 74자까지만 제공해주세요
-        - 리스트의 요소는 최대 5개 까지만 제공하세요.
+        - items 리스트의 요소는 최대 5개 까지만 제공하세요.
 
         출력 포맷 요구 항목:
 
 
         출력 예시 (JSON 형식):
-        [
-            {{ "content": "많은 사용자들이 영상 내용에 크게 공감하며 감동을 받았다는 반응을 보였습니다." }},
-            {{ "content": "댓글에는 "이 영상 덕분에 위로받았다"는 반응이 많았습니다." }},
-            {{ "content": "진정성 있는 이야기와 현실적인 사례에 공감한 사용자가 많았고, “마치 내 얘기 같았다”, “마음이 편해졌다”와 같은 반응이 반복적으로 등장했습니다." }},
-            {{ "content": "많은 사용자들이 영상 내용에 크게 공감하며 감동을 받았다는 반응을 보였습니다. 특히 진정성 있는 메시지와 따뜻한 연출에 호평이 많았고, 일부는 ‘눈물났다’, ‘위로받았다’는 표현으로 감정을 표현했습니다." }},
-        ]
+        {{
+            "items": [
+                {{ "content": "많은 사용자들이 영상 내용에 크게 공감하며 감동을 받았다는 반응을 보였습니다." }},
+                {{ "content": "댓글에는 "이 영상 덕분에 위로받았다"는 반응이 많았습니다." }},
+                {{ "content": "진정성 있는 이야기와 현실적인 사례에 공감한 사용자가 많았고, “마치 내 얘기 같았다”, “마음이 편해졌다”와 같은 반응이 반복적으로 등장했습니다." }},
+                {{ "content": "많은 사용자들이 영상 내용에 크게 공감하며 감동을 받았다는 반응을 보였습니다. 특히 진정성 있는 메시지와 따뜻한 연출에 호평이 많았고, 일부는 ‘눈물났다’, ‘위로받았다’는 표현으로 감정을 표현했습니다." }}
+            ]
+        }}
 
         주의사항:
         - 반드시 주석(// 등) 없이 유효한 JSON 형식으로만 출력
@@ -179,16 +216,16 @@ II. 글쓰기와 재능 (0:25 - 0:59)
             "2) 개선 방안 제안에 활용할 설명\n"
             "3) 예상 편집 흐름 제시에 활용할 설명\n\n"
             "출력은 입력 리스트와 동일한 순서와 개수를 유지하며, 각 항목에 대해 "
-            "[설명 텍스트, 대사 시작 시간(초), 대사 종료 시간(초)] 형태의 리스트로 1:1 대응해야 합니다.\n"
+            "{{\"text\": 설명 텍스트, \"start_time\": 대사 시작 시간(초), \"end_time\": 대사 종료 시간(초)}} 형태의 객체로 1:1 대응해야 합니다.\n"
             "각 설명은 1~3문장(약 30~100단어)으로 핵심 내용을 간결하고 명확하게 요약해 주세요.\n\n"
             "앞뒤 청킹 간 연관성과 문맥을 고려하여 자연스럽고 통일성 있는 설명이 되도록 하며,\n"
             "생성된 설명은 의미 기반 임베딩의 컨텍스트로 바로 활용될 예정임을 참고 바랍니다.\n\n"
             "응답 예시:\n"
-            "[\n"
-            "  [\"설명 텍스트 1\", 시작 시간 1, 종료 시간 1],\n"
-            "  [\"설명 텍스트 2\", 시작 시간 2, 종료 시간 2],\n"
+            "{{\"items\": [\n"
+            "  {{\"text\": \"설명 텍스트 1\", \"start_time\": 시작 시간 1, \"end_time\": 종료 시간 1}},\n"
+            "  {{\"text\": \"설명 텍스트 2\", \"start_time\": 시작 시간 2, \"end_time\": 종료 시간 2}},\n"
             "  ...\n"
-            "]\n"
+            "]}}\n"
             "\n"
             "질문: {input}\n"
             "문서 내용: {context}"
@@ -258,14 +295,16 @@ II. 글쓰기와 재능 (0:25 - 0:59)
 
 ## 출력 JSON 형식:
 ```json
-[
-    {{
-        "title": "아이디어 제목",
-        "description": "아이디어 상세 내용",
-        "tags": ["태그1", "태그2", "태그3"]
-    }},
-]
-'''
+{{
+    "items": [
+        {{
+            "title": "아이디어 제목",
+            "description": "아이디어 상세 내용",
+            "tags": ["태그1", "태그2", "태그3"]
+        }}
+    ]
+}}
+```
 
 ## 질문 :
 {input_data['query']}
@@ -0,0 +1,46 @@
+from typing import List, Literal
+
+from pydantic import BaseModel, Field
+
+'''
+LLM 응답 스키마 (OpenAI structured output - JSON schema로 응답 형식을 강제)
+- 모든 응답은 {"items": [...]} 형태 (최상위가 객체여야 하므로 배열을 items로 감쌈)
+- 응답이 잘려도 완성된 항목은 사용할 수 있도록 core.llm.structured_output.PartialArrayParser 로 항목 단위 파싱
+'''
+
+
+class CommentEmotion(BaseModel):
+    id: int = Field(description="입력 댓글의 id")
+    emotion: Literal[1, 2, 3, 4] = Field(description="감정 코드 (1: 긍정, 2: 부정, 3: 중립, 4: 조언 및 의견)")
+
+
+class CommentEmotionBatch(BaseModel):
+    items: List[CommentEmotion]
+
+
+class CommentSummary(BaseModel):
+    content: str = Field(description="댓글 요약 문장")
+
+
+class CommentSummaryList(BaseModel):
+    items: List[CommentSummary]
+
+
+class Idea(BaseModel):
+    title: str = Field(description="아이디어 제목")
+    description: str = Field(description="아이디어 상세 내용")
+    tags: List[str] = Field(description="추천 태그")
+
+
+class IdeaList(BaseModel):
+    items: List[Idea]
+
+
+class MeaningChunk(BaseModel):
+    text: str = Field(description="구간 대사의 의미를 설명하는 텍스트")
+    start_time: float = Field(description="대사 시작 시간(초)")
+    end_time: float = Field(description="대사 종료 시간(초)")
+
+
+class MeaningChunkList(BaseModel):
+    items: List[MeaningChunk]
@@ -0,0 +1,107 @@
+import json
+import logging
+import re
+import typing
+from typing import Any, Generic, List, Optional, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+# 응답 앞부분에서 항목 배열이 시작하는 위치 ({"items": [ 또는 최상위 배열 [)
+_ARRAY_START = re.compile(r'"items"\s*:\s*\[|^\s*(?:```(?:json)?\s*)?\[')
+
+
+def item_model(response_model: Type[BaseModel]) -> Type[BaseModel]:
+    """{"items": List[X]} 응답 스키마의 항목 모델 X"""
+    annotation = response_model.model_fields["items"].annotation
+    (model,) = typing.get_args(annotation)
+    return model
+
+
+class PartialArrayParser(Generic[T]):
+    """
+    LLM 응답의 items 배열을 항목 단위로 파싱하는 점진 파서
+
+    - 스트리밍 응답은 받은 조각을 feed()에 차례로 넣으면 완성된 항목만 바로 반환
+      (이미 읽은 부분은 다시 파싱하지 않음)
+    - 길이 제한 등으로 응답이 중간에 끊겨도 끊기기 전에 완성된 항목은 사용
+    - 항목 스키마에 맞지 않는 항목은 버리고 invalid 개수에 기록
+    """
+
+    def __init__(self, model: Type[T]):
+        self.model = model
+        self.items: List[T] = []
+        self.invalid = 0
+        self.completed = False
+        self._buffer = ""
+        self._position = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._item_start: Optional[int] = None
+
+    def feed(self, text: str) -> List[T]:
+        """응답 조각을 추가하고 새로 완성된 항목 반환"""
+        self._buffer += text
+        if not self._started:
+            match = _ARRAY_START.search(self._buffer)
+            if match is None:
+                return []
+            self._started = True
+            self._position = match.end()
+        new_items: List[T] = []
+        while self._position < len(self._buffer) and not self.completed:
+            item = self._step(self._buffer[self._position])
+            self._position += 1
+            if item is not None:
+                new_items.append(item)
+        self.items.extend(new_items)
+        return new_items
+
+    def _step(self, char: str) -> Optional[T]:
+        if self._in_string:
+            if self._escaped:
+                self._escaped = False
+            elif char == "\\":
+                self._escaped = True
+            elif char == '"':
+                self._in_string = False
+            return None
+        if char == '"':
+            self._in_string = True
+        elif char in "{[":
+            if self._depth == 0:
+                self._item_start = self._position
+            self._depth += 1
+        elif char in "}]":
+            if self._depth == 0:
+                # items 배열이 닫힘
+                self.completed = True
+                return None
+            self._depth -= 1
+            if self._depth == 0:
+                return self._parse_item(self._buffer[self._item_start:self._position + 1])
+        return None
+
+    def _parse_item(self, raw: str) -> Optional[T]:
+        try:
+            return self.model.model_validate(json.loads(raw))
+        except (json.JSONDecodeError, ValidationError) as e:
+            self.invalid += 1
+            logger.debug(f"[structured output] {self.model.__name__} 항목 파싱 실패: {e!r}")
+            return None
+
+
+def parse_items(text: Any, model: Type[T]) -> List[T]:
+    """완성된(또는 끊긴) 응답 문자열에서 항목 목록 추출"""
+    parser = PartialArrayParser(model)
+    parser.feed(text if isinstance(text, str) else str(text or ""))
+    if not parser.completed:
+        logger.warning(f"[structured output] {model.__name__} 응답이 끝나지 않아 완성된 항목 {len(parser.items)}개만 사용")
+    if parser.invalid:
+        logger.warning(f"[structured output] {model.__name__} 스키마에 맞지 않는 항목 {parser.invalid}개 제외")
+    return parser.items
@@ -0,0 +1,78 @@
+import asyncio
+import re
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+
+from core.utils.rate_limiter import estimate_tokens
+
+# 정리된 자막 줄 끝의 시간 범위 ("안녕하세요. (0:08 - 0:13)")
+_LINE_TIME_RANGE = re.compile(r"\((\d+:\d{2}(?::\d{2})?)\s*-\s*(\d+:\d{2}(?::\d{2})?)\)\s*$")
+
+
+def split_transcript(transcript: str, token_budget: int) -> List[str]:
+    """
+    정리된 자막을 토큰 예산(token_budget) 안의 구간들로 나눔
+
+    자막 줄(타임스탬프 단위) 경계에서만 나누며, 예산보다 긴 줄 하나는 그 자체로 한 구간이 됩니다.
+    """
+    segments: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for line in transcript.splitlines():
+        if not line.strip():
+            continue
+        tokens = estimate_tokens(line)
+        if current and current_tokens + tokens > token_budget:
+            segments.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(line)
+        current_tokens += tokens
+    if current:
+        segments.append("\n".join(current))
+    return segments
+
+
+def segment_time_range(segment: str) -> Optional[Tuple[str, str]]:
+    """구간의 (첫 줄 시작 시간, 마지막 줄 종료 시간) (타임스탬프가 없으면 None)"""
+    lines = segment.splitlines()
+    first = _LINE_TIME_RANGE.search(lines[0]) if lines else None
+    last = _LINE_TIME_RANGE.search(lines[-1]) if lines else None
+    if first is None or last is None:
+        return None
+    return first.group(1), last.group(2)
+
+
+def plan_segments(transcript: str, single_shot_budget: int, segment_budget: int) -> List[str]:
+    """
+    자막 요약 방식 결정
+
+    Returns:
+        자막이 single_shot_budget 토큰 이하면 [자막], 넘으면 segment_budget 토큰 단위로 나눈 구간 목록
+    """
+    if estimate_tokens(transcript) <= single_shot_budget:
+        return [transcript]
+    return split_transcript(transcript, segment_budget)
+
+
+async def amap_segments(
+    segments: List[str],
+    summarize: Callable[[int, str], Awaitable[str]],
+    concurrency: int,
+) -> AsyncIterator[str]:
+    """
+    구간별 요약(summarize(index, segment))을 concurrency개까지 동시에 실행하고 구간 순서대로 반환
+
+    앞 구간이 늦게 끝나도 순서를 유지하며, 중간에 실패하거나 소비를 멈추면 남은 구간 요약은 취소합니다.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(index: int, segment: str) -> str:
+        async with semaphore:
+            return await summarize(index, segment)
+
+    tasks = [asyncio.create_task(run(index, segment)) for index, segment in enumerate(segments)]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
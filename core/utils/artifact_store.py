@@ -0,0 +1,191 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 원본 데이터 종류
+TRANSCRIPT = "transcript"  # 자막 (youtube_transcript_api)
+VIDEO_DETAILS = "video_details"  # 영상 상세 정보 (YouTube Data API videos.list)
+
+# 현재 처리 중인 리포트 ID (리포트마다 원본 데이터를 따로 보관, 리포트 밖에서는 보관하지 않음)
+_report_scope: ContextVar[Optional[int]] = ContextVar("artifact_report_scope", default=None)
+
+# 보관 시간 (초, 한 리포트의 overview / analysis / idea 메시지가 모두 처리되는 동안 재사용)
+ARTIFACT_TTL_SECONDS = float(os.getenv("ARTIFACT_STORE_TTL_SECONDS", "3600"))
+# 메모리에 보관할 최대 항목 수 (초과 시 가장 오래 사용하지 않은 항목부터 삭제)
+ARTIFACT_MAX_ENTRIES = int(os.getenv("ARTIFACT_STORE_MAX_ENTRIES", "256"))
+# 디스크 보관 경로 (설정하면 프로세스 재시작이나 다른 워커 프로세스에서도 재사용)
+ARTIFACT_STORE_DIR = os.getenv("ARTIFACT_STORE_DIR")
+
+
+@contextmanager
+def artifact_scope(report_id: Optional[int]) -> Iterator[None]:
+    """
+    블록 안의 원본 데이터 조회를 report_id 리포트 단위로 보관
+
+    contextvars로 전달되므로 블록 안에서 만든 asyncio task, asyncio.to_thread 호출에도 적용됩니다.
+    """
+    token = _report_scope.set(report_id)
+    try:
+        yield
+    finally:
+        _report_scope.reset(token)
+
+
+class ArtifactStore:
+    """
+    리포트 ID + 영상 ID + 데이터 종류 단위로 YouTube 원본 데이터를 보관하는 저장소
+
+    - 같은 리포트를 처리하는 여러 단계(요약, 이탈 분석, 최적화 분석 등)가 같은 자막/영상 정보를 다시 조회하지 않도록 함
+    - 리포트(artifact_scope)마다 따로 보관하므로 다른 리포트나 다시 생성한 리포트는 최신 데이터를 새로 조회 (리포트 밖의 호출은 보관하지 않음)
+    - 메모리에 보관하고, directory를 지정하면 JSON 파일로도 보관
+    - 같은 항목을 동시에 요청하면 한 번만 조회하고 나머지는 그 결과를 기다림 (스레드 안전)
+    - 빈 결과(조회 실패)는 보관하지 않으므로 다음 요청에서 다시 조회
+    - 조회 중에는 블로킹되므로 코루틴에서는 asyncio.to_thread로 호출 (이벤트 루프를 막지 않도록)
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = ARTIFACT_TTL_SECONDS,
+        max_entries: int = ARTIFACT_MAX_ENTRIES,
+        directory: Optional[str] = ARTIFACT_STORE_DIR,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries: "OrderedDict[Tuple[int, str, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # 항목별 조회 잠금과 그 잠금을 사용 중인 요청 수 (사용하는 요청이 없으면 삭제)
+        self._key_locks: Dict[Tuple[int, str, str], List[Any]] = {}
+
+    def get_or_fetch(self, video_id: str, kind: str, fetch: Callable[[], Any]) -> Any:
+        """
+        현재 리포트(artifact_scope)에 보관 중인 데이터를 반환하고, 없으면 fetch()로 조회해 보관
+
+        Args:
+            video_id: YouTube 영상 ID
+            kind: 데이터 종류 (TRANSCRIPT, VIDEO_DETAILS 등)
+            fetch: 원본 데이터 조회 함수 (JSON으로 저장 가능한 값 반환)
+        """
+        report_id = _report_scope.get()
+        if report_id is None:
+            return fetch()
+
+        key = (report_id, video_id, kind)
+        with self._lock:
+            holder = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            holder[1] += 1
+        try:
+            with holder[0]:
+                value = self.get(video_id, kind)
+                if value is not None:
+                    return value
+
+                value = fetch()
+                if value:
+                    self.put(video_id, kind, value)
+                return value
+        finally:
+            with self._lock:
+                holder[1] -= 1
+                if holder[1] == 0:
+                    self._key_locks.pop(key, None)
+
+    def get(self, video_id: str, kind: str) -> Optional[Any]:
+        """현재 리포트에 보관 중인 데이터 조회 (리포트 밖이거나, 없거나, 보관 시간이 지났으면 None)"""
+        report_id = _report_scope.get()
+        if report_id is None:
+            return None
+        key = (report_id, video_id, kind)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+
+        value = self._read_file(report_id, video_id, kind, now)
+        if value is not None:
+            with self._lock:
+                self._remember(key, now, value)
+        return value
+
+    def put(self, video_id: str, kind: str, value: Any):
+        """현재 리포트에 데이터 보관 (리포트 밖에서는 보관하지 않음)"""
+        report_id = _report_scope.get()
+        if report_id is None:
+            return
+        now = time.time()
+        with self._lock:
+            self._remember((report_id, video_id, kind), now, value)
+        self._write_file(report_id, video_id, kind, value)
+
+    def discard(self, report_id: int):
+        """리포트의 모든 데이터 삭제"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == report_id]:
+                del self._entries[key]
+        if self.directory:
+            report_dir = self._report_dir(report_id)
+            for root, _, names in os.walk(report_dir, topdown=False):
+                for name in names:
+                    os.remove(os.path.join(root, name))
+                os.rmdir(root)
+
+    def _remember(self, key: Tuple[int, str, str], stored_at: float, value: Any):
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _report_dir(self, report_id: int) -> str:
+        return os.path.join(self.directory, str(int(report_id)))
+
+    def _video_dir(self, report_id: int, video_id: str) -> str:
+        # 영상 ID는 경로에 그대로 쓰지 않도록 허용된 문자만 남김
+        safe_id = "".join(ch for ch in video_id if ch.isalnum() or ch in "-_")
+        return os.path.join(self._report_dir(report_id), safe_id)
+
+    def _read_file(self, report_id: int, video_id: str, kind: str, now: float) -> Optional[Any]:
+        if not self.directory:
+            return None
+        path = os.path.join(self._video_dir(report_id, video_id), f"{kind}.json")
+        try:
+            if now - os.path.getmtime(path) >= self.ttl_seconds:
+                return None
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"원본 데이터 파일 읽기 실패 ({path}): {e!r}")
+            return None
+
+    def _write_file(self, report_id: int, video_id: str, kind: str, value: Any):
+        if not self.directory:
+            return
+        video_dir = self._video_dir(report_id, video_id)
+        path = os.path.join(video_dir, f"{kind}.json")
+        try:
+            os.makedirs(video_dir, exist_ok=True)
+            # 다른 프로세스가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"원본 데이터 파일 저장 실패 ({path}): {e!r}")
+
+
+# 전역에서 사용할 원본 데이터 저장소 (싱글톤 패턴)
+artifact_store = ArtifactStore()
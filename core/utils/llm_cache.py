@@ -0,0 +1,171 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import Generation
+
+from core.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# LLM 응답 캐시 설정 (false면 캐시 없이 매번 호출)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+# SQLite 파일 경로 (같은 호스트의 consumer 프로세스들이 같은 파일을 공유)
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3")
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+# 최대 보관 개수 (넘으면 가장 오래 사용하지 않은 응답부터 삭제)
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+
+# 현재 context에서 캐시 조회를 건너뛸지 여부 (다시 생성 요청 등)
+_bypass: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+
+
+@contextmanager
+def bypass_llm_cache(enabled: bool = True) -> Iterator[None]:
+    """
+    블록 안의 LLM 호출은 캐시를 조회하지 않고 새로 호출 (새 응답으로 캐시는 갱신)
+
+    contextvars로 전달되므로 블록 안에서 만든 asyncio task, asyncio.to_thread 호출에도 적용됩니다.
+    """
+    token = _bypass.set(enabled)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def llm_cache_bypassed() -> bool:
+    """현재 context가 bypass_llm_cache 블록 안인지 여부 (섹션 결과 캐시 등 다른 캐시도 조회를 건너뛰도록 함)"""
+    return _bypass.get()
+
+
+class SqliteLLMCache(BaseCache):
+    """
+    LLM 응답 캐시 (LangChain 캐시 인터페이스 - ChatOpenAI(cache=...)로 모든 invoke/ainvoke 호출에 적용)
+
+    - 키: (모델/temperature 등 LLM 설정 문자열, 완성된 프롬프트)의 해시
+    - 보관 시간(ttl_seconds)이 지난 응답은 사용하지 않고, max_entries를 넘으면 가장 오래 사용하지 않은 응답부터 삭제
+    - SQLite WAL 모드 + busy timeout으로 여러 consumer 프로세스가 같은 파일을 함께 사용
+    - 캐시 오류는 로그만 남기고 LLM을 그대로 호출 (캐시 때문에 리포트 생성이 실패하지 않도록 함)
+    """
+
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH,
+        ttl_seconds: int = LLM_CACHE_TTL_SECONDS,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # sqlite3 연결은 스레드 사이에 공유하지 않음
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(json.dumps([llm_string, prompt]).encode()).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        if llm_cache_bypassed():
+            metrics.LLM_CACHE_REQUESTS.labels("bypass").inc()
+            return None
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        try:
+            conn = self._connect()
+            row = conn.execute("SELECT value FROM llm_cache WHERE key = ? AND expires_at > ?", (key, now)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+                generations = [loads(item, allowed_objects="core") for item in json.loads(row[0])]
+        except Exception as e:
+            logger.warning(f"[llm cache] 조회 실패: {e!r}")
+            row = None
+        if row is None:
+            metrics.LLM_CACHE_REQUESTS.labels("miss").inc()
+            return None
+        metrics.LLM_CACHE_REQUESTS.labels("hit").inc()
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        try:
+            value = json.dumps([dumps(generation) for generation in return_val])
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl_seconds, now),
+            )
+            self._evict(conn, now)
+        except Exception as e:
+            logger.warning(f"[llm cache] 저장 실패: {e!r}")
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """만료된 응답과 max_entries를 넘는 오래 사용하지 않은 응답 삭제"""
+        conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+        conn.execute(
+            """
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        )
+
+    def clear(self, **kwargs: Any) -> None:
+        self._connect().execute("DELETE FROM llm_cache")
+
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        return await asyncio.to_thread(self.lookup, prompt, llm_string)
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        await asyncio.to_thread(self.update, prompt, llm_string, return_val)
+
+    async def aclear(self, **kwargs: Any) -> None:
+        await asyncio.to_thread(self.clear)
+
+
+def create_llm_cache() -> Optional[SqliteLLMCache]:
+    """설정 값으로 LLM 응답 캐시 생성 (LLM_CACHE_ENABLED=false거나 파일을 열 수 없으면 None)"""
+    if not LLM_CACHE_ENABLED:
+        return None
+    try:
+        return SqliteLLMCache()
+    except Exception as e:
+        logger.warning(f"[llm cache] {LLM_CACHE_PATH} 를 열 수 없어 캐시 없이 실행합니다: {e!r}")
+        return None
+
+
+# 전역에서 사용할 LLM 응답 캐시 인스턴스 (싱글톤 패턴)
+llm_cache = create_llm_cache()
@@ -0,0 +1,180 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest, start_http_server
+
+from core.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+'''
+Prometheus 메트릭 모음
+- FastAPI 서버: GET /metrics
+- Kafka Consumer: KAFKA_CONSUMER_METRICS_PORT (워커 프로세스마다 포트 + 워커 번호)
+'''
+
+# 세부 단계 이름 (report_stage_duration_seconds 의 stage 라벨)
+TRANSCRIPT_FETCH = "transcript_fetch"
+LLM_CALL = "llm_call"
+EMBEDDING = "embedding"
+DB_WRITE = "db_write"
+
+CONSUMER_LAG = Gauge(
+    "kafka_consumer_lag",
+    "파티션별 아직 읽지 않은 메시지 수 (high watermark - 현재 위치)",
+    ["topic", "partition"],
+)
+MESSAGES_IN_FLIGHT = Gauge(
+    "kafka_messages_in_flight",
+    "토픽별 워커 풀에서 대기 중이거나 처리 중인 메시지 수",
+    ["topic"],
+)
+HANDLER_DURATION = Histogram(
+    "report_handler_duration_seconds",
+    "메시지 핸들러 처리 시간",
+    ["topic", "step", "outcome"],
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1200),
+)
+STAGE_DURATION = Histogram(
+    "report_stage_duration_seconds",
+    "세부 단계 처리 시간 (자막 조회, LLM 호출, 임베딩, DB 저장)",
+    ["stage"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+SUB_STEP_DURATION = Histogram(
+    "report_sub_step_duration_seconds",
+    "동시에 실행하는 세부 단계(overview의 summary/comments/metrics 등)별 처리 시간",
+    ["step", "sub_step", "outcome"],
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600),
+)
+SECTION_CACHE_REQUESTS = Counter(
+    "report_section_cache_requests_total",
+    "리포트 섹션 결과 캐시 조회 수 (result: hit / miss / bypass)",
+    ["section", "result"],
+)
+SUMMARY_FIRST_CONTENT = Histogram(
+    "report_summary_first_content_seconds",
+    "스트리밍 요약 생성 시작부터 첫 구간을 리포트에 저장하기까지 걸린 시간",
+    buckets=(0.5, 1, 2, 3, 5, 10, 20, 30, 60),
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "LLM / 임베딩 호출 토큰 수 (type: prompt / completion)",
+    ["kind", "model", "step", "type"],
+)
+LLM_COST = Counter(
+    "llm_cost_usd_total",
+    "LLM / 임베딩 호출 예상 비용 (USD)",
+    ["kind", "model", "step"],
+)
+LLM_REQUEST_DURATION = Histogram(
+    "llm_request_duration_seconds",
+    "모델별 LLM / 임베딩 호출 시간",
+    ["kind", "model", "step"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+LLM_CACHE_REQUESTS = Counter(
+    "llm_cache_requests_total",
+    "LLM 응답 캐시 조회 수 (result: hit / miss / bypass)",
+    ["result"],
+)
+SEMANTIC_CACHE_REQUESTS = Counter(
+    "semantic_cache_requests_total",
+    "임베딩 기반 근사 중복 캐시 조회 수 (result: exact_hit / hit / miss)",
+    ["cache", "result"],
+)
+SEMANTIC_CACHE_SIMILARITY = Histogram(
+    "semantic_cache_similarity",
+    "임베딩 기반 근사 중복 캐시 조회 시 가장 가까운 항목의 코사인 유사도",
+    ["cache"],
+    buckets=(0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.92, 0.94, 0.96, 0.98, 1.0),
+)
+SEMANTIC_CACHE_THRESHOLD = Gauge(
+    "semantic_cache_threshold",
+    "임베딩 기반 근사 중복 캐시의 재사용 유사도 기준",
+    ["cache"],
+)
+RATE_LIMIT_WAITING = Gauge(
+    "openai_rate_limit_waiting",
+    "OpenAI 요청 한도 대기열에서 기다리는 요청 수",
+    ["limiter"],
+)
+RATE_LIMIT_WAIT_DURATION = Histogram(
+    "openai_rate_limit_wait_seconds",
+    "OpenAI 요청 한도 대기 시간 (priority: 0 interactive, 1 bulk)",
+    ["limiter", "priority"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+EXTERNAL_API_ERRORS = Counter(
+    "external_api_errors_total",
+    "외부 API 오류 수",
+    ["service", "status"],
+)
+
+
+@contextmanager
+def observe_stage(stage: str):
+    """블록 실행 시간을 세부 단계 히스토그램과 tracing 구간에 기록"""
+    start = time.perf_counter()
+    try:
+        with tracer.span(stage):
+            yield
+    finally:
+        STAGE_DURATION.labels(stage).observe(time.perf_counter() - start)
+
+
+def error_status(error: BaseException) -> str:
+    """예외에서 상태 코드 추출 (없으면 예외 이름)"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "resp", None), "status", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return str(status) if status is not None else error.__class__.__name__
+
+
+def record_api_error(service: str, status: Any):
+    """외부 API 오류 수 증가 (status: 상태 코드 또는 예외)"""
+    if isinstance(status, BaseException):
+        status = error_status(status)
+    EXTERNAL_API_ERRORS.labels(service, str(status)).inc()
+
+
+def metrics_response() -> Tuple[bytes, str]:
+    """현재 프로세스의 메트릭 (본문, Content-Type)"""
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int):
+    """별도 HTTP 서버로 메트릭 노출 (Kafka Consumer 프로세스용)"""
+    start_http_server(port)
+    logger.info(f"📈 메트릭 서버 시작: http://0.0.0.0:{port}/metrics")
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """LangChain LLM 호출 시간과 오류를 기록하는 콜백"""
+
+    def __init__(self):
+        self._started: Dict[UUID, float] = {}
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: Any, *, run_id: UUID, **kwargs: Any) -> Any:
+        self._started[run_id] = time.perf_counter()
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any) -> Any:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> Any:
+        self._observe(run_id)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> Any:
+        self._observe(run_id)
+        record_api_error("openai", error)
+
+    def _observe(self, run_id: UUID):
+        start: Optional[float] = self._started.pop(run_id, None)
+        if start is not None:
+            STAGE_DURATION.labels(LLM_CALL).observe(time.perf_counter() - start)
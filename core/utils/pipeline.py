@@ -0,0 +1,262 @@
+import asyncio
+import hashlib
+import json
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from core.utils.step_events import StepEventHub, step_events
+from core.utils.step_group import CANCEL, StepOutcome, run_step_graph
+from core.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# 저장된 단계 결과 상태
+STEP_IN_PROGRESS = "in_progress"
+STEP_COMPLETED = "completed"
+STEP_FAILED = "failed"
+
+
+@dataclass
+class PipelineStep:
+    """파이프라인 단계 정의"""
+    name: str
+    # {의존 단계 이름: 결과}를 받아 결과(JSON으로 저장 가능한 값)를 반환
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    inputs: List[str] = field(default_factory=list)
+    # 결과에 영향을 주는 설정 값 (바뀌면 저장된 결과를 다시 쓰지 않음)
+    params: Dict[str, Any] = field(default_factory=dict)
+    # 단계 로직이 바뀌면 올려서 저장된 결과를 무효화
+    version: int = 1
+
+
+@dataclass
+class StoredStepResult:
+    """저장소에 기록된 단계 결과"""
+    status: str
+    fingerprint: str
+    output: Optional[str] = None
+
+
+class StepResultStore(ABC):
+    """단계 결과 저장소 (여러 consumer가 같은 실행의 단계를 나눠 처리할 수 있도록 선점 기능 포함)"""
+
+    @abstractmethod
+    async def find(self, run_id: int, step: str) -> Optional[StoredStepResult]:
+        """저장된 단계 결과 조회"""
+
+    @abstractmethod
+    async def claim(self, run_id: int, step: str, fingerprint: str, lease_seconds: int) -> bool:
+        """
+        단계 실행 권한 선점
+
+        처음 실행하거나, FAILED 이거나, 선점 시간이 지났거나, 입력이 바뀐(fingerprint가 다른) 완료 결과일 때만 성공
+        """
+
+    @abstractmethod
+    async def save(self, run_id: int, step: str, fingerprint: str, status: str, output: Optional[str] = None):
+        """단계 결과 저장"""
+
+    @abstractmethod
+    async def delete(self, run_id: int, steps: Iterable[str]):
+        """단계 결과 삭제 (다음 실행 때 다시 실행)"""
+
+
+class InMemoryStepResultStore(StepResultStore):
+    """프로세스 메모리에 단계 결과를 저장하는 저장소 (로컬 실행/재생 하네스용, 선점 시간은 적용하지 않음)"""
+
+    def __init__(self):
+        self._results: Dict[tuple, StoredStepResult] = {}
+
+    async def find(self, run_id: int, step: str) -> Optional[StoredStepResult]:
+        return self._results.get((run_id, step))
+
+    async def claim(self, run_id: int, step: str, fingerprint: str, lease_seconds: int) -> bool:
+        stored = self._results.get((run_id, step))
+        if stored is None or stored.status == STEP_FAILED or (
+            stored.status == STEP_COMPLETED and stored.fingerprint != fingerprint
+        ):
+            self._results[(run_id, step)] = StoredStepResult(STEP_IN_PROGRESS, fingerprint)
+            return True
+        return False
+
+    async def save(self, run_id: int, step: str, fingerprint: str, status: str, output: Optional[str] = None):
+        self._results[(run_id, step)] = StoredStepResult(status, fingerprint, output)
+
+    async def delete(self, run_id: int, steps: Iterable[str]):
+        for step in steps:
+            self._results.pop((run_id, step), None)
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, ensure_ascii=False, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class Pipeline:
+    """
+    단계별 입력/출력을 선언한 DAG를 실행하는 클래스
+
+    - 의존하는 단계가 끝난 단계는 바로 시작하므로 서로 독립적인 단계는 동시에 실행됩니다.
+    - 각 단계의 결과는 저장소에 저장되고, 입력(의존 단계 결과 + params + version)이 같으면 다시 실행하지 않고 재사용합니다.
+      따라서 재시도 시에는 실패했거나 입력이 바뀐(무효화된) 단계만 다시 실행됩니다.
+    - 다른 consumer가 같은 단계를 실행 중이면 완료 알림(StepEventHub)을 기다렸다가 그 결과를 사용합니다.
+      알림을 놓치거나 실행 중이던 consumer가 죽은 경우에 대비해 recheck_interval마다 저장소를 다시 확인합니다.
+    """
+
+    def __init__(
+        self,
+        steps: List[PipelineStep],
+        store: StepResultStore,
+        lease_seconds: int = 1800,
+        recheck_interval: float = 30.0,
+        events: StepEventHub = step_events,
+        on_step_done: Optional[Callable[[int, str, str], Awaitable[None]]] = None,
+    ):
+        """
+        Args:
+            steps: 단계 정의 목록
+            store: 단계 결과 저장소
+            lease_seconds: 단계 실행 선점 유효 시간 (초)
+            recheck_interval: 다른 consumer가 실행 중인 단계를 기다릴 때 알림이 없어도 저장소를 다시 확인하는 간격 (초)
+            events: 같은 프로세스 안의 단계 완료 알림
+            on_step_done: 단계를 실행해 결과를 저장한 뒤 호출 (run_id, step, status) - 다른 프로세스에 완료 이벤트 발행용
+        """
+        self.steps: Dict[str, PipelineStep] = {step.name: step for step in steps}
+        self.store = store
+        self.lease_seconds = lease_seconds
+        self.recheck_interval = recheck_interval
+        self.events = events
+        self.on_step_done = on_step_done
+        # 마지막 run()에서 저장된 결과를 재사용한 단계
+        self.reused: Set[str] = set()
+
+    def ancestors(self, targets: Iterable[str]) -> Set[str]:
+        """목표 단계와 그 단계들이 의존하는 모든 단계"""
+        needed: Set[str] = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name in needed:
+                continue
+            if name not in self.steps:
+                raise ValueError(f"정의되지 않은 단계입니다: {name}")
+            needed.add(name)
+            stack.extend(self.steps[name].inputs)
+        return needed
+
+    def descendants(self, names: Iterable[str]) -> Set[str]:
+        """지정한 단계들과 그 결과에 의존하는 모든 단계"""
+        affected = set(names)
+        changed = True
+        while changed:
+            changed = False
+            for step in self.steps.values():
+                if step.name not in affected and affected.intersection(step.inputs):
+                    affected.add(step.name)
+                    changed = True
+        return affected
+
+    async def invalidate(self, run_id: int, names: Iterable[str]):
+        """지정한 단계와 그 결과에 의존하는 단계의 저장된 결과를 삭제"""
+        affected = self.descendants(names)
+        await self.store.delete(run_id, affected)
+        logger.info(f"[pipeline {run_id}] 단계 결과 무효화: {sorted(affected)}")
+
+    async def run(
+        self,
+        run_id: int,
+        targets: Iterable[str],
+        timeouts: Optional[Dict[str, float]] = None,
+        policy: str = CANCEL,
+    ) -> Dict[str, StepOutcome]:
+        """
+        목표 단계와 필요한 선행 단계 실행
+
+        Args:
+            run_id: 실행 단위 ID (예: report_id)
+            targets: 실행할 목표 단계 이름 목록
+            timeouts: 단계별 제한 시간(초)
+            policy: 한 단계가 실패했을 때 나머지 단계 처리 방식 (CANCEL / KEEP)
+
+        Returns:
+            단계별 실행 결과
+
+        Raises:
+            StepGroupError: 하나 이상의 단계가 실패한 경우
+        """
+        needed = self.ancestors(targets)
+        self.reused = set()
+        return await run_step_graph(
+            {name: self._resolver(run_id, self.steps[name]) for name in needed},
+            dependencies={name: self.steps[name].inputs for name in needed},
+            timeouts=timeouts,
+            policy=policy,
+        )
+
+    def fingerprint(self, step: PipelineStep, inputs: Dict[str, Any]) -> str:
+        """단계 입력 지문 (의존 단계 결과, params, version)"""
+        return _digest({
+            "step": step.name,
+            "version": step.version,
+            "params": step.params,
+            "inputs": {name: _digest(value) for name, value in sorted(inputs.items())},
+        })
+
+    def _resolver(self, run_id: int, step: PipelineStep) -> Callable[[Dict[str, Any]], Awaitable[Any]]:
+        async def resolve(inputs: Dict[str, Any]) -> Any:
+            with tracer.span(f"pipeline.{step.name}", pipeline_step=step.name) as span:
+                result = await self._resolve(run_id, step, inputs)
+                span.set_attribute("reused", step.name in self.reused)
+                return result
+
+        return resolve
+
+    async def _resolve(self, run_id: int, step: PipelineStep, inputs: Dict[str, Any]) -> Any:
+        fingerprint = self.fingerprint(step, inputs)
+        while True:
+            # 조회 전에 알림을 먼저 등록해 조회와 대기 사이에 끝난 단계도 놓치지 않도록 함
+            with self.events.listen(run_id, step.name) as done:
+                stored = await self.store.find(run_id, step.name)
+                if stored and stored.status == STEP_COMPLETED and stored.fingerprint == fingerprint:
+                    self.reused.add(step.name)
+                    logger.info(f"[pipeline {run_id}] {step.name} 저장된 결과 재사용")
+                    return json.loads(stored.output) if stored.output is not None else None
+
+                if await self.store.claim(run_id, step.name, fingerprint, self.lease_seconds):
+                    return await self._execute(run_id, step, fingerprint, inputs)
+
+                # 다른 consumer가 실행 중이면 완료 알림을 기다린 뒤 다시 확인 (선점 시간이 지나면 다시 선점 가능)
+                logger.info(f"[pipeline {run_id}] {step.name} 다른 consumer의 실행 완료 대기")
+                try:
+                    await asyncio.wait_for(done, timeout=self.recheck_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _execute(self, run_id: int, step: PipelineStep, fingerprint: str, inputs: Dict[str, Any]) -> Any:
+        try:
+            result = await step.run(inputs)
+        except BaseException:
+            # 취소(제한 시간 초과 포함)도 다음 실행에서 바로 다시 선점할 수 있도록 FAILED로 기록
+            try:
+                await asyncio.shield(self.store.save(run_id, step.name, fingerprint, STEP_FAILED))
+                await asyncio.shield(self._notify(run_id, step.name, STEP_FAILED))
+            except BaseException as e:
+                logger.warning(f"[pipeline {run_id}] {step.name} 실패 상태 저장 실패: {e!r}")
+            raise
+        output = json.dumps(result, ensure_ascii=False, default=str)
+        await self.store.save(run_id, step.name, fingerprint, STEP_COMPLETED, output)
+        await self._notify(run_id, step.name, STEP_COMPLETED)
+        # 새로 실행한 결과와 재사용한 결과가 같은 형태가 되도록 JSON으로 변환한 값을 반환
+        return json.loads(output)
+
+    async def _notify(self, run_id: int, step: str, status: str):
+        """같은 프로세스에서 기다리는 단계를 깨우고, 다른 프로세스에 완료 이벤트 발행"""
+        self.events.notify(run_id, step, status)
+        if self.on_step_done is None:
+            return
+        try:
+            await self.on_step_done(run_id, step, status)
+        except Exception as e:
+            # 이벤트를 놓쳐도 기다리는 쪽이 recheck_interval마다 저장소를 다시 확인하므로 결과는 그대로 사용
+            logger.warning(f"[pipeline {run_id}] {step} 완료 이벤트 발행 실패: {e!r}")
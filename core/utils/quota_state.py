@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+from zoneinfo import ZoneInfo
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+logger = logging.getLogger(__name__)
+
+# 외부 API 리소스 이름
+OPENAI = "openai"
+YOUTUBE_ANALYTICS = "youtube_analytics"
+
+# Retry-After 헤더가 없을 때 기본 대기 시간 (초)
+DEFAULT_COOLDOWN_SECONDS = {
+    OPENAI: 30.0,
+    YOUTUBE_ANALYTICS: 60.0,
+}
+
+
+class QuotaState:
+    """
+    외부 API 요청 한도 상태를 프로세스 안에서 공유하는 클래스
+
+    - LLM/YouTube 클라이언트는 429, quotaExceeded 를 받으면 trip()으로 대기 시간을 기록합니다.
+    - consumer는 대기 시간이 남아 있는 동안 파티션 수신을 멈추고, 끝나면 다시 수신합니다.
+    """
+
+    def __init__(self):
+        # 리소스별 요청 재개 시각 (time.monotonic 기준)
+        self._blocked_until: Dict[str, float] = {}
+
+    def trip(self, resource: str, cooldown_seconds: Optional[float] = None, reason: str = ""):
+        """요청 한도 초과 기록 (이미 더 긴 대기 시간이 있으면 유지)"""
+        if cooldown_seconds is None:
+            cooldown_seconds = DEFAULT_COOLDOWN_SECONDS.get(resource, 30.0)
+        until = time.monotonic() + cooldown_seconds
+        if until > self._blocked_until.get(resource, 0.0):
+            self._blocked_until[resource] = until
+            logger.warning(f"⏸️ {resource} 요청 한도 초과, {cooldown_seconds:.0f}초 대기 ({reason})")
+
+    def remaining(self, resources: Optional[Iterable[str]] = None) -> float:
+        """남은 대기 시간(초, 여러 리소스면 가장 긴 값)"""
+        now = time.monotonic()
+        names = list(self._blocked_until) if resources is None else resources
+        return max([self._blocked_until.get(name, 0.0) - now for name in names] + [0.0])
+
+    def is_exhausted(self, resources: Optional[Iterable[str]] = None) -> bool:
+        return self.remaining(resources) > 0
+
+    async def wait_until_available(self, resources: Optional[Iterable[str]] = None):
+        """대기 시간이 끝날 때까지 대기"""
+        while True:
+            remaining = self.remaining(resources)
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(remaining, 5.0))
+
+
+def retry_after_seconds(headers: Any) -> Optional[float]:
+    """Retry-After 헤더 값(초) 조회 (없거나 날짜 형식이면 None)"""
+    if not headers:
+        return None
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def seconds_until_pacific_midnight() -> float:
+    """YouTube API 일일 할당량이 초기화되는 태평양 시간 자정까지 남은 시간(초)"""
+    now = datetime.now(ZoneInfo("America/Los_Angeles"))
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (midnight - now).total_seconds()
+
+
+def trip_on_openai_error(error: BaseException):
+    """OpenAI 요청 한도 초과 오류면 대기 시간 기록"""
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if error.__class__.__name__ != "RateLimitError" and status != 429:
+        return
+    quota_state.trip(OPENAI, retry_after_seconds(getattr(response, "headers", None)), repr(error)[:200])
+
+
+class QuotaCallbackHandler(BaseCallbackHandler):
+    """LangChain LLM 호출이 요청 한도 초과로 실패하면 QuotaState에 기록하는 콜백"""
+
+    def on_llm_error(self, error: BaseException, **kwargs: Any) -> Any:
+        trip_on_openai_error(error)
+
+
+# 프로세스 전체에서 공유하는 인스턴스
+quota_state = QuotaState()
@@ -0,0 +1,373 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.rate_limiters import BaseRateLimiter
+
+from core.utils import metrics
+from core.utils.usage_ledger import response_token_usage
+
+logger = logging.getLogger(__name__)
+
+# OpenAI 요청 한도 (분당 요청 수 / 분당 토큰 수, 0이면 제한 없음)
+OPENAI_CHAT_RPM = int(os.getenv("OPENAI_CHAT_RPM", "500"))
+OPENAI_CHAT_TPM = int(os.getenv("OPENAI_CHAT_TPM", "200000"))
+OPENAI_EMBEDDING_RPM = int(os.getenv("OPENAI_EMBEDDING_RPM", "3000"))
+OPENAI_EMBEDDING_TPM = int(os.getenv("OPENAI_EMBEDDING_TPM", "1000000"))
+# LLM 호출 하나의 예상 토큰 수 초기값 (이후 실제 사용량의 이동 평균으로 갱신)
+OPENAI_CHAT_ESTIMATED_TOKENS = int(os.getenv("OPENAI_CHAT_ESTIMATED_TOKENS", "2000"))
+# 설정하면 같은 호스트의 프로세스들이 SQLite 파일로 요청 한도를 함께 사용 (비우면 프로세스마다 따로 계산)
+OPENAI_RATE_LIMIT_SHARED_PATH = os.getenv("OPENAI_RATE_LIMIT_SHARED_PATH", "")
+
+# 공유 상태를 쓸 때 다른 프로세스가 반납한 토큰을 확인하는 최대 대기 간격 (초)
+_MAX_WAIT_SLICE_SECONDS = 1.0
+
+# 현재 context의 요청 우선순위 (작을수록 먼저 실행, 메시지 priority 순위와 같은 값)
+_priority: ContextVar[int] = ContextVar("rate_limit_priority", default=0)
+# 현재 context에서 시작한 LLM 호출의 run_id (RateLimitCallbackHandler가 설정, acquire/aacquire의 차감분을 호출별로 기록)
+_llm_run: ContextVar[Optional[UUID]] = ContextVar("rate_limit_llm_run", default=None)
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 근사치 (한글은 글자당 1토큰 안팎이므로 보수적으로 2글자당 1토큰 + 여유)"""
+    return len(text) // 2 + 8
+
+
+@contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """블록 안의 OpenAI 호출 우선순위 설정 (consumer가 메시지 priority로 설정)"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def _refill(requests: float, tokens: float, elapsed: float, rpm: int, tpm: int) -> Tuple[float, float]:
+    """경과 시간만큼 채운 (요청, 토큰) 잔량 (최대 1분치)"""
+    if rpm:
+        requests = min(float(rpm), requests + elapsed * rpm / 60)
+    if tpm:
+        tokens = min(float(tpm), tokens + elapsed * tpm / 60)
+    return requests, tokens
+
+
+def _shortfall_seconds(requests: float, tokens: float, need_tokens: int, rpm: int, tpm: int) -> float:
+    """요청 1개와 need_tokens 토큰이 채워질 때까지 남은 시간 (0이면 바로 사용 가능)"""
+    wait = 0.0
+    if rpm and requests < 1:
+        wait = max(wait, (1 - requests) * 60 / rpm)
+    if tpm and tokens < need_tokens:
+        wait = max(wait, (need_tokens - tokens) * 60 / tpm)
+    return wait
+
+
+class BucketState(ABC):
+    """토큰 버킷 잔량 저장소"""
+
+    @abstractmethod
+    def take(self, name: str, tokens: int, rpm: int, tpm: int) -> float:
+        """요청 1개와 tokens 토큰을 사용 (부족하면 사용하지 않고 채워질 때까지 남은 시간(초) 반환)"""
+
+    @abstractmethod
+    def adjust(self, name: str, tokens: int, rpm: int, tpm: int):
+        """예상보다 더 쓴 토큰(양수) 차감, 덜 쓴 토큰(음수) 반납"""
+
+
+class LocalBucketState(BucketState):
+    """프로세스 메모리의 토큰 버킷"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 이름 -> [요청 잔량, 토큰 잔량, 갱신 시각]
+        self._buckets: Dict[str, List[float]] = {}
+
+    def _bucket(self, name: str, rpm: int, tpm: int) -> List[float]:
+        now = time.monotonic()
+        bucket = self._buckets.get(name)
+        if bucket is None:
+            bucket = self._buckets[name] = [float(rpm), float(tpm), now]
+        bucket[0], bucket[1] = _refill(bucket[0], bucket[1], now - bucket[2], rpm, tpm)
+        bucket[2] = now
+        return bucket
+
+    def take(self, name: str, tokens: int, rpm: int, tpm: int) -> float:
+        with self._lock:
+            bucket = self._bucket(name, rpm, tpm)
+            wait = _shortfall_seconds(bucket[0], bucket[1], tokens, rpm, tpm)
+            if wait <= 0:
+                bucket[0] -= 1
+                bucket[1] -= tokens
+            return wait
+
+    def adjust(self, name: str, tokens: int, rpm: int, tpm: int):
+        with self._lock:
+            bucket = self._bucket(name, rpm, tpm)
+            bucket[1] = min(float(tpm), bucket[1] - tokens)
+
+
+class SqliteBucketState(BucketState):
+    """
+    SQLite 파일에 저장하는 토큰 버킷 (같은 호스트의 여러 consumer 프로세스가 한도를 함께 사용)
+
+    잔량 확인과 차감은 BEGIN IMMEDIATE 트랜잭션 안에서 원자적으로 실행합니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connect().execute(
+            """
+            CREATE TABLE IF NOT EXISTS rate_limit_bucket (
+                name TEXT PRIMARY KEY,
+                requests REAL NOT NULL,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _update(self, name: str, tokens: int, rpm: int, tpm: int, consume: bool) -> float:
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT requests, tokens, updated_at FROM rate_limit_bucket WHERE name = ?", (name,)
+            ).fetchone()
+            requests, available, updated_at = row if row else (float(rpm), float(tpm), now)
+            requests, available = _refill(requests, available, max(0.0, now - updated_at), rpm, tpm)
+            wait = _shortfall_seconds(requests, available, tokens, rpm, tpm) if consume else 0.0
+            if wait <= 0:
+                if consume:
+                    requests -= 1
+                available = min(float(tpm), available - tokens)
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limit_bucket (name, requests, tokens, updated_at) VALUES (?, ?, ?, ?)",
+                (name, requests, available, now),
+            )
+            conn.execute("COMMIT")
+            return wait
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def take(self, name: str, tokens: int, rpm: int, tpm: int) -> float:
+        return self._update(name, tokens, rpm, tpm, consume=True)
+
+    def adjust(self, name: str, tokens: int, rpm: int, tpm: int):
+        self._update(name, tokens, rpm, tpm, consume=False)
+
+
+class _WaitQueue:
+    """이벤트 루프별 대기열 (우선순위, 순번) 순서"""
+
+    def __init__(self):
+        self.waiters: List[Tuple[int, int, int, asyncio.Future]] = []
+        self.dispatcher: Optional[asyncio.Task] = None
+
+
+class TokenBucketRateLimiter(BaseRateLimiter):
+    """
+    분당 요청 수(RPM)와 분당 토큰 수(TPM)를 함께 지키는 요청 한도 제한기
+
+    - 한도를 넘는 요청은 오류 없이 대기열에서 기다리며, 우선순위가 높은(값이 작은) 요청부터,
+      같은 우선순위는 먼저 온 순서대로 실행 (앞 요청이 큰 토큰을 기다리는 동안 뒤 요청이 앞지르지 않음)
+    - 토큰 수는 호출 전 예상치로 먼저 차감하고, 호출 후 settle()로 실제 사용량과의 차이를 정산
+    - LangChain BaseRateLimiter 인터페이스를 구현하므로 ChatOpenAI(rate_limiter=...)로 캐시에 없는 모든 호출에 적용
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rpm: int,
+        tpm: int,
+        state: Optional[BucketState] = None,
+        estimated_tokens: int = OPENAI_CHAT_ESTIMATED_TOKENS,
+    ):
+        self.name = name
+        self.rpm = max(0, rpm)
+        self.tpm = max(0, tpm)
+        self.state = state or LocalBucketState()
+        # 호출 하나의 예상 토큰 수 (aacquire처럼 토큰 수를 모를 때 사용, 실제 사용량의 이동 평균)
+        self.estimated_tokens = estimated_tokens
+        # LLM 호출(run_id)별로 acquire/aacquire에서 미리 차감한 토큰 수 (응답 후 이 값으로 정산)
+        self._reservations: Dict[UUID, int] = {}
+        self._sequence = itertools.count()
+        self._queues: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _WaitQueue]" = weakref.WeakKeyDictionary()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.rpm or self.tpm)
+
+    def _clamp(self, tokens: int) -> int:
+        # 한도보다 큰 요청은 버킷이 가득 찼을 때 실행 (영원히 기다리지 않도록)
+        return min(max(0, tokens), self.tpm) if self.tpm else 0
+
+    async def acquire_tokens(self, tokens: int, priority: Optional[int] = None):
+        """요청 1개와 tokens 토큰을 사용할 수 있을 때까지 대기 (priority 기본값: 현재 context의 우선순위)"""
+        if not self.enabled:
+            return
+        priority = _priority.get() if priority is None else priority
+        loop = asyncio.get_running_loop()
+        queue = self._queues.get(loop)
+        if queue is None:
+            queue = self._queues[loop] = _WaitQueue()
+
+        future = loop.create_future()
+        heapq.heappush(queue.waiters, (priority, next(self._sequence), self._clamp(tokens), future))
+        if queue.dispatcher is None or queue.dispatcher.done():
+            queue.dispatcher = loop.create_task(self._dispatch(queue))
+
+        start = time.perf_counter()
+        metrics.RATE_LIMIT_WAITING.labels(self.name).inc()
+        try:
+            await future
+        finally:
+            metrics.RATE_LIMIT_WAITING.labels(self.name).dec()
+            metrics.RATE_LIMIT_WAIT_DURATION.labels(self.name, str(priority)).observe(time.perf_counter() - start)
+            if not future.done():
+                future.cancel()
+
+    async def _dispatch(self, queue: _WaitQueue):
+        """대기열 맨 앞 요청부터 토큰이 채워지는 대로 실행"""
+        while queue.waiters:
+            _, _, tokens, future = queue.waiters[0]
+            if future.done():
+                heapq.heappop(queue.waiters)
+                continue
+            try:
+                wait = await self._take(tokens)
+            except Exception as e:
+                # 공유 상태를 읽을 수 없으면 한도 없이 실행 (요청 한도 때문에 리포트 생성이 멈추지 않도록 함)
+                logger.warning(f"[rate limit] {self.name} 잔량 확인 실패: {e!r}")
+                wait = 0.0
+            if wait <= 0:
+                heapq.heappop(queue.waiters)
+                if future.done():
+                    # 토큰을 받는 사이 취소된 요청은 반납
+                    self.settle(0, tokens)
+                else:
+                    future.set_result(None)
+                continue
+            await asyncio.sleep(min(wait, _MAX_WAIT_SLICE_SECONDS) if isinstance(self.state, SqliteBucketState) else wait)
+
+    async def _take(self, tokens: int) -> float:
+        if isinstance(self.state, SqliteBucketState):
+            return await asyncio.to_thread(self.state.take, self.name, tokens, self.rpm, self.tpm)
+        return self.state.take(self.name, tokens, self.rpm, self.tpm)
+
+    def acquire_tokens_sync(self, tokens: int):
+        """동기 코드용 대기 (대기열 없이 토큰이 채워질 때까지 반복 확인)"""
+        if not self.enabled:
+            return
+        tokens = self._clamp(tokens)
+        while True:
+            wait = self.state.take(self.name, tokens, self.rpm, self.tpm)
+            if wait <= 0:
+                return
+            time.sleep(min(wait, _MAX_WAIT_SLICE_SECONDS))
+
+    def settle(self, actual_tokens: int, reserved_tokens: int):
+        """호출 후 실제 토큰 사용량과 미리 차감한 토큰 수의 차이 정산"""
+        if not self.enabled:
+            return
+        if actual_tokens:
+            self.estimated_tokens = int(self.estimated_tokens * 0.9 + actual_tokens * 0.1)
+        difference = actual_tokens - self._clamp(reserved_tokens)
+        if difference:
+            try:
+                self.state.adjust(self.name, difference, self.rpm, self.tpm)
+            except Exception as e:
+                logger.warning(f"[rate limit] {self.name} 토큰 정산 실패: {e!r}")
+
+    def pop_reservation(self, run_id: UUID) -> Optional[int]:
+        """LLM 호출(run_id)이 acquire/aacquire에서 미리 차감한 토큰 수 (캐시 응답처럼 차감하지 않았으면 None)"""
+        return self._reservations.pop(run_id, None)
+
+    def _record_reservation(self, tokens: int):
+        run_id = _llm_run.get()
+        if run_id is not None:
+            self._reservations[run_id] = tokens
+
+    # LangChain BaseRateLimiter 인터페이스 (토큰 수를 알 수 없으므로 예상치 사용)
+    def acquire(self, *, blocking: bool = True) -> bool:
+        tokens = self.estimated_tokens
+        self.acquire_tokens_sync(tokens)
+        self._record_reservation(tokens)
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        tokens = self.estimated_tokens
+        await self.acquire_tokens(tokens)
+        self._record_reservation(tokens)
+        return True
+
+
+def create_bucket_state(path: str = OPENAI_RATE_LIMIT_SHARED_PATH) -> BucketState:
+    """설정 값으로 잔량 저장소 생성 (경로가 없거나 열 수 없으면 프로세스 메모리)"""
+    if path:
+        try:
+            return SqliteBucketState(path)
+        except Exception as e:
+            logger.warning(f"[rate limit] {path} 를 열 수 없어 프로세스별로 한도를 계산합니다: {e!r}")
+    return LocalBucketState()
+
+
+_bucket_state = create_bucket_state()
+
+# 전역에서 사용할 OpenAI 요청 한도 제한기 (싱글톤 패턴, 모든 ChatOpenAI / 임베딩 호출이 공유)
+chat_rate_limiter = TokenBucketRateLimiter("openai_chat", OPENAI_CHAT_RPM, OPENAI_CHAT_TPM, _bucket_state)
+embedding_rate_limiter = TokenBucketRateLimiter("openai_embedding", OPENAI_EMBEDDING_RPM, OPENAI_EMBEDDING_TPM, _bucket_state)
+
+
+class RateLimitCallbackHandler(BaseCallbackHandler):
+    """LLM 응답의 실제 토큰 사용량으로 chat_rate_limiter 의 예상 차감분을 정산하는 콜백"""
+
+    # 호출하는 쪽 context에서 실행해야 이후 aacquire가 현재 LLM 호출의 run_id를 확인할 수 있음
+    run_inline = True
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: Any, *, run_id: UUID, **kwargs: Any) -> Any:
+        _llm_run.set(run_id)
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any) -> Any:
+        _llm_run.set(run_id)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> Any:
+        _llm_run.set(None)
+        reserved = chat_rate_limiter.pop_reservation(run_id)
+        usage = response_token_usage(response)
+        if reserved is None or usage is None:
+            # 캐시에서 가져온 응답은 한도를 사용하지 않음
+            return
+        _, prompt_tokens, completion_tokens = usage
+        # 호출 전 이 호출에 차감한 토큰 수와의 차이를 정산 (그 사이 바뀐 estimated_tokens가 아닌 실제 차감분 기준)
+        chat_rate_limiter.settle(prompt_tokens + completion_tokens, reserved)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> Any:
+        _llm_run.set(None)
+        reserved = chat_rate_limiter.pop_reservation(run_id)
+        # 길이 제한으로 잘린 structured output 응답(openai.LengthFinishReasonError)의 사용량 정산
+        usage = getattr(getattr(error, "completion", None), "usage", None)
+        if reserved is not None and usage is not None:
+            chat_rate_limiter.settle(int(usage.total_tokens or 0), reserved)
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from core.utils import metrics
+from core.utils.llm_cache import llm_cache_bypassed
+from core.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# 섹션 결과 보관 시간 (초, 같은 영상의 리포트를 몇 시간 안에 다시 만드는 경우 재사용)
+SECTION_CACHE_TTL_SECONDS = int(os.getenv("SECTION_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+
+
+def content_hash(value: Any) -> str:
+    """입력 값의 해시 (자막, 댓글 목록 등 큰 입력을 지문에 넣을 때 사용)"""
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def prompt_version(template: str, *queries: str) -> str:
+    """프롬프트 템플릿 버전 (템플릿이나 함께 넣는 질문(query) 내용이 바뀌면 달라짐)"""
+    return content_hash([template, *queries] if queries else template)[:12]
+
+
+def stats_bucket(value: Any) -> int:
+    """
+    조회수/좋아요 수 같은 통계 값을 유효숫자 2자리로 묶은 값
+
+    통계가 조금 바뀐 정도로는 지문이 달라지지 않도록 함 (예: 12,345 -> 12,000)
+    """
+    try:
+        return int(float(f"{float(value):.2g}"))
+    except (TypeError, ValueError):
+        return 0
+
+
+class SectionCacheStore(ABC):
+    """섹션 결과 저장소"""
+
+    @abstractmethod
+    async def find(self, fingerprint: str) -> Optional[str]:
+        """보관 시간이 지나지 않은 섹션 결과(JSON) 조회"""
+
+    @abstractmethod
+    async def put(self, fingerprint: str, section: str, output: str, ttl_seconds: int):
+        """섹션 결과(JSON) 저장"""
+
+
+class SectionCache:
+    """
+    리포트 섹션(요약, 댓글 분류, 최적화 분석, 아이디어 등) 결과 캐시
+
+    - 섹션 결과를 입력 지문(자막 해시, 댓글 목록 해시, 통계 구간, 프롬프트 버전, 모델 이름 등)으로 저장
+    - 같은 영상의 리포트를 다시 만들 때 지문이 같은 섹션은 LLM을 다시 호출하지 않고 저장된 결과를 사용
+    - 저장소 오류는 로그만 남기고 직접 계산 (캐시 때문에 리포트 생성이 실패하지 않도록 함)
+    - bypass_llm_cache 블록 안(다시 생성 요청)에서는 저장된 결과를 조회하지 않고 새로 계산해 저장
+    """
+
+    def __init__(self, store: SectionCacheStore, ttl_seconds: int = SECTION_CACHE_TTL_SECONDS):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def fingerprint(section: str, inputs: Dict[str, Any]) -> str:
+        return content_hash({"section": section, "inputs": inputs})
+
+    async def get_or_compute(self, section: str, inputs: Dict[str, Any], compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        지문이 같은 섹션 결과가 있으면 반환하고, 없으면 compute()로 계산해 저장
+
+        Args:
+            section: 섹션 이름
+            inputs: 결과에 영향을 주는 입력 (JSON으로 변환 가능한 값)
+            compute: 섹션 결과 계산 함수 (JSON으로 저장 가능한 값 반환)
+        """
+        fingerprint = self.fingerprint(section, inputs)
+        bypassed = llm_cache_bypassed()
+        cached = None
+        if not bypassed:
+            try:
+                cached = await self.store.find(fingerprint)
+            except Exception as e:
+                logger.warning(f"[section cache] {section} 조회 실패: {e!r}")
+        result_label = "bypass" if bypassed else "hit" if cached is not None else "miss"
+        span = tracer.current_span()
+        if span is not None:
+            span.set_attribute(f"section_cache.{section}", result_label)
+        metrics.SECTION_CACHE_REQUESTS.labels(section, result_label).inc()
+        if cached is not None:
+            logger.info(f"[section cache] {section} 저장된 결과 재사용")
+            return json.loads(cached)
+
+        result = await compute()
+        try:
+            await self.store.put(fingerprint, section, json.dumps(result, ensure_ascii=False, default=str), self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"[section cache] {section} 저장 실패: {e!r}")
+        return result
@@ -0,0 +1,118 @@
+import logging
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# 임베딩 코사인 유사도가 이 값 이상이면 같은 입력으로 보고 저장된 결과 재사용
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+# 캐시별 최대 보관 개수 (넘으면 가장 오래 사용하지 않은 항목부터 삭제)
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "5000"))
+
+# 같은 문자가 3번 넘게 반복되면 3번으로 줄임 (ㅋㅋㅋㅋㅋ -> ㅋㅋㅋ, !!!!! -> !!!)
+_REPEATED = re.compile(r"(.)\1{3,}")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """공백, 대소문자, 반복 문자를 정리한 비교용 문자열"""
+    text = unicodedata.normalize("NFKC", text or "").strip().lower()
+    text = _SPACES.sub(" ", text)
+    return _REPEATED.sub(r"\1\1\1", text)
+
+
+class SemanticCache:
+    """
+    임베딩 기반 근사 중복 결과 캐시 (프로세스 메모리의 벡터 인덱스)
+
+    - 정리한 문자열이 같으면 임베딩 없이 바로 재사용 (exact_hit)
+    - 가장 가까운 임베딩의 코사인 유사도가 threshold 이상이면 재사용 (hit)
+    - 조회 결과와 가장 가까운 유사도는 semantic_cache_requests_total, semantic_cache_similarity 메트릭으로 기록
+      (유사도 분포를 보고 SEMANTIC_CACHE_THRESHOLD 를 조정)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+    ):
+        self.name = name
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # 정리한 문자열 -> (정규화한 임베딩, 결과), 순서는 최근 사용 순
+        self._entries: "OrderedDict[str, Tuple[Optional[np.ndarray], Any]]" = OrderedDict()
+        # 유사도 계산용 행렬 (추가/삭제 후 처음 조회할 때 다시 만듦)
+        self._matrix: Optional[np.ndarray] = None
+        self._keys: List[str] = []
+        metrics.SEMANTIC_CACHE_THRESHOLD.labels(name).set(threshold)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_exact(self, text: str) -> Optional[Any]:
+        """정리한 문자열이 같은 항목의 결과 (없으면 None, 기록하지 않음)"""
+        key = normalize_text(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def record_exact_hit(self):
+        metrics.SEMANTIC_CACHE_REQUESTS.labels(self.name, "exact_hit").inc()
+
+    def lookup(self, embedding: Sequence[float]) -> Optional[Any]:
+        """임베딩이 가장 가까운 항목의 유사도가 threshold 이상이면 그 결과 반환"""
+        vector = self._normalize(embedding)
+        with self._lock:
+            matrix = self._index()
+            if matrix is None:
+                best_key, similarity = None, 0.0
+            else:
+                scores = matrix @ vector
+                position = int(np.argmax(scores))
+                best_key, similarity = self._keys[position], float(scores[position])
+            hit = best_key is not None and similarity >= self.threshold
+            if hit:
+                self._entries.move_to_end(best_key)
+                value = self._entries[best_key][1]
+
+        metrics.SEMANTIC_CACHE_SIMILARITY.labels(self.name).observe(max(similarity, 0.0))
+        metrics.SEMANTIC_CACHE_REQUESTS.labels(self.name, "hit" if hit else "miss").inc()
+        return value if hit else None
+
+    def add(self, text: str, embedding: Optional[Sequence[float]], value: Any):
+        """결과 저장 (embedding이 없으면 정리한 문자열이 같을 때만 재사용)"""
+        key = normalize_text(text)
+        vector = self._normalize(embedding) if embedding is not None else None
+        with self._lock:
+            self._entries[key] = (vector, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._matrix = None
+
+    def _index(self) -> Optional[np.ndarray]:
+        if self._matrix is None:
+            self._keys = [key for key, (vector, _) in self._entries.items() if vector is not None]
+            if not self._keys:
+                return None
+            self._matrix = np.stack([self._entries[key][0] for key in self._keys])
+        return self._matrix
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
@@ -0,0 +1,61 @@
+import asyncio
+import logging
+from contextlib import contextmanager
+from typing import Dict, Hashable, Iterator, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StepEventHub:
+    """
+    파이프라인 단계 완료 알림 (프로세스 단위)
+
+    단계 결과를 기다리는 쪽은 DB를 반복 조회하는 대신 listen()으로 받은 future를 기다리고,
+    단계를 실행한 쪽(같은 프로세스) 또는 step-ready 이벤트를 받은 Kafka subscriber(다른 프로세스)가 notify()로 깨웁니다.
+    """
+
+    def __init__(self):
+        self._waiters: Dict[Tuple[Hashable, str], Set[asyncio.Future]] = {}
+
+    @contextmanager
+    def listen(self, run_id: Hashable, step: str) -> Iterator[asyncio.Future]:
+        """
+        단계 완료 알림을 받을 future 등록
+
+        결과를 조회하기 전에 먼저 등록해야 조회와 대기 사이에 끝난 단계의 알림도 놓치지 않습니다.
+        future의 결과는 단계 상태(completed / failed)입니다.
+        """
+        key = (run_id, step)
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(key, set()).add(future)
+        try:
+            yield future
+        finally:
+            waiters = self._waiters.get(key)
+            if waiters is not None:
+                waiters.discard(future)
+                if not waiters:
+                    del self._waiters[key]
+
+    def notify(self, run_id: Hashable, step: str, status: str):
+        """단계를 기다리는 모든 future에 완료 상태 전달"""
+        for future in self._waiters.pop((run_id, step), set()):
+            if not future.done():
+                future.set_result(status)
+
+    async def wait(self, run_id: Hashable, step: str, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        단계 완료 알림 대기
+
+        Returns:
+            단계 상태, timeout 안에 알림이 없으면 None
+        """
+        with self.listen(run_id, step) as future:
+            try:
+                return await asyncio.wait_for(future, timeout=timeout)
+            except asyncio.TimeoutError:
+                return None
+
+
+# 전역에서 사용할 단계 완료 알림 인스턴스 (싱글톤 패턴)
+step_events = StepEventHub()
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 한 단계가 실패했을 때 나머지 단계 처리 방식
+CANCEL = "cancel"  # 나머지 단계를 취소
+KEEP = "keep"  # 나머지 단계는 끝까지 실행해 결과(DB 저장 등)를 남김
+
+SUCCESS = "success"
+FAILED = "failed"
+TIMEOUT = "timeout"
+CANCELLED = "cancelled"
+SKIPPED = "skipped"  # 의존하는 단계가 실패해 실행하지 않음
+
+
+@dataclass
+class StepOutcome:
+    """단계별 실행 결과"""
+    name: str
+    status: str
+    elapsed: float
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+class StepGroupError(Exception):
+    """하나 이상의 단계가 실패했을 때 발생 (원인: 처음 실패한 단계의 예외)"""
+
+    def __init__(self, outcomes: Dict[str, StepOutcome]):
+        self.outcomes = outcomes
+        failed = [outcome for outcome in outcomes.values() if outcome.status in (FAILED, TIMEOUT)]
+        super().__init__(", ".join(f"{outcome.name}: {outcome.error!r}" for outcome in failed))
+
+
+def _check_dependencies(steps: Dict[str, Any], dependencies: Dict[str, List[str]]):
+    """없는 단계를 참조하거나 순환 의존이 있으면 ValueError"""
+    for name, deps in dependencies.items():
+        unknown = [dep for dep in deps if dep not in steps]
+        if unknown:
+            raise ValueError(f"{name} 단계가 없는 단계에 의존합니다: {unknown}")
+
+    visiting, visited = set(), set()
+
+    def visit(name: str):
+        if name in visited:
+            return
+        if name in visiting:
+            raise ValueError(f"순환 의존이 있습니다: {name}")
+        visiting.add(name)
+        for dep in dependencies.get(name, []):
+            visit(dep)
+        visiting.discard(name)
+        visited.add(name)
+
+    for name in steps:
+        visit(name)
+
+
+async def run_step_graph(
+    steps: Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]],
+    dependencies: Dict[str, List[str]],
+    timeouts: Optional[Dict[str, float]] = None,
+    policy: str = CANCEL,
+) -> Dict[str, StepOutcome]:
+    """
+    의존 관계가 있는 단계들을 가능한 한 동시에 실행
+
+    - 각 단계는 의존하는 단계가 모두 성공하면 바로 시작하고, {의존 단계 이름: 결과}를 입력으로 받습니다.
+    - 의존하는 단계가 실패하면 해당 단계는 실행하지 않습니다(SKIPPED).
+    - 제한 시간은 의존 단계를 기다린 시간을 빼고 단계 자체의 실행 시간에만 적용됩니다.
+
+    Args:
+        steps: {단계 이름: 의존 단계 결과를 받아 실행할 코루틴 함수}
+        dependencies: {단계 이름: 의존하는 단계 이름 목록}
+        timeouts: 단계별 제한 시간(초, 없으면 제한 없음)
+        policy: 한 단계가 실패했을 때 나머지 단계 처리 방식 (CANCEL / KEEP)
+
+    Returns:
+        단계별 실행 결과 (모두 성공한 경우)
+
+    Raises:
+        ValueError: 없는 단계를 참조하거나 순환 의존이 있는 경우
+        StepGroupError: 하나 이상의 단계가 실패하거나 제한 시간을 넘긴 경우
+            (__cause__ 는 처음 실패한 단계의 예외이므로 재시도 가능 여부 판단에 그대로 사용할 수 있음)
+    """
+    _check_dependencies(steps, dependencies)
+    timeouts = timeouts or {}
+    outcomes: Dict[str, StepOutcome] = {}
+    first_error: Dict[str, BaseException] = {}
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def run(name: str, step: Callable[[Dict[str, Any]], Awaitable[Any]]):
+        deps = dependencies.get(name, [])
+        try:
+            if deps:
+                await asyncio.wait([tasks[dep] for dep in deps])
+        except asyncio.CancelledError:
+            outcomes[name] = StepOutcome(name, CANCELLED, 0.0)
+            raise
+        if any(dep not in outcomes or outcomes[dep].status != SUCCESS for dep in deps):
+            outcomes[name] = StepOutcome(name, SKIPPED, 0.0)
+            return
+
+        start = time.perf_counter()
+        try:
+            inputs = {dep: outcomes[dep].result for dep in deps}
+            result = await asyncio.wait_for(step(inputs), timeout=timeouts.get(name))
+            outcomes[name] = StepOutcome(name, SUCCESS, time.perf_counter() - start, result=result)
+        except asyncio.CancelledError:
+            outcomes[name] = StepOutcome(name, CANCELLED, time.perf_counter() - start)
+            raise
+        except Exception as e:
+            status = TIMEOUT if isinstance(e, asyncio.TimeoutError) else FAILED
+            outcomes[name] = StepOutcome(name, status, time.perf_counter() - start, error=e)
+            first_error.setdefault("error", e)
+            if policy == CANCEL:
+                for task in tasks.values():
+                    if not task.done():
+                        task.cancel()
+
+    for name, step in steps.items():
+        tasks[name] = asyncio.create_task(run(name, step), name=name)
+    try:
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+    except asyncio.CancelledError:
+        # 호출한 쪽이 취소되면 실행 중인 단계도 모두 취소
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+
+    # 시작하기 전에 취소된 단계
+    for name in steps:
+        outcomes.setdefault(name, StepOutcome(name, CANCELLED, 0.0))
+
+    if first_error:
+        raise StepGroupError(outcomes) from first_error["error"]
+    return outcomes
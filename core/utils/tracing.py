@@ -0,0 +1,369 @@
+import atexit
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from uuid import UUID
+
+import httpx
+from langchain_core.callbacks import BaseCallbackHandler
+
+logger = logging.getLogger(__name__)
+
+# 스팬 내보내기 설정 (none / jsonl / otlp)
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "none")
+# jsonl 내보내기 파일 경로
+TRACE_JSONL_PATH = os.getenv("TRACE_JSONL_PATH", "traces.jsonl")
+# otlp 내보내기 주소 (OTLP/HTTP JSON, 예: http://localhost:4318)
+OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318")
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "llm-service")
+
+OK = "ok"
+ERROR = "error"
+
+# OTLP 전송 스레드 종료 신호
+_STOP = object()
+
+
+@dataclass
+class Span:
+    """
+    실행 구간 하나 (시작/종료 시각, 부모 구간, 속성)
+
+    trace_attributes(예: report_id)는 자식 구간에 그대로 전달되어 한 리포트의 구간을 모아 볼 수 있습니다.
+    """
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    trace_attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = OK
+    error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_trace_attribute(self, key: str, value: Any):
+        """이후에 시작하는 자식 구간에도 전달할 속성"""
+        self.trace_attributes[key] = value
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException):
+        self.status = ERROR
+        self.error = repr(error)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1_000_000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+class SpanExporter(ABC):
+    """끝난 구간을 내보내는 클래스"""
+
+    @abstractmethod
+    def export(self, span: Span):
+        """구간 하나 내보내기 (호출한 쪽을 오래 막지 않아야 함)"""
+
+    def shutdown(self):
+        """남은 구간을 모두 내보내고 종료"""
+
+
+class JsonlSpanExporter(SpanExporter):
+    """구간을 한 줄에 하나씩 JSON으로 파일에 기록 (로컬 분석용, trace_report.py로 리포트별 플레임 차트 생성)"""
+
+    def __init__(self, path: str = TRACE_JSONL_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+
+class OtlpSpanExporter(SpanExporter):
+    """
+    OTLP/HTTP(JSON)로 구간을 모아서 전송 (Jaeger, Tempo 등 OpenTelemetry 수집기)
+
+    전송은 별도 스레드에서 batch_size개씩 또는 flush_interval초마다 수행합니다.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = OTLP_ENDPOINT,
+        service_name: str = SERVICE_NAME,
+        batch_size: int = 200,
+        flush_interval: float = 5.0,
+    ):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=10000)
+        self._thread = threading.Thread(target=self._run, name="otlp-span-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            logger.warning("OTLP 전송 대기 구간이 너무 많아 구간을 버립니다.")
+
+    def shutdown(self):
+        self._queue.put(_STOP)
+        self._thread.join(timeout=self.flush_interval + 5)
+
+    def _run(self):
+        with httpx.Client(timeout=10) as client:
+            batch: List[Span] = []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                try:
+                    span = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    span = None
+                if span is _STOP:
+                    self._send(client, batch)
+                    return
+                if span is not None:
+                    batch.append(span)
+                if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                    self._send(client, batch)
+                    batch = []
+                    deadline = time.monotonic() + self.flush_interval
+
+    def _send(self, client: httpx.Client, batch: List[Span]):
+        if not batch:
+            return
+        try:
+            response = client.post(self.url, json=self._payload(batch))
+            response.raise_for_status()
+        except Exception as e:
+            logger.warning(f"OTLP 구간 전송 실패 ({len(batch)}개): {e!r}")
+
+    def _payload(self, batch: List[Span]) -> Dict[str, Any]:
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": __name__},
+                    "spans": [
+                        {
+                            "traceId": span.trace_id,
+                            "spanId": span.span_id,
+                            "parentSpanId": span.parent_id or "",
+                            "name": span.name,
+                            "kind": 1,
+                            "startTimeUnixNano": str(span.start_ns),
+                            "endTimeUnixNano": str(span.end_ns or span.start_ns),
+                            "attributes": [_otlp_attribute(key, value) for key, value in span.attributes.items()],
+                            "status": {"code": 2, "message": span.error or ""} if span.status == ERROR else {"code": 1},
+                        }
+                        for span in batch
+                    ],
+                }],
+            }],
+        }
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+class Tracer:
+    """
+    구간 생성과 부모/자식 연결
+
+    현재 구간은 contextvars에 저장되므로 asyncio.create_task, asyncio.to_thread로 실행한 작업에도
+    부모 구간이 그대로 전달됩니다.
+    """
+
+    def __init__(self, exporter: Optional[SpanExporter] = None):
+        self.exporter = exporter
+        self._current: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def current_span(self) -> Optional[Span]:
+        return self._current.get()
+
+    def start_span(self, name: str, parent: Optional[Span] = None, **attributes: Any) -> Span:
+        """
+        구간 시작 (현재 구간으로 설정하지 않음 - 콜백처럼 시작과 종료가 다른 함수에서 일어나는 경우에 사용)
+
+        Args:
+            name: 구간 이름
+            parent: 부모 구간 (기본값: 현재 구간)
+            attributes: 구간 속성
+        """
+        parent = parent or self._current.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            trace_attributes=dict(parent.trace_attributes) if parent else {},
+        )
+        span.attributes.update(span.trace_attributes)
+        span.attributes.update(attributes)
+        return span
+
+    def end_span(self, span: Span):
+        """구간 종료 후 내보내기"""
+        span.end_ns = time.time_ns()
+        if self.exporter is None:
+            return
+        try:
+            self.exporter.export(span)
+        except Exception as e:
+            logger.warning(f"구간 내보내기 실패 ({span.name}): {e!r}")
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """
+        블록 실행 구간 기록 (현재 구간의 자식으로 생성)
+
+        사용 예:
+            with tracer.span("report.summary", report_id=report_id) as span:
+                span.set_attribute("summary_length", len(summary))
+        """
+        span = self.start_span(name, **attributes)
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            self._current.reset(token)
+            self.end_span(span)
+
+    def shutdown(self):
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+
+def create_exporter(kind: str = TRACE_EXPORTER) -> Optional[SpanExporter]:
+    """설정 값으로 구간 내보내기 생성 (none이면 구간을 기록하지 않음)"""
+    if kind == "jsonl":
+        return JsonlSpanExporter()
+    if kind == "otlp":
+        return OtlpSpanExporter()
+    if kind not in ("", "none"):
+        logger.warning(f"알 수 없는 TRACE_EXPORTER 값입니다: {kind}")
+    return None
+
+
+# 전역에서 사용할 tracer 인스턴스 (싱글톤 패턴)
+tracer = Tracer(create_exporter())
+atexit.register(tracer.shutdown)
+
+
+def span(name: str, **attributes: Any):
+    """tracer.span 단축 함수"""
+    return tracer.span(name, **attributes)
+
+
+def traced(name: Optional[str] = None, **attributes: Any) -> Callable:
+    """
+    함수 실행 구간을 기록하는 데코레이터 (동기/비동기 함수 모두 사용 가능)
+
+    사용 예:
+        @traced("report_service.create_summary")
+        async def create_summary(...): ...
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.span(span_name, **attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.span(span_name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """LangChain LLM 호출을 현재 구간의 자식 구간으로 기록하는 콜백"""
+
+    def __init__(self):
+        self._spans: Dict[UUID, Span] = {}
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: Any, *, run_id: UUID, **kwargs: Any) -> Any:
+        self._start(serialized, run_id)
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any) -> Any:
+        self._start(serialized, run_id)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> Any:
+        span = self._spans.pop(run_id, None)
+        if span is None:
+            return
+        usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+        for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+            if key in usage:
+                span.set_attribute(key, usage[key])
+        tracer.end_span(span)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> Any:
+        span = self._spans.pop(run_id, None)
+        if span is None:
+            return
+        span.record_error(error)
+        tracer.end_span(span)
+
+    def _start(self, serialized: Dict[str, Any], run_id: UUID):
+        if not tracer.enabled:
+            return
+        model = ((serialized or {}).get("kwargs") or {}).get("model_name") or ((serialized or {}).get("kwargs") or {}).get("model")
+        self._spans[run_id] = tracer.start_span("llm_call", model=model or "unknown")
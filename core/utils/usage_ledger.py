@@ -0,0 +1,192 @@
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import ChatGenerationChunk
+
+from core.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+LLM = "llm"
+EMBEDDING = "embedding"
+
+# 모델별 100만 토큰당 가격 (USD, 입력 / 출력)
+MODEL_PRICES_PER_MILLION: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "text-embedding-3-small": (0.02, 0.0),
+    "text-embedding-3-large": (0.13, 0.0),
+}
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """토큰 수로 비용(USD) 계산 (가격표에 없는 모델은 0)"""
+    # 날짜가 붙은 모델 이름(gpt-4o-mini-2024-07-18 등)은 가장 길게 일치하는 이름의 가격 사용
+    matched = max((name for name in MODEL_PRICES_PER_MILLION if model.startswith(name)), key=len, default=None)
+    if matched is None:
+        return 0.0
+    input_price, output_price = MODEL_PRICES_PER_MILLION[matched]
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+
+@dataclass
+class UsageEntry:
+    """(리포트, 단계, 종류, 모델) 단위로 합산한 사용량"""
+    report_id: int
+    step: str
+    kind: str
+    model: str
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_ms: float = 0.0
+    cost_usd: float = 0.0
+
+
+class UsageStore(ABC):
+    """사용량 저장소"""
+
+    @abstractmethod
+    async def add(self, entries: List[UsageEntry]):
+        """사용량 누적 저장 (같은 리포트/단계/종류/모델이면 더함)"""
+
+
+@dataclass
+class _Scope:
+    report_id: int
+    step: str
+    entries: Dict[Tuple[str, str], UsageEntry]
+    lock: threading.Lock
+
+
+# 현재 실행 중인 리포트 단계 (LLM 콜백이 스레드에서 실행되어도 contextvars로 전달됨)
+_current_scope: ContextVar[Optional[_Scope]] = ContextVar("usage_scope", default=None)
+
+
+@asynccontextmanager
+async def usage_scope(report_id: int, step: str, store: Optional[UsageStore] = None) -> AsyncIterator[None]:
+    """
+    블록 안에서 일어난 LLM / 임베딩 호출 사용량을 리포트 단계에 기록
+
+    블록이 끝나면(실패해도) 합산한 사용량을 store에 저장합니다.
+    """
+    scope = _Scope(report_id, step, {}, threading.Lock())
+    token = _current_scope.set(scope)
+    try:
+        yield
+    finally:
+        _current_scope.reset(token)
+        if store is not None and scope.entries:
+            try:
+                await store.add(list(scope.entries.values()))
+            except Exception as e:
+                logger.warning(f"[usage] report_id={report_id} {step} 사용량 저장 실패: {e!r}")
+
+
+def record_usage(kind: str, model: str, prompt_tokens: int, completion_tokens: int, latency: float):
+    """
+    LLM / 임베딩 호출 사용량 기록 (메트릭 + 현재 리포트 단계 장부)
+
+    Args:
+        kind: LLM / EMBEDDING
+        model: 모델 이름
+        prompt_tokens: 입력 토큰 수
+        completion_tokens: 출력 토큰 수
+        latency: 호출 시간 (초)
+    """
+    scope = _current_scope.get()
+    step = scope.step if scope else "unknown"
+    cost = estimate_cost(model, prompt_tokens, completion_tokens)
+
+    metrics.LLM_TOKENS.labels(kind, model, step, "prompt").inc(prompt_tokens)
+    metrics.LLM_TOKENS.labels(kind, model, step, "completion").inc(completion_tokens)
+    metrics.LLM_COST.labels(kind, model, step).inc(cost)
+    metrics.LLM_REQUEST_DURATION.labels(kind, model, step).observe(latency)
+
+    if scope is None:
+        return
+    with scope.lock:
+        entry = scope.entries.get((kind, model))
+        if entry is None:
+            entry = scope.entries[(kind, model)] = UsageEntry(scope.report_id, scope.step, kind, model)
+        entry.calls += 1
+        entry.prompt_tokens += prompt_tokens
+        entry.completion_tokens += completion_tokens
+        entry.latency_ms += latency * 1000
+        entry.cost_usd += cost
+
+
+def response_token_usage(response: Any) -> Optional[Tuple[str, int, int]]:
+    """
+    LangChain LLM 응답(LLMResult)의 (모델, 입력 토큰 수, 출력 토큰 수)
+
+    - 일반 호출은 llm_output의 token_usage, 스트리밍 호출(astream)은 합쳐진 응답 조각의 usage_metadata 사용
+    - 캐시에서 가져온 응답 등 실제 호출이 없었던 경우 None
+    """
+    llm_output = getattr(response, "llm_output", None) or {}
+    usage = llm_output.get("token_usage") or {}
+    if usage:
+        return (
+            llm_output.get("model_name") or "unknown",
+            int(usage.get("prompt_tokens") or 0),
+            int(usage.get("completion_tokens") or 0),
+        )
+    for generations in getattr(response, "generations", None) or []:
+        for generation in generations:
+            # 캐시 응답(ChatGeneration)에도 원래 호출의 usage_metadata가 남아 있으므로 스트리밍 응답 조각만 사용
+            if not isinstance(generation, ChatGenerationChunk):
+                continue
+            metadata = getattr(generation.message, "usage_metadata", None)
+            if metadata:
+                return (
+                    (generation.message.response_metadata or {}).get("model_name") or "unknown",
+                    int(metadata.get("input_tokens") or 0),
+                    int(metadata.get("output_tokens") or 0),
+                )
+    return None
+
+
+class UsageCallbackHandler(BaseCallbackHandler):
+    """LangChain LLM 응답의 토큰 사용량을 기록하는 콜백"""
+
+    def __init__(self):
+        self._started: Dict[UUID, float] = {}
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: Any, *, run_id: UUID, **kwargs: Any) -> Any:
+        self._started[run_id] = time.perf_counter()
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any) -> Any:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> Any:
+        started = self._started.pop(run_id, None)
+        latency = time.perf_counter() - started if started is not None else 0.0
+        usage = response_token_usage(response)
+        if usage is None:
+            # 캐시에서 가져온 응답 등 실제 호출이 없었던 경우
+            return
+        model, prompt_tokens, completion_tokens = usage
+        record_usage(LLM, model, prompt_tokens, completion_tokens, latency)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> Any:
+        started = self._started.pop(run_id, None)
+        # 길이 제한으로 잘린 structured output 응답(openai.LengthFinishReasonError)도 토큰은 사용함
+        completion = getattr(error, "completion", None)
+        usage = getattr(completion, "usage", None)
+        if usage is None:
+            return
+        record_usage(
+            LLM,
+            getattr(completion, "model", None) or "unknown",
+            int(usage.prompt_tokens or 0),
+            int(usage.completion_tokens or 0),
+            time.perf_counter() - started if started is not None else 0.0,
+        )
@@ -1,14 +1,19 @@
 import random
 from collections import defaultdict
-from typing import List, DefaultDict
+from typing import List, DefaultDict, Optional
 import logging
 import time
+from core.llm.prompt_template_manager import PromptTemplateManager
+from core.utils.section_cache import SectionCache, content_hash, prompt_version
+from core.utils.tracing import traced
 from domain.comment.model.comment import Comment
 from domain.comment.model.comment_type import CommentType
 from domain.comment.repository.comment_repository import CommentRepository
 from domain.report.repository.report_repository import ReportRepository
+from domain.report.repository.report_section_cache_repository import ReportSectionCacheRepository
 from domain.video.model.video import Video
-from external.rag.rag_service_impl import RagServiceImpl
+from external.rag import rag_service_impl
+from external.rag.rag_service_impl import COMMENT_BATCH_QUERY, COMMENT_SUMMARY_QUERY, RagServiceImpl
 from external.youtube.youtube_comment_service import YoutubeCommentService
 
 logger = logging.getLogger(__name__)
@@ -19,6 +24,7 @@ class CommentService:
         self.comment_repository = CommentRepository()
         self.youtube_comment_service = YoutubeCommentService()
         self.report_repository = ReportRepository()
+        self.section_cache = SectionCache(ReportSectionCacheRepository())
 
     async def summarize_comments_by_emotions_with_llm(self, comments_by_emotions: DefaultDict[CommentType, list[Comment]]) -> defaultdict[CommentType, List[Comment]]:
         summarized_comments: defaultdict[CommentType, List[Comment]] = defaultdict(list)
@@ -33,8 +39,16 @@ class CommentService:
             # 해당 감정 그룹의 content만 개행으로 합치기
             contents_str = "\n".join(comment.content for comment in comments)
 
-            # LLM 서비스 호출 -> returns list[str]
-            summarized_contents = self.rag_service.summarize_comments(contents_str)
+            # LLM 서비스 호출 -> returns list[str] (댓글/프롬프트/모델이 같은 요약이 있으면 재사용)
+            summarized_contents = await self.section_cache.get_or_compute(
+                "comment_summary",
+                {
+                    "comments": content_hash(contents_str),
+                    "prompt": prompt_version(PromptTemplateManager.get_sumarlize_comment_prompt(), COMMENT_SUMMARY_QUERY),
+                    "model": self.rag_service.model_name,
+                },
+                lambda: self.rag_service.asummarize_comments(contents_str),
+            )
             
 
 
@@ -61,7 +75,7 @@ class CommentService:
         return summarized_comments
 
     async def classify_comment_with_llm(self, comment: Comment) -> Comment:
-        result = self.rag_service.classify_comment(comment.content)
+        result = await self.rag_service.aclassify_comment(comment.content)
         # comment의 comment_type 업데이트
         comment.comment_type = result["comment_type"]
         # db 저장 후 반환 -> 그냥 반환
@@ -99,11 +113,17 @@ class CommentService:
 
     async def gather_classified_comments(self, comments: list[Comment])->DefaultDict[CommentType, list[Comment]]:
         grouped = defaultdict(list)
-        for comment in comments:
-            result = await self.classify_comment_with_llm(comment)
+        for result in await self.classify_comments_with_llm(comments):
             grouped[result.comment_type].append(result)
 
         return grouped
+
+    async def classify_comments_with_llm(self, comments: list[Comment]) -> list[Comment]:
+        """댓글 여러 개를 묶음 단위 LLM 호출로 분류해 comment_type 업데이트"""
+        comment_types = await self.rag_service.aclassify_comments_batch([comment.content for comment in comments])
+        for comment, comment_type in zip(comments, comment_types):
+            comment.comment_type = comment_type
+        return comments
     
     async def gather_classified_comments_optimized(self, all_comments: list[Comment]) -> tuple[DefaultDict[CommentType, list[Comment]], DefaultDict[CommentType, list[Comment]]]:
         """
@@ -122,8 +142,7 @@ class CommentService:
         llm_classify_start = time.time()
         logger.info(f"🤖 LLM 감정 분류 시작: {len(sampled_comments)}개 댓글")
         sample_grouped = defaultdict(list)
-        for comment in sampled_comments:
-            result = await self.classify_comment_with_llm(comment)
+        for result in await self.classify_comments_with_llm(sampled_comments):
             sample_grouped[result.comment_type].append(result)
         llm_classify_time = time.time() - llm_classify_start
         logger.info(f"🤖 LLM 감정 분류 완료 ({llm_classify_time:.2f}초)")
@@ -185,43 +204,13 @@ class CommentService:
         logger.info(f"💬 댓글 분석 시작 - Report ID: {report_id}")
         
         try:
-            # 유튜브 영상 아이디 조회
-            youtube_video_id = getattr(video, "youtube_video_id", None)
-            if not youtube_video_id:
-                logger.error("YouTube 영상 ID가 없습니다.")
+            comments_by_youtube = await self.fetch_comments(video, report_id)
+            if comments_by_youtube is None:
                 return False
-            
-            # 댓글 정보 조회 (YouTube API)
-            api_start = time.time()
-            comments_by_youtube = await self.youtube_comment_service.get_comments(youtube_video_id, report_id)
-            api_time = time.time() - api_start
-            logger.info(f"💬 YouTube 댓글 API 호출 완료 ({api_time:.2f}초) - {len(comments_by_youtube)}개 댓글")
-            
-            # Comment 객체로 변환
-            comments_obj = await self.convert_to_comment_objects(comments_by_youtube)
-            
-            # 최적화된 감정 분류 사용 (LLM API 호출)
-            logger.info(f"🧠 총 {len(comments_obj)}개 댓글 감정 분류 시작")
-            all_classified_result, sampled_result = await self.gather_classified_comments_optimized(comments_obj)
-            
-            # 전체 댓글 개수 저장 (스케일링된 전체 개수)
-            total_count_dict = {comment_type: len(comments) for comment_type, comments in all_classified_result.items()}
-            logger.info(f"전체 댓글 감정 분포 (스케일링 포함): {total_count_dict}")
-            
-            # 감정별 요약 생성 (샘플링된 댓글만 사용 - 정확한 감정 분류 보장)
-            summary_start = time.time()
-            logger.info(f"📝 요약 생성에 사용할 샘플링된 댓글: {sum(len(c) for c in sampled_result.values())}개")
-            summarized_comments = await self.summarize_comments_by_emotions_with_llm(sampled_result)
-            summary_time = time.time() - summary_start
-            logger.info(f"📝 댓글 요약 생성 완료 ({summary_time:.2f}초)")
-            
-            # 감정별 댓글 개수 업데이트 (전체 개수 사용)
-            db_start = time.time()
-            count_dict = total_count_dict
-            await self.report_repository.update_count(report_id, count_dict)
-            db_time = time.time() - db_start
-            logger.info(f"🗄️ 댓글 개수 DB 저장 완료 ({db_time:.2f}초)")
-            
+
+            classification = await self.classify_comments(comments_by_youtube)
+            await self.summarize_classified_comments(report_id, classification)
+
             total_time = time.time() - start_time
             logger.info(f"💬 댓글 분석 전체 완료 ({total_time:.2f}초)")
             return True
@@ -231,6 +220,109 @@ class CommentService:
             logger.error(f"💬 댓글 분석 실패 ({total_time:.2f}초): {e}")
             raise
 
+    @traced("comment_service.fetch_comments")
+    async def fetch_comments(self, video: Video, report_id: int) -> Optional[list[dict]]:
+        """
+        YouTube API에서 영상 댓글 조회
+
+        Returns:
+            댓글 목록, YouTube 영상 ID가 없으면 None
+        """
+        # 유튜브 영상 아이디 조회
+        youtube_video_id = getattr(video, "youtube_video_id", None)
+        if not youtube_video_id:
+            logger.error("YouTube 영상 ID가 없습니다.")
+            return None
+
+        # 댓글 정보 조회 (YouTube API)
+        api_start = time.time()
+        comments_by_youtube = await self.youtube_comment_service.get_comments(youtube_video_id, report_id)
+        api_time = time.time() - api_start
+        logger.info(f"💬 YouTube 댓글 API 호출 완료 ({api_time:.2f}초) - {len(comments_by_youtube)}개 댓글")
+        return comments_by_youtube
+
+    @traced("comment_service.classify_comments")
+    async def classify_comments(self, comments: list[dict]) -> dict:
+        """
+        댓글 감정 분류 (샘플링 포함)
+
+        Args:
+            comments: YouTube API에서 가져온 댓글 목록
+
+        Returns:
+            {"counts": {감정: 전체 개수(스케일링 포함)}, "samples": {감정: [요약에 사용할 샘플 댓글 내용]}}
+            (댓글 목록/프롬프트/모델이 같은 분류 결과가 있으면 재사용)
+        """
+        return await self.section_cache.get_or_compute(
+            "comment_classification",
+            {
+                "comments": content_hash(sorted(comment.get("content", "") for comment in comments)),
+                # 댓글을 묶는 기준(토큰 예산, 묶음 크기, 댓글 최대 글자 수)에 따라 프롬프트가 달라짐
+                "batching": [
+                    rag_service_impl.COMMENT_BATCH_TOKEN_BUDGET,
+                    rag_service_impl.COMMENT_BATCH_MAX_SIZE,
+                    rag_service_impl.COMMENT_BATCH_MAX_CHARS,
+                ],
+                "prompt": prompt_version(PromptTemplateManager.get_comment_batch_reaction_prompt(), COMMENT_BATCH_QUERY),
+                "model": self.rag_service.model_name,
+            },
+            lambda: self._classify_comments(comments),
+        )
+
+    async def _classify_comments(self, comments: list[dict]) -> dict:
+        # Comment 객체로 변환
+        comments_obj = await self.convert_to_comment_objects(comments)
+
+        # 최적화된 감정 분류 사용 (LLM API 호출)
+        logger.info(f"🧠 총 {len(comments_obj)}개 댓글 감정 분류 시작")
+        all_classified_result, sampled_result = await self.gather_classified_comments_optimized(comments_obj)
+
+        # 전체 댓글 개수 (스케일링된 전체 개수)
+        total_count_dict = {CommentType(comment_type).value: len(comments) for comment_type, comments in all_classified_result.items()}
+        logger.info(f"전체 댓글 감정 분포 (스케일링 포함): {total_count_dict}")
+
+        return {
+            "counts": total_count_dict,
+            "samples": {
+                CommentType(comment_type).value: [comment.content for comment in comments]
+                for comment_type, comments in sampled_result.items()
+            },
+        }
+
+    @traced("comment_service.summarize_classified_comments")
+    async def summarize_classified_comments(self, report_id: int, classification: dict) -> bool:
+        """
+        classify_comments 결과로 감정별 요약을 생성하고 감정별 댓글 개수와 함께 저장
+
+        Args:
+            report_id: 리포트 ID
+            classification: classify_comments 결과
+
+        Returns:
+            성공 시 True
+        """
+        # 감정별 요약 생성 (샘플링된 댓글만 사용 - 정확한 감정 분류 보장)
+        sampled_result: DefaultDict[CommentType, list[Comment]] = defaultdict(list)
+        for comment_type, contents in classification["samples"].items():
+            emotion = CommentType(comment_type)
+            sampled_result[emotion] = [
+                Comment(comment_type=emotion, content=content, report_id=report_id) for content in contents
+            ]
+
+        summary_start = time.time()
+        logger.info(f"📝 요약 생성에 사용할 샘플링된 댓글: {sum(len(c) for c in sampled_result.values())}개")
+        await self.summarize_comments_by_emotions_with_llm(sampled_result)
+        summary_time = time.time() - summary_start
+        logger.info(f"📝 댓글 요약 생성 완료 ({summary_time:.2f}초)")
+
+        # 감정별 댓글 개수 업데이트 (전체 개수 사용)
+        db_start = time.time()
+        count_dict = {CommentType(comment_type): count for comment_type, count in classification["counts"].items()}
+        await self.report_repository.update_count(report_id, count_dict)
+        db_time = time.time() - db_start
+        logger.info(f"🗄️ 댓글 개수 DB 저장 완료 ({db_time:.2f}초)")
+        return True
+
     # 유튜브 api 에서 가져온 댓글을 Comment 객체로 변환
     async def convert_to_comment_objects(self, comments: list[dict]) -> list[Comment]:
         comment_objects = []
@@ -1,39 +1,63 @@
 import asyncio
 import time
+from typing import Optional
 
 from domain.channel.model.channel import Channel
 from domain.idea.repository.idea_repository import IdeaRepository
 from domain.report.controller.report_controller import report_repository
 from domain.report.repository.report_repository import ReportRepository
 from domain.video.model.video import Video
-from external.rag.rag_service_impl import RagServiceImpl
+from external.rag.rag_service_impl import IDEA_QUERY, RagServiceImpl
+from core.llm.prompt_template_manager import PromptTemplateManager
+from core.utils.section_cache import SectionCache, content_hash, prompt_version
+from core.utils.step_events import step_events
+from core.utils.tracing import traced
+from domain.report.repository.report_section_cache_repository import ReportSectionCacheRepository
 import json
 import logging
 
 
 logger = logging.getLogger(__name__)
 
+# 요약이 아직 없을 때 summary 단계 완료를 기다리는 최대 시간 (초)
+SUMMARY_WAIT_TIMEOUT_SECONDS = 60.0
+
 class IdeaService:
     def __init__(self):
         self.idea_repository = IdeaRepository()
         self.rag_service = RagServiceImpl()
         self.report_repository = ReportRepository()
+        self.section_cache = SectionCache(ReportSectionCacheRepository())
 
     """
     아이디어 생성 요청
     """
-    async def create_idea(self, video: Video, channel: Channel, report_id: int):
+    @traced("idea_service.create_idea")
+    async def create_idea(self, video: Video, channel: Channel, report_id: int, summary: Optional[str] = None):
         start_time = time.time()
         logger.info(f"💡 아이디어 생성 시작 - Report ID: {report_id}")
         
         try:
-            summary = await self.wait_for_summary(report_id)
+            # 요약을 넘겨받지 않은 경우에만 report에 저장된 요약 확인
+            if summary is None:
+                summary = await self.wait_for_summary(report_id)
             if not summary:
                 logger.warning(f"Report ID {report_id}에 대한 요약본을 찾을 수 없어 아이디어 생성을 건너뜁니다.")
                 summary = ""
 
-            # 아이디어 분석 요청
-            idea_results = await self.rag_service.analyze_idea(video, channel, summary)
+            # 아이디어 분석 요청 (영상/채널 정보와 요약, 유사 인기 영상, 프롬프트, 모델이 같은 결과가 있으면 재사용)
+            inputs = await self.rag_service.collect_idea_inputs(video, channel, summary)
+            idea_results = await self.section_cache.get_or_compute(
+                "ideas",
+                {
+                    # 영상/채널 정보와 요약 앞부분 200자
+                    "origin": content_hash(inputs["origin"]),
+                    "popularity": content_hash(inputs["popularity"]),
+                    "prompt": prompt_version(PromptTemplateManager.get_idea_prompt({"query": "", "popularity": "", "origin": ""}), IDEA_QUERY),
+                    "model": self.rag_service.model_name,
+                },
+                lambda: self.rag_service.analyze_idea(video, channel, summary, inputs=inputs),
+            )
 
             # 아이디어 분석 결과를 Report에 저장
             db_start = time.time()
@@ -60,13 +84,24 @@ class IdeaService:
             logger.error(f"💡 아이디어 생성 실패 ({total_time:.2f}초): {e!r}")
             raise e
 
-    async def wait_for_summary(self, report_id: int, max_retries: int = 3) -> str:
-        for attempt in range(max_retries):
+    async def wait_for_summary(self, report_id: int, timeout: float = SUMMARY_WAIT_TIMEOUT_SECONDS) -> Optional[str]:
+        """
+        report에 저장된 요약 조회 (아직 없으면 summary 단계 완료 알림을 timeout까지 대기)
+
+        Returns:
+            요약, timeout까지 요약이 없으면 None
+        """
+        # 조회 전에 알림을 먼저 등록해 조회와 대기 사이에 끝난 요약도 놓치지 않도록 함
+        with step_events.listen(report_id, "summary") as done:
             report = await report_repository.find_by_id(report_id)
-            if report.summary:
+            if report and report.summary:
                 return report.summary
 
-            logger.info(f"아이디어 요약본 확인 시도 {attempt + 1}: {report.summary}")
-            await asyncio.sleep(1)
+            logger.info(f"Report ID {report_id} 요약 완료 대기 (최대 {timeout:.0f}초)")
+            try:
+                await asyncio.wait_for(done, timeout=timeout)
+            except asyncio.TimeoutError:
+                return None
 
-        return None
\ No newline at end of file
+        report = await report_repository.find_by_id(report_id)
+        return report.summary if report and report.summary else None
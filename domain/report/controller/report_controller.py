@@ -88,10 +88,12 @@ async def create_report(video_id: int, request: CreateReportRequest):
         step=Step.idea
     )
 
-    # 메시지 발행
-    await report_producer.send_message("overview-topic", overview_message)
-    await report_producer.send_message("analysis-topic", analysis_message)
-    await report_producer.send_message("idea-topic", idea_message)
+    # 메시지 발행 (세 메시지를 동시에 발행)
+    await report_producer.send_batch([
+        ("overview-topic", overview_message),
+        ("analysis-topic", analysis_message),
+        ("idea-topic", idea_message),
+    ])
 
     return ApiResponse.on_success(SuccessStatus._OK, {"task_id": task.id})
 
@@ -148,9 +150,11 @@ async def create_report_v2(video_id: int, request: CreateReportRequest):
         skip_vector_save=True
     )
 
-    # 메시지 발행 (V2 토픽 사용)
-    await report_producer.send_message("overview-topic-v2", overview_message)
-    await report_producer.send_message("analysis-topic-v2", analysis_message)
-    await report_producer.send_message("idea-topic-v2", idea_message)
+    # 메시지 발행 (V2 토픽 사용, 세 메시지를 동시에 발행)
+    await report_producer.send_batch([
+        ("overview-topic-v2", overview_message),
+        ("analysis-topic-v2", analysis_message),
+        ("idea-topic-v2", idea_message),
+    ])
 
     return ApiResponse.on_success(SuccessStatus._OK, {"task_id": task.id, "version": "v2"})
\ No newline at end of file
@@ -0,0 +1,21 @@
+from datetime import datetime
+from core.utils.datetime_utils import get_kst_now_naive
+from typing import Optional
+from sqlalchemy.dialects.mysql import LONGTEXT
+from sqlmodel import SQLModel, Field, Column
+
+
+class ReportSectionCache(SQLModel, table=True):
+    """리포트 섹션 결과 캐시 - 입력 지문이 같은 섹션은 다른 리포트에서도 LLM 결과를 재사용"""
+    __tablename__ = "report_section_cache"
+
+    # Primary Key (섹션 입력 지문)
+    fingerprint: str = Field(primary_key=True, description="섹션 입력 지문 (자막/댓글 해시, 통계 구간, 프롬프트 버전, 모델 이름 등)")
+
+    section: str = Field(description="섹션 이름 (summary, comment_classification, ...)")
+    output: str = Field(sa_column=Column(LONGTEXT), description="섹션 결과 (JSON)")
+    expires_at: datetime = Field(description="만료 시각")
+
+    # BaseEntity 상속 부분 (created_at, updated_at)
+    created_at: Optional[datetime] = Field(default_factory=get_kst_now_naive)
+    updated_at: Optional[datetime] = Field(default_factory=get_kst_now_naive)
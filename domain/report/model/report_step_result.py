@@ -0,0 +1,26 @@
+from datetime import datetime
+from core.utils.datetime_utils import get_kst_now_naive
+from typing import Optional
+from sqlalchemy import UniqueConstraint
+from sqlalchemy.dialects.mysql import LONGTEXT
+from sqlmodel import SQLModel, Field, Column
+
+
+class ReportStepResult(SQLModel, table=True):
+    """보고서 파이프라인 단계별 결과 - 재시도 시 성공한 단계의 결과를 재사용하기 위한 저장소"""
+    __tablename__ = "report_step_result"
+    __table_args__ = (UniqueConstraint("report_id", "step", name="uk_report_step_result_report_step"),)
+
+    # Primary Key
+    id: Optional[int] = Field(default=None, primary_key=True)
+
+    report_id: int = Field(description="리포트 ID")
+    step: str = Field(description="파이프라인 단계 (transcript, summary, comments_fetch, ...)")
+    status: str = Field(description="처리 상태 (in_progress, completed, failed)")
+    fingerprint: str = Field(description="단계 입력 지문 (입력이 바뀌면 다시 실행)")
+    output: Optional[str] = Field(default=None, sa_column=Column(LONGTEXT), description="단계 결과 (JSON)")
+    claimed_at: datetime = Field(default_factory=get_kst_now_naive, description="처리 시작(선점) 시각")
+
+    # BaseEntity 상속 부분 (created_at, updated_at)
+    created_at: Optional[datetime] = Field(default_factory=get_kst_now_naive)
+    updated_at: Optional[datetime] = Field(default_factory=get_kst_now_naive)
@@ -0,0 +1,28 @@
+from datetime import datetime
+from core.utils.datetime_utils import get_kst_now_naive
+from typing import Optional
+from sqlalchemy import UniqueConstraint
+from sqlmodel import SQLModel, Field
+
+
+class ReportUsage(SQLModel, table=True):
+    """리포트 LLM / 임베딩 사용량 - (리포트, 단계, 종류, 모델) 단위로 토큰 수, 호출 시간, 예상 비용을 누적"""
+    __tablename__ = "report_usage"
+    __table_args__ = (UniqueConstraint("report_id", "step", "kind", "model", name="uk_report_usage_report_step_kind_model"),)
+
+    # Primary Key
+    id: Optional[int] = Field(default=None, primary_key=True)
+
+    report_id: int = Field(description="리포트 ID")
+    step: str = Field(description="파이프라인 단계 (summary, classification, ideas, ...)")
+    kind: str = Field(description="호출 종류 (llm, embedding)")
+    model: str = Field(description="모델 이름")
+    calls: int = Field(default=0, description="호출 수")
+    prompt_tokens: int = Field(default=0, description="입력 토큰 수")
+    completion_tokens: int = Field(default=0, description="출력 토큰 수")
+    latency_ms: float = Field(default=0.0, description="호출 시간 합계 (ms)")
+    cost_usd: float = Field(default=0.0, description="예상 비용 합계 (USD)")
+
+    # BaseEntity 상속 부분 (created_at, updated_at)
+    created_at: Optional[datetime] = Field(default_factory=get_kst_now_naive)
+    updated_at: Optional[datetime] = Field(default_factory=get_kst_now_naive)
@@ -0,0 +1,45 @@
+from datetime import timedelta
+from typing import Optional
+from sqlalchemy.dialects.mysql import insert
+from sqlmodel import select
+
+from core.config.database_config import MySQLSessionLocal
+from core.database.repository.crud_repository import CRUDRepository
+from core.utils.datetime_utils import get_kst_now_naive
+from core.utils.section_cache import SectionCacheStore
+from domain.report.model.report_section_cache import ReportSectionCache
+
+
+class ReportSectionCacheRepository(CRUDRepository[ReportSectionCache], SectionCacheStore):
+    def model_class(self) -> type[ReportSectionCache]:
+        """ReportSectionCache 모델 클래스를 반환합니다."""
+        return ReportSectionCache
+
+    async def find(self, fingerprint: str) -> Optional[str]:
+        """만료되지 않은 섹션 결과 조회"""
+        async with MySQLSessionLocal() as session:
+            model = self.model_class()
+            result = await session.execute(
+                select(model.output).where(
+                    model.fingerprint == fingerprint,
+                    model.expires_at > get_kst_now_naive(),
+                )
+            )
+            return result.scalar_one_or_none()
+
+    async def put(self, fingerprint: str, section: str, output: str, ttl_seconds: int):
+        """섹션 결과 저장 (같은 지문이 있으면 결과와 만료 시각 갱신)"""
+        now = get_kst_now_naive()
+        expires_at = now + timedelta(seconds=ttl_seconds)
+        async with MySQLSessionLocal() as session:
+            stmt = insert(self.model_class()).values(
+                fingerprint=fingerprint,
+                section=section,
+                output=output,
+                expires_at=expires_at,
+                created_at=now,
+                updated_at=now,
+            )
+            stmt = stmt.on_duplicate_key_update(output=output, expires_at=expires_at, updated_at=now)
+            await session.execute(stmt)
+            await session.commit()
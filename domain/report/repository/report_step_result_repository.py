@@ -0,0 +1,108 @@
+from datetime import timedelta
+from typing import Iterable, Optional
+from sqlalchemy import and_, delete, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+
+from core.config.database_config import MySQLSessionLocal
+from core.utils.datetime_utils import get_kst_now_naive
+from core.utils.pipeline import STEP_COMPLETED, STEP_FAILED, STEP_IN_PROGRESS, StepResultStore, StoredStepResult
+from domain.report.model.report_step_result import ReportStepResult
+
+
+class ReportStepResultRepository(StepResultStore):
+    """
+    파이프라인 단계 결과 저장소 (report_id, step 단위)
+
+    StepResultStore의 save/delete는 CRUDRepository의 save(data)/delete(id)와 시그니처가 다르므로 CRUDRepository를 상속하지 않음
+    """
+
+    def model_class(self) -> type[ReportStepResult]:
+        """ReportStepResult 모델 클래스를 반환합니다."""
+        return ReportStepResult
+
+    async def find(self, run_id: int, step: str) -> Optional[StoredStepResult]:
+        """(report_id, step) 결과 조회"""
+        async with MySQLSessionLocal() as session:
+            model = self.model_class()
+            result = await session.execute(
+                select(model).where(model.report_id == run_id, model.step == step)
+            )
+            row = result.scalar_one_or_none()
+            if row is None:
+                return None
+            return StoredStepResult(status=row.status, fingerprint=row.fingerprint, output=row.output)
+
+    async def claim(self, run_id: int, step: str, fingerprint: str, lease_seconds: int) -> bool:
+        """
+        (report_id, step) 실행 권한을 원자적으로 선점
+
+        - 처음 실행하는 단계면 in_progress 행을 새로 만들고 선점
+        - failed 이거나, in_progress 지만 lease_seconds가 지났거나, 입력이 바뀐 completed 결과면 다시 선점
+        - 같은 입력으로 완료됐거나 다른 consumer가 실행 중이면 선점 실패
+
+        Returns:
+            선점 성공 시 True
+        """
+        now = get_kst_now_naive()
+        async with MySQLSessionLocal() as session:
+            # 1. 새 행 INSERT (unique 제약으로 동시에 하나만 성공)
+            try:
+                session.add(ReportStepResult(
+                    report_id=run_id,
+                    step=step,
+                    status=STEP_IN_PROGRESS,
+                    fingerprint=fingerprint,
+                    claimed_at=now,
+                    created_at=now,
+                    updated_at=now,
+                ))
+                await session.commit()
+                return True
+            except IntegrityError:
+                await session.rollback()
+
+            # 2. 기존 행이 다시 실행 가능한 상태일 때만 조건부 UPDATE
+            model = self.model_class()
+            stmt = update(model).where(
+                model.report_id == run_id,
+                model.step == step,
+                or_(
+                    model.status == STEP_FAILED,
+                    and_(
+                        model.status == STEP_IN_PROGRESS,
+                        model.claimed_at < now - timedelta(seconds=lease_seconds),
+                    ),
+                    and_(
+                        model.status == STEP_COMPLETED,
+                        model.fingerprint != fingerprint,
+                    ),
+                ),
+            ).values(status=STEP_IN_PROGRESS, fingerprint=fingerprint, output=None, claimed_at=now, updated_at=now)
+            result = await session.execute(stmt)
+            await session.commit()
+            return result.rowcount == 1
+
+    async def save(self, run_id: int, step: str, fingerprint: str, status: str, output: Optional[str] = None):
+        """단계 결과 저장 (선점한 행 갱신)"""
+        async with MySQLSessionLocal() as session:
+            model = self.model_class()
+            stmt = update(model).where(
+                model.report_id == run_id,
+                model.step == step,
+                model.fingerprint == fingerprint,
+            ).values(status=status, output=output, updated_at=get_kst_now_naive())
+            await session.execute(stmt)
+            await session.commit()
+
+    async def delete(self, run_id: int, steps: Iterable[str]):
+        """단계 결과 삭제"""
+        steps = list(steps)
+        if not steps:
+            return
+        async with MySQLSessionLocal() as session:
+            model = self.model_class()
+            await session.execute(
+                delete(model).where(model.report_id == run_id, model.step.in_(steps))
+            )
+            await session.commit()
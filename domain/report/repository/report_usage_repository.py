@@ -0,0 +1,53 @@
+from typing import List
+from sqlalchemy.dialects.mysql import insert
+from sqlmodel import select
+
+from core.config.database_config import MySQLSessionLocal
+from core.database.repository.crud_repository import CRUDRepository
+from core.utils.datetime_utils import get_kst_now_naive
+from core.utils.usage_ledger import UsageEntry, UsageStore
+from domain.report.model.report_usage import ReportUsage
+
+
+class ReportUsageRepository(CRUDRepository[ReportUsage], UsageStore):
+    def model_class(self) -> type[ReportUsage]:
+        """ReportUsage 모델 클래스를 반환합니다."""
+        return ReportUsage
+
+    async def add(self, entries: List[UsageEntry]):
+        """사용량 누적 저장 (같은 리포트/단계/종류/모델이 있으면 더함)"""
+        if not entries:
+            return
+        now = get_kst_now_naive()
+        async with MySQLSessionLocal() as session:
+            for entry in entries:
+                stmt = insert(self.model_class()).values(
+                    report_id=entry.report_id,
+                    step=entry.step,
+                    kind=entry.kind,
+                    model=entry.model,
+                    calls=entry.calls,
+                    prompt_tokens=entry.prompt_tokens,
+                    completion_tokens=entry.completion_tokens,
+                    latency_ms=entry.latency_ms,
+                    cost_usd=entry.cost_usd,
+                    created_at=now,
+                    updated_at=now,
+                )
+                stmt = stmt.on_duplicate_key_update(
+                    calls=stmt.table.c.calls + stmt.inserted.calls,
+                    prompt_tokens=stmt.table.c.prompt_tokens + stmt.inserted.prompt_tokens,
+                    completion_tokens=stmt.table.c.completion_tokens + stmt.inserted.completion_tokens,
+                    latency_ms=stmt.table.c.latency_ms + stmt.inserted.latency_ms,
+                    cost_usd=stmt.table.c.cost_usd + stmt.inserted.cost_usd,
+                    updated_at=now,
+                )
+                await session.execute(stmt)
+            await session.commit()
+
+    async def find_by_report_id(self, report_id: int) -> List[ReportUsage]:
+        """리포트의 단계/모델별 사용량 조회"""
+        async with MySQLSessionLocal() as session:
+            model = self.model_class()
+            result = await session.execute(select(model).where(model.report_id == report_id))
+            return list(result.scalars().all())
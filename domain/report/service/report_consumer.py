@@ -1,13 +1,276 @@
 
+import dataclasses
+import logging
 from abc import abstractmethod
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Iterable, List, Optional
+from faststream.kafka import KafkaBroker
 from core.kafka.base_consumer import BaseConsumer
+from core.utils.artifact_store import artifact_scope, artifact_store
+from core.utils import metrics
+from core.utils.llm_cache import bypass_llm_cache
+from core.utils.pipeline import Pipeline, PipelineStep
+from core.utils.quota_state import OPENAI
+from core.utils.step_events import step_events
+from core.utils.step_group import StepGroupError, StepOutcome
+from core.utils.usage_ledger import usage_scope
+from domain.report.repository.report_step_result_repository import ReportStepResultRepository
+from domain.report.repository.report_usage_repository import ReportUsageRepository
+from domain.task.model.task import Status
+from domain.task.repository.processed_message_repository import ProcessedMessageRepository
+
+logger = logging.getLogger(__name__)
+
+# 메시지 step별로 실행할 파이프라인 목표 단계 (선행 단계는 자동으로 포함)
+REPORT_PIPELINE_TARGETS: Dict[str, List[str]] = {
+    "overview": ["summary", "comment_summary", "metrics"],
+    "analysis": ["leave_analysis", "optimization"],
+    "idea": ["trends", "ideas"],
+}
+
+# 리포트 토픽 수신을 멈추고 기다릴 외부 API 리소스 (모든 step이 OpenAI를 사용)
+# YouTube Analytics를 사용하는 단계(metrics, leave_analysis)는 한도 초과 중이면 바로 실패해 재시도/DLQ로 보내므로
+# Analytics 일일 할당량 초과로 OpenAI만 사용하는 단계까지 멈추지 않음
+REPORT_QUOTA_RESOURCES = (OPENAI,)
 
 """
 뭐를 벡터db에 저장할 지는 아직 명확하지 않습니다.
 일단 리포트 만드는 김에 db에 저장하고, 다음 리포트 생성 때 context로 활용해서 결과를 보고 어떤 걸 저장할 지 확실히 정하는 것이 좋을 것 같습니다.
 """
 class ReportConsumer(BaseConsumer):
+
+    def __init__(self, broker: KafkaBroker):
+        super().__init__(broker)
+        self.processed_message_repository = ProcessedMessageRepository()
+        self.report_step_result_repository = ReportStepResultRepository()
+        self.report_usage_repository = ReportUsageRepository()
+
+    def register_handler(
+        self,
+        topic: str,
+        handler: Callable,
+        max_in_flight: Optional[int] = None,
+        weight: Optional[int] = None,
+        resources: Optional[Iterable[str]] = REPORT_QUOTA_RESOURCES,
+    ):
+        """리포트 토픽 핸들러 등록 (기본값: OpenAI 요청 한도 초과 중에만 수신 중단)"""
+        super().register_handler(topic, handler, max_in_flight=max_in_flight, weight=weight, resources=resources)
+
+    async def start_consuming(self, topics: List[str]):
+        """리포트 토픽 소비 시작 + 다른 프로세스의 파이프라인 단계 완료 이벤트 구독"""
+        await super().start_consuming(topics)
+        self._subscribe_step_ready()
+
+    def _subscribe_step_ready(self):
+        """
+        파이프라인 단계 완료 이벤트 구독
+
+        group 없이 구독해 모든 consumer 프로세스가 모든 이벤트를 받고,
+        같은 단계를 기다리는 파이프라인(예: idea 메시지의 summary)을 DB 조회 없이 바로 깨웁니다.
+        """
+        subscriber = self.broker.subscriber(
+            self.config.report_step_ready_topic,
+            group_id=None,
+            auto_offset_reset="latest",
+        )
+
+        @subscriber
+        async def step_ready_processor(event: Dict[str, Any]):
+            step_events.notify(event.get("report_id"), event.get("step"), event.get("status"))
+
+    async def _publish_step_ready(self, report_id: int, step: str, status: str):
+        """파이프라인 단계 완료 이벤트 발행 (다른 프로세스에서 기다리는 단계를 깨움)"""
+        await self.broker.publish(
+            {"report_id": report_id, "step": step, "status": status},
+            topic=self.config.report_step_ready_topic,
+            key=str(report_id).encode(),
+        )
+
+    async def _publish_summary_progress(self, report_id: int, summary: str):
+        """생성 중인 영상 요약 발행 (완성된 구간까지, 최종 요약은 summary 단계 완료 후 리포트에서 조회)"""
+        await self.broker.publish(
+            {"report_id": report_id, "summary": summary},
+            topic=self.config.report_summary_progress_topic,
+            key=str(report_id).encode(),
+        )
+
+    async def _process_message(self, topic: str, message: Dict[str, Any], handler: Callable):
+        """
+        (task_id, step) 단위로 한 번만 처리되도록 감싸서 실행
+
+        - task의 해당 단계가 이미 COMPLETED면 건너뜀
+        - processed_message 행을 원자적으로 선점(IN_PROGRESS)한 consumer만 처리
+        """
+        task_id = message.get("task_id") if isinstance(message, dict) else None
+        step = message.get("step") if isinstance(message, dict) else None
+        if task_id is None or not step:
+            await super()._process_message(topic, message, handler)
+            return
+
+        task = await self.task_repository.find_by_id(task_id)
+        if task and getattr(task, f"{step}_status", None) == Status.COMPLETED:
+            logger.info(f"이미 완료된 단계라 건너뜁니다: task_id={task_id}, step={step}")
+            return
+
+        claimed = await self.processed_message_repository.claim(
+            task_id, step, lease_seconds=self.config.consumer_claim_lease_seconds
+        )
+        if not claimed:
+            logger.info(f"이미 처리 중이거나 완료된 메시지라 건너뜁니다: task_id={task_id}, step={step}")
+            return
+
+        try:
+            await super()._process_message(topic, message, handler)
+        except Exception:
+            # 재시도 토픽에서 다시 선점할 수 있도록 FAILED로 기록
+            await self.processed_message_repository.update_status(task_id, step, Status.FAILED)
+            raise
+        await self.processed_message_repository.update_status(task_id, step, Status.COMPLETED)
+
+    def _report_pipeline_steps(self, video: Any, report_id: int, token: Optional[str], skip_vector_save: bool) -> List[PipelineStep]:
+        """
+        리포트 파이프라인 단계 정의
+
+        각 단계는 inputs에 선언한 단계의 결과만 사용하고, 결과는 report_step_result에 저장되어
+        다른 토픽의 메시지나 재시도에서 다시 사용됩니다.
+        """
+        video_params = {"video_id": getattr(video, "id", None), "skip_vector_save": skip_vector_save}
+
+        async def ideas(inputs: Dict[str, Any]) -> bool:
+            # 채널 정보는 아이디어 서비스에서 필요하므로 조회
+            # 채널이 없으면 재시도해도 성공하지 않으므로 영구적인 오류로 실패 처리 (단계는 FAILED로 저장, 메시지는 DLQ로 이동)
+            channel_id = getattr(video, "channel_id", None)
+            if not channel_id:
+                raise ValueError(f"video_id={getattr(video, 'id', None)}에 channel_id가 없어 아이디어를 생성할 수 없습니다.")
+            channel = await self.channel_repository.find_by_id(channel_id)
+            if not channel:
+                raise ValueError(f"channel_id={channel_id}에 해당하는 채널이 없어 아이디어를 생성할 수 없습니다.")
+            await self.idea_service.create_idea(video, channel, report_id, summary=inputs["summary"] or "")
+            return True
+
+        return [
+            PipelineStep("transcript", lambda inputs: self.report_service.fetch_transcript(video), params=video_params),
+            PipelineStep(
+                "summary",
+                lambda inputs: self.report_service.create_summary(
+                    video,
+                    report_id,
+                    skip_vector_save=skip_vector_save,
+                    transcript=inputs["transcript"],
+                    on_progress=lambda summary: self._publish_summary_progress(report_id, summary),
+                ),
+                inputs=["transcript"],
+                params=video_params,
+            ),
+            PipelineStep("comments_fetch", lambda inputs: self.comment_service.fetch_comments(video, report_id), params=video_params),
+            PipelineStep(
+                "classification",
+                lambda inputs: self.comment_service.classify_comments(inputs["comments_fetch"] or []),
+                inputs=["comments_fetch"],
+            ),
+            PipelineStep(
+                "comment_summary",
+                lambda inputs: self.comment_service.summarize_classified_comments(report_id, inputs["classification"]),
+                inputs=["classification"],
+            ),
+            PipelineStep("metrics", lambda inputs: self.video_service.analyze_metrics(video, report_id, token), params=video_params),
+            PipelineStep(
+                "leave_analysis",
+                lambda inputs: self.report_service.analyze_viewer_retention(video, report_id, token, skip_vector_save=skip_vector_save),
+                params=video_params,
+            ),
+            PipelineStep(
+                "optimization",
+                lambda inputs: self.report_service.analyze_optimization(video, report_id, skip_vector_save=skip_vector_save),
+                params=video_params,
+            ),
+            PipelineStep(
+                "trends",
+                lambda inputs: self.report_service.analyze_trends_and_save(video, report_id, skip_vector_save=skip_vector_save),
+                params=video_params,
+            ),
+            PipelineStep("ideas", ideas, inputs=["summary"], params=video_params),
+        ]
+
+    def _with_usage(self, report_id: int, step: PipelineStep) -> PipelineStep:
+        """단계 실행 중 LLM / 임베딩 사용량을 report_usage에 (리포트, 단계) 단위로 기록하도록 감쌈"""
+        async def run(inputs: Dict[str, Any]) -> Any:
+            async with usage_scope(report_id, step.name, self.report_usage_repository):
+                return await step.run(inputs)
+
+        return dataclasses.replace(step, run=run)
+
+    async def _run_pipeline(
+        self,
+        step: str,
+        video: Any,
+        report_id: int,
+        message: Dict[str, Any],
+        skip_vector_save: bool = False,
+    ) -> Dict[str, StepOutcome]:
+        """
+        메시지 step(overview / analysis / idea)에 필요한 파이프라인 단계 실행
+
+        - 선행 단계(예: idea의 summary)는 저장된 결과를 재사용하거나, 다른 consumer가 실행 중이면 완료 이벤트를 기다림
+        - 서로 독립적인 단계는 동시에 실행하고, 재시도 시에는 실패했거나 입력이 바뀐 단계만 다시 실행
+        - 단계별 제한 시간: KafkaConfig.consumer_pipeline_step_timeouts
+        - 한 단계가 실패하면 KafkaConfig.consumer_pipeline_failure_policy 에 따라 나머지 단계를 취소하거나 끝까지 실행
+        - 단계별 결과는 로그와 report_sub_step_duration_seconds 메트릭으로 따로 기록
+        - 단계별 LLM / 임베딩 토큰 수와 예상 비용은 report_usage 테이블과 llm_* 메트릭에 기록
+        - 메시지의 bypass_llm_cache가 true면 LLM 응답 캐시를 조회하지 않고 새로 호출
+        - 자막 / 영상 상세 정보는 리포트 단위로 artifact_store에 보관해 단계 사이에서 재사용
+        """
+        pipeline = Pipeline(
+            [
+                self._with_usage(report_id, pipeline_step)
+                for pipeline_step in self._report_pipeline_steps(video, report_id, message.get("google_access_token"), skip_vector_save)
+            ],
+            self.report_step_result_repository,
+            lease_seconds=self.config.consumer_claim_lease_seconds,
+            recheck_interval=self.config.consumer_pipeline_recheck_interval_seconds,
+            on_step_done=self._publish_step_ready,
+        )
+        outcomes: Dict[str, StepOutcome] = {}
+        if message.get("bypass_llm_cache", False):
+            # 다시 생성 요청이면 보관 중인 원본 데이터도 새로 조회
+            artifact_store.discard(report_id)
+        try:
+            with artifact_scope(report_id), bypass_llm_cache(bool(message.get("bypass_llm_cache", False))):
+                outcomes = await pipeline.run(
+                    report_id,
+                    REPORT_PIPELINE_TARGETS[step],
+                    timeouts=self.config.consumer_pipeline_step_timeouts,
+                    policy=self.config.consumer_pipeline_failure_policy,
+                )
+            return outcomes
+        except StepGroupError as e:
+            outcomes = e.outcomes
+            raise
+        finally:
+            for outcome in outcomes.values():
+                status = "reused" if outcome.name in pipeline.reused else outcome.status
+                metrics.SUB_STEP_DURATION.labels(step, outcome.name, status).observe(outcome.elapsed)
+            logger.info(
+                f"[{step}] report_id={report_id} 단계별 결과: "
+                + ", ".join(
+                    f"{outcome.name}={'reused' if outcome.name in pipeline.reused else outcome.status}({outcome.elapsed:.2f}초)"
+                    for outcome in outcomes.values()
+                )
+            )
+
+    async def _update_task_status(self, message: Dict[str, Any], status: Status):
+        """메시지의 step에 해당하는 task 상태 업데이트 (예: overview -> overview_status)"""
+        step = message.get("step")
+        task = await self.task_repository.find_by_id(message["task_id"])
+        if task and step:
+            await self.task_repository.save({
+                "id": task.id,
+                f"{step}_status": status
+            })
+            logger.info(f"Task ID {task.id}의 {step}_status를 {status.name}로 업데이트했습니다.")
+
+    async def _on_dead_letter(self, topic: str, message: Dict[str, Any], error: Exception):
+        """재시도를 모두 소진했거나 영구적인 오류로 DLQ에 보낸 메시지는 task를 FAILED로 표시"""
+        await self._update_task_status(message, Status.FAILED)
     
     # @abstractmethod
     async def handle_overview(self, message: Dict[str, Any]):
@@ -96,26 +96,11 @@ class ReportConsumerImpl(ReportConsumer):
             report, video = result
             report_id = report.id  
 
-            # 요약 프로세스
+            # 요약 / 댓글 / 수치 정보 단계는 서로 독립적이므로 동시에 실행
             try:
-                await self.report_service.create_summary(video, report_id)
+                await self._run_pipeline("overview", video, report_id, message)
             except Exception as e:
-                logger.error(f"요약 프로세스 실패: {e!r}")
-                raise
-                
-            # 댓글 프로세스
-            try:
-                await self.comment_service.analyze_comments(video, report_id)
-            except Exception as e:
-                logger.error(f"댓글 프로세스 실패: {e!r}")
-                raise
-                
-            # 수치 정보 프로세스
-            try:
-                token = message.get("google_access_token")
-                await self.video_service.analyze_metrics(video, report_id, token)
-            except Exception as e:
-                logger.error(f"수치 정보 프로세스 실패: {e!r}")
+                logger.error(f"overview 프로세스 실패: {e!r}")
                 raise
 
 
@@ -130,14 +115,8 @@ class ReportConsumerImpl(ReportConsumer):
 
         except Exception as e:
             logger.error(f"handle_overview 처리 중 오류 발생: {e}")
-            # task 정보 업데이트
-            task = await self.task_repository.find_by_id(message["task_id"])
-            if task:
-                await self.task_repository.save({
-                    "id": task.id,
-                    "overview_status": Status.FAILED
-                })
-                logger.info(f"Task ID {task.id}의 overview_status를 FAILED로 업데이트했습니다.")
+            # 일시적인 오류는 재시도 토픽, 영구적인 오류나 재시도 소진은 DLQ로 보내고 task를 FAILED로 표시 (_handle_error)
+            raise
         finally:
             end_time = time.time()  # 종료 시간 기록
             elapsed_time = end_time - start_time
@@ -158,19 +137,11 @@ class ReportConsumerImpl(ReportConsumer):
             
             report, video = result
             
-            # 시청자 이탈 분석 프로세스
-            try:
-                token = message.get("google_access_token")
-                await self.report_service.analyze_viewer_retention(video, report.id, token)
-            except Exception as e:
-                logger.error(f"시청자 이탈 분석 프로세스 실패: {e!r}")
-                raise
-                
-            # 알고리즘 최적화 분석 프로세스
+            # 시청자 이탈 분석 / 알고리즘 최적화 분석 단계 실행
             try:
-                await self.report_service.analyze_optimization(video, report.id)
+                await self._run_pipeline("analysis", video, report.id, message)
             except Exception as e:
-                logger.error(f"알고리즘 최적화 분석 프로세스 실패: {e!r}")
+                logger.error(f"분석 프로세스 실패: {e!r}")
                 raise
 
             # task 업데이트
@@ -184,14 +155,8 @@ class ReportConsumerImpl(ReportConsumer):
 
         except Exception as e:
             logger.error(f"handle_analysis 처리 중 오류 발생: {e}")
-            # task 정보 업데이트
-            task = await self.task_repository.find_by_id(message["task_id"])
-            if task:
-                await self.task_repository.save({
-                    "id": task.id,
-                    "analysis_status": Status.FAILED
-                })
-                logger.info(f"Task ID {task.id}의 analysis_status를 FAILED로 업데이트했습니다.")
+            # 일시적인 오류는 재시도 토픽, 영구적인 오류나 재시도 소진은 DLQ로 보내고 task를 FAILED로 표시 (_handle_error)
+            raise
         finally:
             end_time = time.time()  # 종료 시간 기록
             elapsed_time = end_time - start_time
@@ -209,29 +174,11 @@ class ReportConsumerImpl(ReportConsumer):
                 return
             report, video = result
             report_id = report.id
-            # 트렌드 분석 및 키워드 저장 프로세스
-            try:
-                await self.report_service.analyze_trends_and_save(video, report_id)
-            except Exception as e:
-                logger.error(f"트렌드 분석 및 키워드 저장 프로세스 실패: {e!r}")
-                raise
-                
-            # 채널 정보는 아이디어 서비스에서 필요하므로 조회
-            channel_id = getattr(video, "channel_id", None)
-            if not channel_id:
-                logger.error("video에 channel_id가 없습니다.")
-                return
-                
-            channel = await self.channel_repository.find_by_id(channel_id)
-            if not channel:
-                logger.warning(f"channel_id={channel_id}에 해당하는 채널이 없습니다.")
-                return
-
-            # 아이디어 생성 프로세스
+            # 트렌드 분석 / 아이디어 생성 단계 실행 (아이디어는 summary 단계 결과를 입력으로 사용)
             try:
-                await self.idea_service.create_idea(video, channel, report_id)
+                await self._run_pipeline("idea", video, report_id, message)
             except Exception as e:
-                logger.error(f"아이디어 생성 프로세스 실패: {e!r}")
+                logger.error(f"아이디어 프로세스 실패: {e!r}")
                 raise
 
             # task 업데이트
@@ -245,14 +192,8 @@ class ReportConsumerImpl(ReportConsumer):
 
         except Exception as e:
             logger.error(f"handle_idea 처리 중 오류 발생: {e!r}")
-            # task 정보 업데이트
-            task = await self.task_repository.find_by_id(message["task_id"])
-            if task:
-                await self.task_repository.save({
-                    "id": task.id,
-                    "idea_status": Status.FAILED
-                })
-                logger.info(f"Task ID {task.id}의 idea_status를 FAILED로 업데이트했습니다.")
+            # 일시적인 오류는 재시도 토픽, 영구적인 오류나 재시도 소진은 DLQ로 보내고 task를 FAILED로 표시 (_handle_error)
+            raise
         finally:
             end_time = time.time()  # 종료 시간 기록
             elapsed_time = end_time - start_time
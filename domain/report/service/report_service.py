@@ -1,7 +1,8 @@
-from typing import DefaultDict, List, Any
+from typing import Awaitable, Callable, DefaultDict, List, Any, Optional
 import logging
 import json
 import asyncio
+import os
 import time
 from domain.comment.model.comment import Comment
 from domain.report.repository.report_repository import ReportRepository
@@ -12,11 +13,26 @@ from domain.channel.repository.channel_repository import ChannelRepository
 from domain.video.model.video import Video
 from domain.channel.model.channel import Channel
 from core.enums.source_type import SourceTypeEnum
-from external.rag.rag_service_impl import RagServiceImpl
+from core.llm.outline_stream import OutlineStreamBuffer
+from core.llm.prompt_template_manager import PromptTemplateManager
+from core.utils import metrics
+from core.utils.section_cache import SectionCache, content_hash, prompt_version, stats_bucket
+from core.utils.tracing import traced
+from domain.report.repository.report_section_cache_repository import ReportSectionCacheRepository
+from external.rag import rag_service_impl
+from external.rag.rag_service_impl import OPTIMIZATION_QUERY, SUMMARY_QUERY, SUMMARY_SEGMENT_QUERY, RagServiceImpl
 from external.rag import leave_analyize
 
 logger = logging.getLogger(__name__)
 
+# 영상 요약을 스트리밍으로 생성하며 완성된 구간(I., II., ...)부터 리포트에 저장할지 여부
+SUMMARY_STREAMING_ENABLED = os.getenv("SUMMARY_STREAMING_ENABLED", "true").lower() == "true"
+# 생성 중인 요약을 저장/전달하는 최소 간격 (초, 첫 구간은 완성되는 즉시 저장)
+SUMMARY_STREAM_FLUSH_SECONDS = float(os.getenv("SUMMARY_STREAM_FLUSH_SECONDS", "2"))
+# 알고리즘 최적화 분석 프롬프트에 들어가는 통계 값 (섹션 결과 캐시 지문에는 유효숫자 2자리 구간으로 사용)
+_VIDEO_STATS = ("viewCount", "likeCount", "commentCount")
+_CHANNEL_STATS = ("subscriberCount", "totalViewCount", "totalVideoCount")
+
 class ReportService:
     def __init__(self):
         self.report_repository = ReportRepository()
@@ -24,8 +40,33 @@ class ReportService:
         self.trend_keyword_repository = TrendKeywordRepository()
         self.channel_repository = ChannelRepository()
         self.rag_service = RagServiceImpl()
+        self.section_cache = SectionCache(ReportSectionCacheRepository())
+
+    @traced("report_service.fetch_transcript")
+    async def fetch_transcript(self, video: Video) -> str:
+        """
+        영상 자막 조회
+
+        Returns:
+            정리된 자막 (YouTube 영상 ID가 없거나 자막이 없으면 빈 문자열)
+        """
+        youtube_video_id = getattr(video, "youtube_video_id", None)
+        if not youtube_video_id:
+            logger.error("YouTube 영상 ID가 없습니다.")
+            return ""
+        # 자막 API 호출은 동기 방식이므로 스레드에서 실행
+        transcript = await asyncio.to_thread(self.rag_service.transcript_service.get_formatted_transcript, youtube_video_id)
+        return transcript or ""
 
-    async def create_summary(self, video: Video, report_id: int, skip_vector_save: bool = False) -> bool:
+    @traced("report_service.create_summary")
+    async def create_summary(
+        self,
+        video: Video,
+        report_id: int,
+        skip_vector_save: bool = False,
+        transcript: Optional[str] = None,
+        on_progress: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> Optional[str]:
         """
         영상 요약을 생성하고 Vector DB와 MySQL에 저장
         
@@ -33,9 +74,11 @@ class ReportService:
             video: 비디오 객체
             report_id: 리포트 ID
             skip_vector_save: Vector DB 저장 스킵 여부 (기본값: False)
+            transcript: 이미 가져온 자막 (없으면 자막부터 조회)
+            on_progress: 생성 중인 요약(완성된 구간까지)을 받을 콜백 (SUMMARY_STREAMING_ENABLED일 때만 호출)
             
         Returns:
-            성공 시 True, 실패 시 False
+            성공 시 생성한 요약, 실패 시 None
         """
         start_time = time.time()
         logger.info(f"📄 요약 생성 시작 - Report ID: {report_id}")
@@ -45,11 +88,29 @@ class ReportService:
             youtube_video_id = getattr(video, "youtube_video_id", None)
             if not youtube_video_id:
                 logger.error("YouTube 영상 ID가 없습니다.")
-                return False
+                return None
             
-            # 요약 생성 (LLM API 호출)
+            if transcript is None:
+                transcript = await self.fetch_transcript(video)
+
+            # 요약 생성 (LLM API 호출, 자막/프롬프트/모델이 같은 요약이 있으면 재사용)
             summary_start = time.time()
-            summary = self.rag_service.summarize_video(youtube_video_id)
+            # 스트리밍 모드에서는 완성된 구간부터 리포트에 저장해 개요 탭에 먼저 보이도록 함
+            summary = await self.section_cache.get_or_compute(
+                "summary",
+                {
+                    "transcript": content_hash(transcript),
+                    # 긴 자막은 구간 예산에 따라 나눠 요약하므로 구간 분할 기준도 결과에 영향
+                    "segments": [rag_service_impl.SUMMARY_SINGLE_SHOT_TOKEN_BUDGET, rag_service_impl.SUMMARY_SEGMENT_TOKEN_BUDGET],
+                    "prompt": prompt_version(PromptTemplateManager.get_video_summary_prompt(), SUMMARY_QUERY, SUMMARY_SEGMENT_QUERY),
+                    "model": self.rag_service.model_name,
+                },
+                lambda: (
+                    self.stream_summary(report_id, transcript, on_progress)
+                    if SUMMARY_STREAMING_ENABLED
+                    else self.rag_service.asummarize_transcript(transcript)
+                ),
+            )
             summary_time = time.time() - summary_start
             logger.info(f"🤖 LLM API 요약 생성 완료 ({summary_time:.2f}초)")
             logger.info("요약 결과:\n%s", summary)
@@ -77,13 +138,59 @@ class ReportService:
             
             total_time = time.time() - start_time
             logger.info(f"📄 요약 생성 전체 완료 ({total_time:.2f}초)")
-            return True
+            return summary
             
         except Exception as e:
             total_time = time.time() - start_time
             logger.error(f"📄 요약 생성 실패 ({total_time:.2f}초): {e}")
             raise
 
+    @traced("report_service.stream_summary")
+    async def stream_summary(
+        self,
+        report_id: int,
+        transcript: str,
+        on_progress: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> str:
+        """
+        영상 요약을 스트리밍으로 생성하면서 완성된 구간까지의 요약을 리포트에 저장
+
+        - 다음 구간 제목이 나오면 앞 구간이 완성된 것으로 보고, SUMMARY_STREAM_FLUSH_SECONDS 간격으로 저장 (첫 구간은 바로 저장)
+        - 중간 저장이나 on_progress 호출이 실패해도 요약 생성은 계속 진행
+
+        Returns:
+            전체 요약 (최종 저장은 호출한 쪽에서 수행)
+        """
+        start = time.monotonic()
+        buffer = OutlineStreamBuffer()
+        last_flush: Optional[float] = None
+        pending = False
+        async for chunk in self.rag_service.astream_summarize_transcript(transcript):
+            pending = buffer.feed(chunk) > 0 or pending
+            now = time.monotonic()
+            if pending and (last_flush is None or now - last_flush >= SUMMARY_STREAM_FLUSH_SECONDS):
+                if last_flush is None:
+                    metrics.SUMMARY_FIRST_CONTENT.observe(now - start)
+                    logger.info(f"📄 요약 첫 구간 저장 ({now - start:.2f}초) - Report ID: {report_id}")
+                await self._flush_partial_summary(report_id, buffer.completed_text, on_progress)
+                last_flush, pending = now, False
+        return buffer.text.strip()
+
+    async def _flush_partial_summary(
+        self,
+        report_id: int,
+        summary: str,
+        on_progress: Optional[Callable[[str], Awaitable[None]]],
+    ):
+        """생성 중인 요약을 리포트에 저장하고 on_progress로 전달"""
+        try:
+            await self.report_repository.save({"id": report_id, "summary": summary})
+            if on_progress is not None:
+                await on_progress(summary)
+        except Exception as e:
+            logger.warning(f"생성 중인 요약 저장 실패 - Report ID: {report_id}: {e!r}")
+
+    @traced("report_service.analyze_viewer_retention")
     async def analyze_viewer_retention(self, video: Video, report_id: int, token: str, skip_vector_save: bool = False) -> bool:
         """
         시청자 이탈 분석 (재시도 로직 포함)
@@ -157,6 +264,7 @@ class ReportService:
         except Exception as e:
             raise
 
+    @traced("report_service.analyze_optimization")
     async def analyze_optimization(self, video: Video, report_id: int, skip_vector_save: bool = False) -> bool:
         """
         알고리즘 최적화 분석
@@ -173,9 +281,25 @@ class ReportService:
         logger.info(f"⚙️ 알고리즘 최적화 분석 시작 - Report ID: {report_id}")
         
         try:
-            # 알고리즘 최적화 분석 (LLM API 호출)
+            # 알고리즘 최적화 분석 (LLM API 호출, 영상/채널 정보, 통계 구간, 이전 분석 사례, 프롬프트, 모델이 같은 결과가 있으면 재사용)
             opt_start = time.time()
-            analyze_opt = await self.rag_service.analyze_algorithm_optimization(video_id=video.youtube_video_id, skip_vector_save=skip_vector_save)
+            inputs = await self.rag_service.collect_algorithm_optimization_inputs(video.youtube_video_id, skip_vector_save)
+            video_data, channel_data = inputs["data"]["video"], inputs["data"]["channel"]
+            analyze_opt = await self.section_cache.get_or_compute(
+                "optimization",
+                {
+                    "video": {key: value for key, value in video_data.items() if key not in _VIDEO_STATS},
+                    "stats": {key: stats_bucket(video_data.get(key)) for key in _VIDEO_STATS},
+                    "channel": channel_data.get("name"),
+                    "channel_stats": {key: stats_bucket(channel_data.get(key)) for key in _CHANNEL_STATS},
+                    "previous_cases": content_hash(inputs["previous_cases"]),
+                    "prompt": prompt_version(PromptTemplateManager.get_algorithm_optimization_prompt(), OPTIMIZATION_QUERY),
+                    "model": self.rag_service.model_name,
+                },
+                lambda: self.rag_service.analyze_algorithm_optimization(
+                    video_id=video.youtube_video_id, skip_vector_save=skip_vector_save, inputs=inputs
+                ),
+            )
             opt_time = time.time() - opt_start
             logger.info(f"⚙️ 알고리즘 최적화 LLM 분석 완료 ({opt_time:.2f}초)")
             
@@ -207,6 +331,7 @@ class ReportService:
             logger.error(f"⚙️ 알고리즘 최적화 분석 실패 ({total_time:.2f}초): {e}")
             raise
 
+    @traced("report_service.analyze_trends_and_save")
     async def analyze_trends_and_save(self, video: Video, report_id: int, skip_vector_save: bool = False) -> bool:
         """
         트렌드 분석 및 키워드 저장
@@ -224,7 +349,7 @@ class ReportService:
         
         try:
             # 1. 실시간 트렌드 분석
-            realtime_keyword = self.rag_service.analyze_realtime_trends()
+            realtime_keyword = await self.rag_service.aanalyze_realtime_trends()
             
             # 2. 채널 정보 조회
             channel_id = getattr(video, "channel_id", None)
@@ -239,7 +364,7 @@ class ReportService:
             channel_concept = getattr(channel, "concept", "")
             target_audience = getattr(channel, "target", "")
             
-            channel_keyword = self.rag_service.analyze_channel_trends(
+            channel_keyword = await self.rag_service.aanalyze_channel_trends(
                 channel_concept=channel_concept,
                 target_audience=target_audience
             )
@@ -0,0 +1,24 @@
+from datetime import datetime
+from core.utils.datetime_utils import get_kst_now_naive
+from typing import Optional
+from sqlalchemy import UniqueConstraint
+from sqlmodel import SQLModel, Field
+from domain.task.model.task import Status
+
+
+class ProcessedMessage(SQLModel, table=True):
+    """(task_id, step) 단위 메시지 처리 이력 - 재전달된 메시지의 중복 처리 방지용"""
+    __tablename__ = "processed_message"
+    __table_args__ = (UniqueConstraint("task_id", "step", name="uk_processed_message_task_step"),)
+
+    # Primary Key
+    id: Optional[int] = Field(default=None, primary_key=True)
+
+    task_id: int = Field(description="Task ID")
+    step: str = Field(description="처리 단계 (overview, analysis, idea)")
+    status: Status = Field(description="처리 상태 (IN_PROGRESS, COMPLETED, FAILED)")
+    claimed_at: datetime = Field(default_factory=get_kst_now_naive, description="처리 시작(선점) 시각")
+
+    # BaseEntity 상속 부분 (created_at, updated_at)
+    created_at: Optional[datetime] = Field(default_factory=get_kst_now_naive)
+    updated_at: Optional[datetime] = Field(default_factory=get_kst_now_naive)
@@ -5,6 +5,7 @@ from enum import Enum
 class Status(str, Enum):
     """작업 상태 Enum"""
     PENDING = "pending"  # 대기 중
+    IN_PROGRESS = "in_progress"  # 처리 중 (processed_message 테이블에서만 사용)
     COMPLETED = "completed"  # 완료
     FAILED = "failed"  # 실패
 
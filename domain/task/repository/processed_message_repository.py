@@ -0,0 +1,71 @@
+from datetime import timedelta
+from sqlalchemy import and_, or_, update
+from sqlalchemy.exc import IntegrityError
+
+from core.config.database_config import MySQLSessionLocal
+from core.database.repository.crud_repository import CRUDRepository
+from core.utils.datetime_utils import get_kst_now_naive
+from domain.task.model.processed_message import ProcessedMessage
+from domain.task.model.task import Status
+
+
+class ProcessedMessageRepository(CRUDRepository[ProcessedMessage]):
+    def model_class(self) -> type[ProcessedMessage]:
+        """ProcessedMessage 모델 클래스를 반환합니다."""
+        return ProcessedMessage
+
+    async def claim(self, task_id: int, step: str, lease_seconds: int) -> bool:
+        """
+        (task_id, step) 처리 권한을 원자적으로 선점
+
+        - 처음 처리하는 단계면 IN_PROGRESS 행을 새로 만들고 선점
+        - FAILED 이거나, IN_PROGRESS 지만 lease_seconds가 지난 경우(처리하던 consumer가 죽은 경우) 다시 선점
+        - COMPLETED 이거나 다른 consumer가 처리 중이면 선점 실패
+
+        Returns:
+            선점 성공 시 True
+        """
+        now = get_kst_now_naive()
+        async with MySQLSessionLocal() as session:
+            # 1. 새 행 INSERT (unique 제약으로 동시에 하나만 성공)
+            try:
+                session.add(ProcessedMessage(
+                    task_id=task_id,
+                    step=step,
+                    status=Status.IN_PROGRESS,
+                    claimed_at=now,
+                    created_at=now,
+                    updated_at=now,
+                ))
+                await session.commit()
+                return True
+            except IntegrityError:
+                await session.rollback()
+
+            # 2. 기존 행이 재처리 가능한 상태일 때만 조건부 UPDATE
+            model = self.model_class()
+            stmt = update(model).where(
+                model.task_id == task_id,
+                model.step == step,
+                or_(
+                    model.status == Status.FAILED,
+                    and_(
+                        model.status == Status.IN_PROGRESS,
+                        model.claimed_at < now - timedelta(seconds=lease_seconds),
+                    ),
+                ),
+            ).values(status=Status.IN_PROGRESS, claimed_at=now, updated_at=now)
+            result = await session.execute(stmt)
+            await session.commit()
+            return result.rowcount == 1
+
+    async def update_status(self, task_id: int, step: str, status: Status) -> None:
+        """처리 결과 상태 저장"""
+        async with MySQLSessionLocal() as session:
+            model = self.model_class()
+            stmt = update(model).where(
+                model.task_id == task_id,
+                model.step == step,
+            ).values(status=status, updated_at=get_kst_now_naive())
+            await session.execute(stmt)
+            await session.commit()
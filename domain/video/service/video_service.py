@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from decimal import Decimal, ROUND_DOWN
 
@@ -6,6 +7,7 @@ import isodate
 import numpy as np
 
 from core.enums.avg_type import AvgType
+from core.utils.tracing import traced
 from domain.content_chunk.repository.content_chunk_repository import ContentChunkRepository
 from domain.video.model.video import Video
 from domain.video.repository.video_repository import VideoRepository
@@ -32,7 +34,7 @@ class VideoService:
             metrics = 'views,averageViewDuration,likes,shares,subscribersGained'
         )
 
-        video_detail = self.youtube_video_detail_service.get_video_details(video.youtube_video_id)
+        video_detail = await asyncio.to_thread(self.youtube_video_detail_service.get_video_details, video.youtube_video_id)
         google_result = video_analytics['rows'][0]
 
         analytics_data = {
@@ -244,6 +246,7 @@ class VideoService:
         return number
 
 
+    @traced("video_service.analyze_metrics")
     async def analyze_metrics(self, video: Video, report_id: int, access_token: str) -> bool:
         """
         영상의 수치 정보를 분석하고 리포트에 저장
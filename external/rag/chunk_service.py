@@ -1,12 +1,15 @@
+import logging
 from typing import List
 from datetime import datetime
 from domain.content_chunk.repository.content_chunk_repository import ContentChunkRepository
 
 from core.llm.prompt_template_manager import PromptTemplateManager
+from core.llm.response_models import MeaningChunkList
 from core.enums.source_type import SourceTypeEnum
 from external.rag.rag_service_impl import RagServiceImpl
 import json
 
+logger = logging.getLogger(__name__)
 
 content_chunk_repo = ContentChunkRepository()
 rag_service = RagServiceImpl()
@@ -201,28 +204,20 @@ async def create_meaning_chunks_with_focus(
         current_time += chunk_size
     context = json.dumps(chunk_list, ensure_ascii=False)
 
-    retry = 3
-    for attempt in range(retry + 1):
-        try:
-            query="이 데이터의 내용을 설명해줘"
-            summary = rag_service.execute_llm_chain(context, query, PromptTemplateManager.get_meaning_based_chunk_prompt())
-            summary_list = json.loads(summary)
-            if isinstance(summary_list, list):
-                break
-        except json.JSONDecodeError:
-            print(f"⚠️ JSON 파싱 실패 (시도 {attempt + 1}/{retry + 1})")
+    # 응답 형식은 structured output으로 보장되므로 파싱 실패 재시도 없이 한 번만 호출 (잘린 응답은 완성된 항목만 사용)
+    query="이 데이터의 내용을 설명해줘"
+    summary_list = await rag_service.aexecute_structured(context, query, PromptTemplateManager.get_meaning_based_chunk_prompt(), MeaningChunkList)
+    if len(summary_list) != len(row_list):
+        logger.warning(f"의미 기반 청킹 결과 개수 불일치 (입력 {len(row_list)}개, 응답 {len(summary_list)}개)")
 
-
-
-
-    for i in range(len(summary_list)):
-        print(summary_list[i][0],summary_list[i][1], summary_list[i][2],  row_list[i][0], row_list[i][1])
+    for summary, row in zip(summary_list, row_list):
+        logger.debug(f"의미 기반 청크: {summary.text} ({summary.start_time} - {summary.end_time}), rows={row[0]}, {row[1]}")
         chunk_meta={
         'chunk_type': 'mean',        # 청킹 타입
-        'time_start': summary_list[i][1],         # 구간 시작 시간 (초)
-        'time_end': summary_list[i][2],             # 구간 끝 시간 (초)
-        'audienceWatchRatio': row_list[i][0],    # 평균 시청률
-        'relativeRetentionPerformance': row_list[i][1],  # 평균 상대 유지율
+        'time_start': summary.start_time,         # 구간 시작 시간 (초)
+        'time_end': summary.end_time,             # 구간 끝 시간 (초)
+        'audienceWatchRatio': row[0],    # 평균 시청률
+        'relativeRetentionPerformance': row[1],  # 평균 상대 유지율
         'is_focus_zone': is_in_focus, # 집중 구간 여부
         'created_at' : datetime.now().isoformat()
         }
@@ -231,6 +226,6 @@ async def create_meaning_chunks_with_focus(
         await content_chunk_repo.save_context(
             source_type=SourceTypeEnum.VIEWER_ESCAPE_ANALYSIS.value.upper(),
             source_id=int(video_id),
-            context= summary_list[i][0],
+            context= summary.text,
             meta= chunk_meta
         )
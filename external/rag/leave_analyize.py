@@ -1,3 +1,4 @@
+import asyncio
 from typing import List
 
 from dotenv import load_dotenv
@@ -7,6 +8,7 @@ import external.rag.chunk_service as ChunkService # ← 지연 import로 순환
 from external.youtube.transcript_service import TranscriptService  # 유튜브 자막 처리 서비스
 from domain.video.model.video import Video
 from core.enums.source_type import SourceTypeEnum
+from core.utils.tracing import traced
 from external.rag.rag_service_impl import RagServiceImpl
 import json
 from core.llm.prompt_template_manager import PromptTemplateManager
@@ -22,6 +24,7 @@ content_repository = ContentChunkRepository()
 rag_service = RagServiceImpl()
 channel_repository = ChannelRepository()
 
+@traced("leave_analysis.analyze_leave")
 async def analyze_leave(video: Video, token: str) -> str:
     try:
         logger.info(f"시청자 이탈 분석 시작 - 비디오 ID: {video.id}, 유튜브 ID: {video.youtube_video_id}")
@@ -58,7 +61,7 @@ async def analyze_leave(video: Video, token: str) -> str:
         # 대본 스크립트 가져오기
         transcript_start = time.time()
         logger.info("📜 영상 자막 데이터 가져오는 중...")
-        context = transcript_service.get_structured_transcript(youtube_video_id)
+        context = await asyncio.to_thread(transcript_service.get_structured_transcript, youtube_video_id)
         transcript_time = time.time() - transcript_start
         logger.info(f"📜 자막 데이터 가져오기 완료 ({transcript_time:.2f}초)")
         
@@ -159,7 +162,7 @@ async def analyze_leave(video: Video, token: str) -> str:
         # 10. LLM 직접 호출해서 결과 가져오기
         llm_start = time.time()
         logger.info("🤖 LLM 이탈 분석 실행 중...")
-        result = rag_service.execute_llm_direct(formatted_prompt)
+        result = await rag_service.aexecute_llm_direct(formatted_prompt)
         llm_time = time.time() - llm_start
         logger.info(f"🤖 LLM 이탈 분석 완료 ({llm_time:.2f}초)")
         
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Optional, Type
+from pydantic import BaseModel
 from domain.video.model.video import Video
 from domain.channel.model.channel import Channel
+from domain.comment.model.comment_type import CommentType
 
 
 class RagService(ABC):
@@ -11,24 +13,78 @@ class RagService(ABC):
     def summarize_video(self, video_id: str) -> str:
         """비디오 요약"""
         pass
+
+    @abstractmethod
+    async def asummarize_video(self, video_id: str) -> str:
+        """비디오 요약 (비동기)"""
+        pass
+    
+    @abstractmethod
+    def summarize_transcript(self, context: str) -> str:
+        """이미 가져온 자막으로 비디오 요약"""
+        pass
+
+    @abstractmethod
+    async def asummarize_transcript(self, context: str) -> str:
+        """이미 가져온 자막으로 비디오 요약 (비동기)"""
+        pass
+
+    @abstractmethod
+    def astream_summarize_transcript(self, context: str) -> AsyncIterator[str]:
+        """이미 가져온 자막으로 비디오 요약 (생성되는 대로 조각 단위로 반환)"""
+        pass
     
     @abstractmethod
     def classify_comment(self, comment: str) -> Dict[str, Any]:
         """댓글 감정 분류"""
         pass
+
+    @abstractmethod
+    async def aclassify_comment(self, comment: str) -> Dict[str, Any]:
+        """댓글 감정 분류 (비동기)"""
+        pass
     
+    @abstractmethod
+    def classify_comments_batch(self, comments: List[str]) -> List[CommentType]:
+        """여러 댓글 감정 일괄 분류 (입력 순서와 같은 감정 목록)"""
+        pass
+
+    @abstractmethod
+    async def aclassify_comments_batch(self, comments: List[str]) -> List[CommentType]:
+        """여러 댓글 감정 일괄 분류 (비동기)"""
+        pass
+
     @abstractmethod
     def summarize_comments(self, comments: str) -> List[str]:
         """댓글 요약"""
         pass
+
+    @abstractmethod
+    async def asummarize_comments(self, comments: str) -> List[str]:
+        """댓글 요약 (비동기)"""
+        pass
     
     @abstractmethod
-    async def analyze_idea(self, video: Video, channel: Channel, summary: str) -> List[Dict[str, Any]]:
+    async def collect_idea_inputs(self, video: Video, channel: Channel, summary: str) -> Dict[str, str]:
+        """아이디어 프롬프트 입력 수집"""
+        pass
+
+    @abstractmethod
+    async def analyze_idea(
+        self, video: Video, channel: Channel, summary: str, inputs: Optional[Dict[str, str]] = None
+    ) -> List[Dict[str, Any]]:
         """아이디어 분석"""
         pass
+
+    @abstractmethod
+    async def collect_algorithm_optimization_inputs(self, video_id: str, skip_vector_save: bool = False) -> Dict[str, Any]:
+        """알고리즘 최적화 분석 프롬프트 입력 수집"""
+        pass
     
     @abstractmethod
-    def analyze_algorithm_optimization(self, video_id: str) -> str:
+    def analyze_algorithm_optimization(
+        self, video_id: str, skip_vector_save: bool = False, inputs: Optional[Dict[str, Any]] = None
+    ) -> str:
         """알고리즘 최적화 분석"""
         pass
 
@@ -37,17 +93,52 @@ class RagService(ABC):
         """LLM 체인 실행"""
         pass
 
+    @abstractmethod
+    async def aexecute_llm_chain(self, context: str, query: str, prompt_template: str) -> str:
+        """LLM 체인 실행 (비동기)"""
+        pass
+
+    @abstractmethod
+    def astream_llm_chain(self, context: str, query: str, prompt_template: str) -> AsyncIterator[str]:
+        """LLM 체인 스트리밍 실행 (응답 조각을 생성되는 대로 반환)"""
+        pass
+
+    @abstractmethod
+    def execute_structured(self, context: str, query: str, prompt_template: str, response_model: Type[BaseModel]) -> List[BaseModel]:
+        """응답 스키마를 강제한 LLM 체인 실행 (response_model의 items 항목 목록)"""
+        pass
+
+    @abstractmethod
+    async def aexecute_structured(self, context: str, query: str, prompt_template: str, response_model: Type[BaseModel]) -> List[BaseModel]:
+        """응답 스키마를 강제한 LLM 체인 실행 (비동기)"""
+        pass
+
     @abstractmethod
     def execute_llm_direct(self, prompt: str) -> str:
         """LLM 직접 실행"""
         pass
 
+    @abstractmethod
+    async def aexecute_llm_direct(self, prompt: str) -> str:
+        """LLM 직접 실행 (비동기)"""
+        pass
+
     @abstractmethod
     def analyze_realtime_trends(self, limit: int = 6, geo: str = "KR") -> Dict:
         """실시간 트렌드 분석, 유튜브 컨텐츠에 적합한 형태로 반환"""
         pass
 
+    @abstractmethod
+    async def aanalyze_realtime_trends(self, limit: int = 6, geo: str = "KR") -> Dict:
+        """실시간 트렌드 분석 (비동기)"""
+        pass
+
     @abstractmethod
     def analyze_channel_trends(self, channel_concept: str, target_audience: str) -> Dict:
         """채널 맞춤형 트렌드 분석"""
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    async def aanalyze_channel_trends(self, channel_concept: str, target_audience: str) -> Dict:
+        """채널 맞춤형 트렌드 분석 (비동기)"""
+        pass
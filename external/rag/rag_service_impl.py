@@ -1,5 +1,6 @@
 from external.rag.rag_service import RagService
 from external.youtube.transcript_service import TranscriptService
+from core.utils.tracing import TracingCallbackHandler, traced
 from external.youtube.video_detail_service import VideoDetailService
 from external.youtube.youtube_video_service import VideoService
 from external.youtube.youtube_comment_service import YoutubeCommentService
@@ -9,21 +10,127 @@ from domain.channel.model.channel import Channel
 from domain.comment.model.comment_type import CommentType
 from core.enums.source_type import SourceTypeEnum
 from langchain_core.documents import Document
+from langchain_core.runnables import Runnable
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
 from langchain_core.prompts.chat import ChatPromptTemplate, HumanMessagePromptTemplate
 from langchain.chains.combine_documents import create_stuff_documents_chain
+from core.llm.outline_stream import OutlineMerger
 from core.llm.prompt_template_manager import PromptTemplateManager
+from core.llm.response_models import CommentEmotion, CommentEmotionBatch, CommentSummaryList, IdeaList
+from core.llm.structured_output import item_model, parse_items
+from core.llm.transcript_segments import amap_segments, plan_segments, segment_time_range
+from core.utils.metrics import MetricsCallbackHandler
+from core.utils.quota_state import QuotaCallbackHandler
+from core.utils.usage_ledger import UsageCallbackHandler
+from core.utils.llm_cache import llm_cache
+from core.utils.rate_limiter import RateLimitCallbackHandler, chat_rate_limiter, estimate_tokens
+from core.utils.semantic_cache import SemanticCache, normalize_text
 from external.youtube.trend_service import TrendService
-from typing import List, Dict, Any
+from pydantic import BaseModel
+from typing import AsyncIterator, Coroutine, List, Dict, Any, Optional, Sequence, Tuple, Type
 from datetime import datetime
+import asyncio
+import contextvars
 import json
 import logging
+import openai
+import os
+import threading
 import time
 
 
 logger = logging.getLogger(__name__)
 
+# 댓글 일괄 분류 설정 (LLM 호출 1회에 넣을 댓글 토큰 수 / 댓글 수, 동시에 실행할 호출 수)
+COMMENT_BATCH_TOKEN_BUDGET = int(os.getenv("COMMENT_BATCH_TOKEN_BUDGET", "3000"))
+COMMENT_BATCH_MAX_SIZE = int(os.getenv("COMMENT_BATCH_MAX_SIZE", "50"))
+COMMENT_BATCH_CONCURRENCY = int(os.getenv("COMMENT_BATCH_CONCURRENCY", "4"))
+# 영상 요약 설정 (자막이 SUMMARY_SINGLE_SHOT_TOKEN_BUDGET 토큰 이하면 한 번에 요약하고,
+# 넘으면 SUMMARY_SEGMENT_TOKEN_BUDGET 토큰 구간으로 나눠 SUMMARY_MAP_CONCURRENCY개까지 동시에 요약한 뒤 합침)
+SUMMARY_SINGLE_SHOT_TOKEN_BUDGET = int(os.getenv("SUMMARY_SINGLE_SHOT_TOKEN_BUDGET", "12000"))
+SUMMARY_SEGMENT_TOKEN_BUDGET = int(os.getenv("SUMMARY_SEGMENT_TOKEN_BUDGET", "6000"))
+SUMMARY_MAP_CONCURRENCY = int(os.getenv("SUMMARY_MAP_CONCURRENCY", "4"))
+# 일괄 분류 시 댓글 하나에 사용할 최대 글자 수 (긴 댓글은 앞부분만으로 감정 판단)
+COMMENT_BATCH_MAX_CHARS = 500
+
+# 섹션별 LLM 질문 (섹션 결과 캐시 지문의 프롬프트 버전에도 포함)
+SUMMARY_QUERY = "유튜브 영상 자막을 기반으로 10초 단위 개요를 위의 형식에 따라 작성해주세요."
+SUMMARY_SEGMENT_QUERY = (
+    "긴 유튜브 영상 자막의 {position}입니다. "
+    "이 부분의 자막을 기반으로 10초 단위 개요를 위의 형식에 따라 작성해주세요. "
+    "구간 시간은 자막에 표시된 실제 영상 시간을 사용하세요."
+)
+COMMENT_BATCH_QUERY = "댓글 {count}개의 감정을 분류하여 id별 결과를 출력해주세요."
+COMMENT_SUMMARY_QUERY = "유튜브 댓글을 분석하여 요약해주세요."
+IDEA_QUERY = "트렌드 분석 후, 이 유튜브 영상과 관련된 새 컨텐츠에 대한 아이디어를 3개 생성해주세요."
+OPTIMIZATION_QUERY = "이 유튜브 영상의 알고리즘 최적화 상태를 분석하고 구체적인 개선 방안을 제시해주세요."
+
+
+# 전역에서 사용할 댓글 감정 분류 근사 중복 캐시 (싱글톤 패턴)
+comment_classification_cache = SemanticCache("comment_classification")
+
+
+def _batch_comments(comments: List[str], token_budget: int, max_size: int) -> List[List[Tuple[int, str]]]:
+    """(id, 댓글) 목록을 토큰 예산과 최대 개수에 맞춰 묶음으로 나눔"""
+    batches: List[List[Tuple[int, str]]] = []
+    current: List[Tuple[int, str]] = []
+    current_tokens = 0
+    for index, comment in enumerate(comments):
+        content = (comment or "")[:COMMENT_BATCH_MAX_CHARS]
+        tokens = estimate_tokens(content)
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_size):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append((index, content))
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _parse_batch_emotions(items: Sequence[CommentEmotion], ids: Sequence[int]) -> Dict[int, CommentType]:
+    """
+    일괄 분류 응답 항목에서 {id: 감정} 추출
+
+    - 감정 값(1~4)은 응답 스키마로 보장되고, 요청하지 않았거나 중복된 id만 버림 (빠진 id는 호출한 쪽에서 다시 요청)
+    """
+    wanted = set(ids)
+    emotions: Dict[int, CommentType] = {}
+    for item in items:
+        if item.id in wanted and item.id not in emotions:
+            emotions[item.id] = CommentType.from_emotion_code(item.emotion)
+    return emotions
+
+
+# 동기 메서드(execute_llm_chain 등)를 실행하는 전용 이벤트 루프
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+
+def _run_sync(coroutine: Coroutine[Any, Any, Any]) -> Any:
+    """
+    비동기 메서드를 이벤트 루프가 없는 동기 코드(스크립트, 스레드)에서 실행
+
+    OpenAI 비동기 클라이언트의 연결은 이벤트 루프에 묶이므로 호출마다 새 루프를 만들지 않고
+    전용 스레드의 이벤트 루프 하나에서 실행합니다. (tracing 구간, 사용량 장부는 호출한 쪽 context를 그대로 사용)
+    """
+    global _sync_loop
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        coroutine.close()
+        raise RuntimeError("이벤트 루프 안에서는 비동기 메서드(a로 시작하는 메서드)를 await 해야 합니다.")
+
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, name="rag-sync-loop", daemon=True).start()
+    future = contextvars.copy_context().run(asyncio.run_coroutine_threadsafe, coroutine, _sync_loop)
+    return future.result()
+
 
 class RagServiceImpl(RagService):
     def __init__(self):
@@ -33,81 +140,243 @@ class RagServiceImpl(RagService):
         self.content_chunk_repository = ContentChunkRepository()
         self.trend_service = TrendService()
         self.youtube_video_service = VideoService()
-        self.llm = ChatOpenAI(model="gpt-4o-mini")
+        # 같은 모델/설정/프롬프트의 응답은 llm_cache에서 재사용 (LLM_CACHE_ENABLED=false면 사용하지 않음)
+        # 캐시에 없는 호출은 프로세스 전체가 공유하는 chat_rate_limiter 한도 안에서 실행
+        self.llm = ChatOpenAI(
+            model="gpt-4o-mini",
+            cache=llm_cache,
+            rate_limiter=chat_rate_limiter,
+            callbacks=[QuotaCallbackHandler(), MetricsCallbackHandler(), TracingCallbackHandler(), UsageCallbackHandler(), RateLimitCallbackHandler()],
+        )
+        # (프롬프트 템플릿, 입력 변수, 응답 모델)별 LLM 체인 (호출마다 체인을 다시 만들지 않도록 재사용)
+        self._chains: Dict[Tuple[str, Tuple[str, ...], Optional[Type[BaseModel]]], Runnable] = {}
+
+    @property
+    def model_name(self) -> str:
+        """사용 중인 LLM 모델 이름 (섹션 결과 캐시 지문에 사용)"""
+        return self.llm.model_name
     
     def summarize_video(self, video_id: str) -> str:
-        context = self.transcript_service.get_formatted_transcript(video_id)
-        print("정리된 자막 = ", context)
-        print()
-        
+        return _run_sync(self.asummarize_video(video_id))
+
+    async def asummarize_video(self, video_id: str) -> str:
+        context = await asyncio.to_thread(self.transcript_service.get_formatted_transcript, video_id)
+        logger.debug(f"정리된 자막 ({video_id}): {context}")
+        return await self.asummarize_transcript(context)
 
+    def summarize_transcript(self, context: str) -> str:
+        return _run_sync(self.asummarize_transcript(context))
+
+    @traced("rag_service.summarize_transcript")
+    async def asummarize_transcript(self, context: str) -> str:
         # 자막이 없는 경우 바로 메시지 반환
         if not context or context.strip() == "":
             return "자막을 불러올 수 없는 영상입니다."
 
-        query = "유튜브 영상 자막을 기반으로 10초 단위 개요를 위의 형식에 따라 작성해주세요."
-        return self.execute_llm_chain(context, query, PromptTemplateManager.get_video_summary_prompt())
+        segments = self._plan_summary_segments(context)
+        if len(segments) == 1:
+            return await self.aexecute_llm_chain(context, SUMMARY_QUERY, PromptTemplateManager.get_video_summary_prompt())
+
+        merger = OutlineMerger()
+        outlines = [merger.add(outline) async for outline in self._amap_summary_segments(segments)]
+        return "".join(outlines).strip()
+
+    async def astream_summarize_transcript(self, context: str) -> AsyncIterator[str]:
+        """asummarize_transcript와 같은 요약을 생성되는 대로 조각 단위로 반환 (구간으로 나눈 자막은 구간 개요 단위)"""
+        if not context or context.strip() == "":
+            yield "자막을 불러올 수 없는 영상입니다."
+            return
+
+        segments = self._plan_summary_segments(context)
+        if len(segments) == 1:
+            async for chunk in self.astream_llm_chain(context, SUMMARY_QUERY, PromptTemplateManager.get_video_summary_prompt()):
+                yield chunk
+            return
+
+        merger = OutlineMerger()
+        async for outline in self._amap_summary_segments(segments):
+            yield merger.add(outline)
+
+    @staticmethod
+    def _plan_summary_segments(context: str) -> List[str]:
+        """
+        자막 요약 방식 결정
+
+        Returns:
+            한 번에 요약할 수 있으면 [자막], 너무 길면 자막 줄(타임스탬프) 경계에서 나눈 구간 목록
+        """
+        segments = plan_segments(context, SUMMARY_SINGLE_SHOT_TOKEN_BUDGET, SUMMARY_SEGMENT_TOKEN_BUDGET)
+        if len(segments) > 1:
+            logger.info(f"자막이 길어 구간 {len(segments)}개로 나눠 요약합니다. (예상 {estimate_tokens(context)} 토큰)")
+        return segments
+
+    def _amap_summary_segments(self, segments: List[str]) -> AsyncIterator[str]:
+        """자막 구간별 개요를 SUMMARY_MAP_CONCURRENCY개까지 동시에 생성하고 구간 순서대로 반환"""
+
+        async def summarize(index: int, segment: str) -> str:
+            time_range = segment_time_range(segment)
+            position = f"{index + 1}/{len(segments)}번째 부분" + (f"({time_range[0]} - {time_range[1]})" if time_range else "")
+            query = SUMMARY_SEGMENT_QUERY.format(position=position)
+            return await self.aexecute_llm_chain(segment, query, PromptTemplateManager.get_video_summary_prompt())
+
+        return amap_segments(segments, summarize, SUMMARY_MAP_CONCURRENCY)
     
     def classify_comment(self, comment: str) -> Dict[str, Any]:
-        query = "유튜브 댓글을 분석하여 감정을 분류하고 백틱(```)이나 설명 없이 순수 JSON으로 출력해주세요."
-        result = self.execute_llm_chain(comment, query, PromptTemplateManager.get_comment_reaction_prompt())
-        print("LLM 응답 = ", result)
+        return _run_sync(self.aclassify_comment(comment))
 
+    @traced("rag_service.classify_comment")
+    async def aclassify_comment(self, comment: str) -> Dict[str, Any]:
+        """댓글 하나의 감정 분류 (근사 중복 캐시를 함께 사용하도록 일괄 분류와 같은 경로로 실행)"""
+        comment_types = await self.aclassify_comments_batch([comment])
+        return {
+            "comment_type": comment_types[0]
+        }
+
+    def classify_comments_batch(self, comments: List[str]) -> List[CommentType]:
+        return _run_sync(self.aclassify_comments_batch(comments))
+
+    @traced("rag_service.classify_comments_batch")
+    async def aclassify_comments_batch(
+        self,
+        comments: List[str],
+        token_budget: int = COMMENT_BATCH_TOKEN_BUDGET,
+        max_batch_size: int = COMMENT_BATCH_MAX_SIZE,
+        concurrency: int = COMMENT_BATCH_CONCURRENCY,
+    ) -> List[CommentType]:
+        """
+        여러 댓글의 감정을 묶음 단위 LLM 호출로 분류
+
+        - 내용이 같은 댓글(공백/반복 문자 정리 후)은 한 번만 분류하고, 근사 중복 캐시(comment_classification_cache)에 있는 댓글은 LLM에 보내지 않음
+        - 나머지 댓글에 id를 붙여 토큰 예산(token_budget) 안에서 한 프롬프트에 묶고, 묶음들은 concurrency개까지 동시에 호출
+        - 응답에서 빠졌거나 잘못된 id는 한 번 더 묶어서 요청하고, 그래도 없으면 중립으로 처리
+
+        Args:
+            comments: 댓글 내용 목록
+
+        Returns:
+            입력 순서와 같은 감정 목록
+        """
+        # 1. 내용이 같은 댓글은 대표 댓글 하나만 분류
+        unique_index: Dict[str, int] = {}
+        representatives = [unique_index.setdefault(normalize_text(comment), index) for index, comment in enumerate(comments)]
+        unique = sorted(set(representatives))
+
+        # 2. 근사 중복 캐시 조회
+        emotions, embeddings = await self._lookup_comment_cache(comments, unique)
+        pending = [index for index in unique if index not in emotions]
+
+        # 3. 캐시에 없는 댓글만 묶음 단위로 LLM 분류
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        classified: Dict[int, CommentType] = {}
+
+        async def classify(batch: List[Tuple[int, str]]):
+            ids = [id_ for id_, _ in batch]
+            context = json.dumps([{"id": id_, "content": content} for id_, content in batch], ensure_ascii=False)
+            query = COMMENT_BATCH_QUERY.format(count=len(batch))
+            async with semaphore:
+                try:
+                    items = await self.aexecute_structured(
+                        context, query, PromptTemplateManager.get_comment_batch_reaction_prompt(), CommentEmotionBatch
+                    )
+                except Exception as e:
+                    logger.warning(f"댓글 일괄 분류 호출 실패 ({len(batch)}개): {e!r}")
+                    return
+            classified.update(_parse_batch_emotions(items, ids))
+
+        async def classify_indices(indices: List[int]) -> int:
+            batches = _batch_comments([comments[index] for index in indices], token_budget, max_batch_size)
+            await asyncio.gather(*(
+                classify([(indices[position], content) for position, content in batch])
+                for batch in batches
+            ))
+            return len(batches)
+
+        llm_calls = await classify_indices(pending) if pending else 0
+
+        # 응답에서 빠진 댓글은 한 번 더 요청
+        missing = [index for index in pending if index not in classified]
+        if missing:
+            logger.warning(f"댓글 일괄 분류 결과 누락 {len(missing)}개 재요청")
+            llm_calls += await classify_indices(missing)
+
+        # 4. 새로 분류한 결과는 근사 중복 캐시에 저장
+        for index, comment_type in classified.items():
+            comment_classification_cache.add(comments[index], embeddings.get(index), comment_type.value)
+        emotions.update(classified)
+
+        unresolved = len(pending) - len(classified)
+        logger.info(
+            f"댓글 일괄 분류 완료: {len(comments)}개 (중복 제외 {len(unique)}개, 캐시 재사용 {len(unique) - len(pending)}개), LLM 호출 {llm_calls}회"
+            + (f", 분류 실패(중립 처리) {unresolved}개" if unresolved else "")
+        )
+        return [emotions.get(representative, CommentType.NEUTRAL) for representative in representatives]
+
+    async def _lookup_comment_cache(
+        self,
+        comments: List[str],
+        indices: List[int],
+    ) -> Tuple[Dict[int, CommentType], Dict[int, List[float]]]:
+        """
+        근사 중복 캐시에서 댓글 감정 조회
+
+        Returns:
+            ({캐시에서 찾은 index: 감정}, {캐시에 없는 index: 임베딩})
+            (임베딩 생성에 실패하면 내용이 같은 댓글만 재사용)
+        """
+        found: Dict[int, CommentType] = {}
+        remaining: List[int] = []
+        for index in indices:
+            value = comment_classification_cache.get_exact(comments[index])
+            if value is None:
+                remaining.append(index)
+                continue
+            comment_classification_cache.record_exact_hit()
+            found[index] = CommentType(value)
+
+        embeddings: Dict[int, List[float]] = {}
+        if not remaining:
+            return found, embeddings
         try:
-            clean_json_str = result.strip().replace("```json", "").replace("```", "")
-            result_json = json.loads(clean_json_str)
-            
-            # 리스트로 반환된 경우 첫 번째 요소 사용
-            if isinstance(result_json, list):
-                if result_json and isinstance(result_json[0], dict):
-                    emotion_value = result_json[0].get("emotion")
-                    logger.warning(f"LLM이 리스트로 반환됨. 첫 번째 요소 사용: {emotion_value}")
-                else:
-                    emotion_value = None
-            else:
-                emotion_value = result_json.get("emotion")
-            
-            return {
-                "comment_type": CommentType.from_emotion_code(emotion_value)
-            }
-        except json.JSONDecodeError as e:
-            print(f"JSON 파싱 오류: {e}, 원본 응답: {result}")
-            return {
-                "comment_type": CommentType.NEUTRAL
-            }
+            vectors = await self.content_chunk_repository.generate_embeddings(
+                [comments[index][:COMMENT_BATCH_MAX_CHARS] for index in remaining]
+            )
         except Exception as e:
-            logger.error(f"댓글 분류 중 예상치 못한 오류: {e}, 응답: {result}")
-            return {
-                "comment_type": CommentType.NEUTRAL
-            }
+            logger.warning(f"댓글 임베딩 생성 실패, 근사 중복 캐시 없이 분류합니다: {e!r}")
+            return found, embeddings
+        for index, vector in zip(remaining, vectors):
+            value = comment_classification_cache.lookup(vector)
+            if value is None:
+                embeddings[index] = vector
+            else:
+                found[index] = CommentType(value)
+        return found, embeddings
 
     def summarize_comments(self, comments: str) -> List[str]:
-        query = (
-            "유튜브 댓글을 분석하여 요약하고 "
-            "백틱(```)이나 설명 없이 순수 JSON으로 출력해주세요."
-        )
+        return _run_sync(self.asummarize_comments(comments))
 
-        result = self.execute_llm_chain(
-            comments, query, PromptTemplateManager.get_sumarlize_comment_prompt()
+    @traced("rag_service.summarize_comments")
+    async def asummarize_comments(self, comments: str) -> List[str]:
+        items = await self.aexecute_structured(
+            comments, COMMENT_SUMMARY_QUERY, PromptTemplateManager.get_sumarlize_comment_prompt(), CommentSummaryList
         )
-        print("LLM 응답 = ", result)
-
-        try:
-            clean_json_str = result.strip().replace("```json", "").replace("```", "")
-            result_list = json.loads(clean_json_str)
-            contents = [item["content"] for item in result_list if isinstance(item, dict) and "content" in item]
-            return contents
-        except json.JSONDecodeError as e:
-            print(f"JSON 파싱 오류: {e}, 원본 응답: {result}")
+        if not items:
+            logger.warning("댓글 요약 응답에 사용할 수 있는 항목이 없습니다.")
             return ["댓글 요약을 생성할 수 없습니다."]
+        return [item.content for item in items]
 
-    async def analyze_idea(self, video: Video, channel: Channel, summary: str) -> List[Dict[str, Any]]:
-        try:
-            # 0. 영상 내용 참고
-            sliced_summary = summary[:200]
+    @traced("rag_service.collect_idea_inputs")
+    async def collect_idea_inputs(self, video: Video, channel: Channel, summary: str) -> Dict[str, str]:
+        """
+        아이디어 프롬프트 입력 수집 (내 채널/영상 정보와 유사 인기 영상)
 
-            # 1. 내 채널, 내 영상
-            origin_context = f"""
+        Returns:
+            {"origin": 내 채널/영상 정보, "popularity": 유사 인기 영상 목록}
+        """
+        # 0. 영상 내용 참고
+        sliced_summary = summary[:200]
+
+        # 1. 내 채널, 내 영상
+        origin_context = f"""
             - 분석 영상 제목: {video.title}
             - 분석 영상 설명: {video.description}
             - 분석 영상 카테고리 : {video.video_category.name}
@@ -116,133 +385,159 @@ class RagServiceImpl(RagService):
             - 타겟 시청자: {channel.target}
             - 내용 : {sliced_summary}
             """
-            logging.info("아이디어 내 채널 확인 : %s", origin_context)
-
-            # 2. 인기 동영상 목록 유튜브 호출 (YouTube API)
-            api_start = time.time()
-            logger.info("📱 YouTube 인기 동영상 API 호출 중...")
-            category_id = video.video_category.value
-            popular_videos = self.youtube_video_service.get_category_popular(category_id)
-            api_time = time.time() - api_start
-            logger.info(f"📱 YouTube 인기 동영상 API 호출 완료 ({api_time:.2f}초) - {len(popular_videos)}개 영상")
-
-            # 3. 텍스트로 변환하여 Vector DB에 저장
-            for popular in popular_videos:
-                pop_video_text = f"""제목: {popular['video_title']}, 설명: {popular['video_description']},태그: {popular['video_hash_tag']}"""
-                await self.content_chunk_repository.save_context(
-                    source_type=SourceTypeEnum.IDEA_RECOMMENDATION,
-                    source_id=video.id,
-                    context=pop_video_text)
-
-            # 4. 영상과 의미적으로 가장 유사한 '인기 영상' 청크를 검색 (Vector DB)
-            search_start = time.time()
-            logger.info("🔍 유사 인기 영상 벡터 검색 중...")
-            query_text = f"제목: {video.title}, 설명: {video.description}, 카테고리: {video.video_category.name}"
-            video_embedding = await self.content_chunk_repository.generate_embedding(query_text)
-            meta_data = {"query_embedding": str(video_embedding)}
-
-            similar_chunks = await self.content_chunk_repository.search_similar_by_embedding(
-                SourceTypeEnum.IDEA_RECOMMENDATION, metadata=meta_data, limit=5
-            )
-            search_time = time.time() - search_start
-            logger.info(f"🔍 유사 인기 영상 벡터 검색 완료 ({search_time:.2f}초) - {len(similar_chunks)}개 청크")
+        logging.info("아이디어 내 채널 확인 : %s", origin_context)
+
+        # 2. 인기 동영상 목록 유튜브 호출 (YouTube API)
+        api_start = time.time()
+        logger.info("📱 YouTube 인기 동영상 API 호출 중...")
+        category_id = video.video_category.value
+        popular_videos = await asyncio.to_thread(self.youtube_video_service.get_category_popular, category_id)
+        api_time = time.time() - api_start
+        logger.info(f"📱 YouTube 인기 동영상 API 호출 완료 ({api_time:.2f}초) - {len(popular_videos)}개 영상")
+
+        # 3. 텍스트로 변환하여 Vector DB에 저장
+        for popular in popular_videos:
+            pop_video_text = f"""제목: {popular['video_title']}, 설명: {popular['video_description']},태그: {popular['video_hash_tag']}"""
+            await self.content_chunk_repository.save_context(
+                source_type=SourceTypeEnum.IDEA_RECOMMENDATION,
+                source_id=video.id,
+                context=pop_video_text)
+
+        # 4. 영상과 의미적으로 가장 유사한 '인기 영상' 청크를 검색 (Vector DB)
+        search_start = time.time()
+        logger.info("🔍 유사 인기 영상 벡터 검색 중...")
+        query_text = f"제목: {video.title}, 설명: {video.description}, 카테고리: {video.video_category.name}"
+        video_embedding = await self.content_chunk_repository.generate_embedding(query_text)
+        meta_data = {"query_embedding": str(video_embedding)}
+
+        similar_chunks = await self.content_chunk_repository.search_similar_by_embedding(
+            SourceTypeEnum.IDEA_RECOMMENDATION, metadata=meta_data, limit=5
+        )
+        search_time = time.time() - search_start
+        logger.info(f"🔍 유사 인기 영상 벡터 검색 완료 ({search_time:.2f}초) - {len(similar_chunks)}개 청크")
 
-            # 5. 검색된 청크(내용)를 텍스트로
-            popularity_context = "\n".join([chunk.get("content", "") for chunk in similar_chunks])
+        # 5. 검색된 청크(내용)를 텍스트로
+        popularity_context = "\n".join([chunk.get("content", "") for chunk in similar_chunks])
+        return {"origin": origin_context, "popularity": popularity_context}
+
+    @traced("rag_service.analyze_idea")
+    async def analyze_idea(
+        self, video: Video, channel: Channel, summary: str, inputs: Optional[Dict[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        아이디어 분석
+
+        Args:
+            inputs: collect_idea_inputs 결과 (섹션 결과 캐시 지문에 사용한 입력을 그대로 사용, 없으면 새로 수집)
+        """
+        try:
+            if inputs is None:
+                inputs = await self.collect_idea_inputs(video, channel, summary)
 
             # 프롬프트 생성 및 LLM 실행
             llm_start = time.time()
             logger.info("🤖 아이디어 생성 LLM 실행 중...")
-            query = "트렌드 분석 후, 이 유튜브 영상과 관련된 새 컨텐츠에 대한 아이디어를 3개 생성해주세요."
-            chain = PromptTemplateManager.get_idea_prompt | self.llm
-            result_str = await chain.ainvoke({
-                "query": query,
-                "origin": origin_context,
-                "popularity": popularity_context
+            prompt = PromptTemplateManager.get_idea_prompt({
+                "query": IDEA_QUERY,
+                "origin": inputs["origin"],
+                "popularity": inputs["popularity"]
             })
+            ideas = await self._astructured(prompt, IdeaList)
             llm_time = time.time() - llm_start
             logger.info(f"🤖 아이디어 생성 LLM 실행 완료 ({llm_time:.2f}초)")
-
-            # LLM의 응답 문자열을 JSON 파싱
-            clean_json_str = result_str.content.strip().replace("```json", "").replace("```", "")
-            return json.loads(clean_json_str)
+            return [idea.model_dump() for idea in ideas]
         except Exception as e:
             logger.error(f"아이디어 생성 중 오류 발생: {e!r}")
             raise e
 
-    
-    async def analyze_algorithm_optimization(self, video_id: str, skip_vector_save: bool = False) -> str:
+    @traced("rag_service.collect_algorithm_optimization_inputs")
+    async def collect_algorithm_optimization_inputs(self, video_id: str, skip_vector_save: bool = False) -> Dict[str, Any]:
+        """
+        알고리즘 최적화 분석 프롬프트 입력 수집 (영상/채널 정보와 통계, 유사 영상의 이전 분석 사례)
+
+        Returns:
+            {"data": 영상/채널 정보, "previous_cases": 이전 분석 사례 (없으면 빈 문자열)}
+        """
+        # 영상 상세 정보 조회 (YouTube API)
+        video_start = time.time()
+        logger.info("📹 YouTube 영상 상세 정보 API 호출 중...")
+        video_details = await asyncio.to_thread(self.video_detail_service.get_video_details, video_id)
+        video_time = time.time() - video_start
+        logger.info(f"📹 YouTube 영상 상세 정보 API 호출 완료 ({video_time:.2f}초)")
+
+        # 채널 정보 조회 (YouTube API)
+        channel_id = video_details.get('channelId')
+
+        channel_stats = {}
+        if channel_id:
+            channel_start = time.time()
+            logger.info("📺 YouTube 채널 통계 API 호출 중...")
+            channel_stats = await asyncio.to_thread(self.video_detail_service.get_channel_stats, channel_id)
+            channel_time = time.time() - channel_start
+            logger.info(f"📺 YouTube 채널 통계 API 호출 완료 ({channel_time:.2f}초)")
+
+        # 분석에 필요한 데이터 구조화
+        optimization_data = {
+            "video": {
+                "title": video_details.get('title', ''),
+                "description": video_details.get('description', ''),
+                "tags": video_details.get('tags', []),
+                "publishedAt": video_details.get('publishedAt', ''),
+                "duration": video_details.get('duration', ''),
+                "viewCount": video_details.get('viewCount', 0),
+                "likeCount": video_details.get('likeCount', 0),
+                "commentCount": video_details.get('commentCount', 0),
+                "thumbnails": video_details.get('thumbnails', {})
+            },
+            "channel": {
+                "name": video_details.get('channelTitle', ''),
+                "subscriberCount": channel_stats.get('subscriberCount', 0),
+                "totalViewCount": channel_stats.get('viewCount', 0),
+                "totalVideoCount": channel_stats.get('videoCount', 0)
+            }
+        }
+
+        # 유사한 이전 알고리즘 최적화 분석 사례 검색 (skip_vector_save가 False인 경우만)
+        previous_cases = ""
+        if not skip_vector_save:
+            query_text = f"제목: {video_details.get('title', '')}, 설명: {video_details.get('description', '')[:200]}"
+            similar_chunks = await self.content_chunk_repository.search_similar_optimization(
+                query_text=query_text,
+                limit=3
+            )
+            if similar_chunks:
+                previous_cases = "\n\n---\n\n".join([chunk.get("content", "") for chunk in similar_chunks])
+        return {"data": optimization_data, "previous_cases": previous_cases}
+
+    @traced("rag_service.analyze_algorithm_optimization")
+    async def analyze_algorithm_optimization(
+        self, video_id: str, skip_vector_save: bool = False, inputs: Optional[Dict[str, Any]] = None
+    ) -> str:
         """
         유튜브 알고리즘 최적화 분석
         
         Args:
             video_id: YouTube 영상 ID
+            inputs: collect_algorithm_optimization_inputs 결과 (섹션 결과 캐시 지문에 사용한 입력을 그대로 사용, 없으면 새로 수집)
             
         Returns:
             알고리즘 최적화 분석 결과
         """
         try:
-            # 영상 상세 정보 조회 (YouTube API)
-            video_start = time.time()
-            logger.info("📹 YouTube 영상 상세 정보 API 호출 중...")
-            video_details = self.video_detail_service.get_video_details(video_id)
-            video_time = time.time() - video_start
-            logger.info(f"📹 YouTube 영상 상세 정보 API 호출 완료 ({video_time:.2f}초)")
-            
-            # 채널 정보 조회 (YouTube API)
-            channel_id = video_details.get('channelId')
-            
-            channel_stats = {}
-            if channel_id:
-                channel_start = time.time()
-                logger.info("📺 YouTube 채널 통계 API 호출 중...")
-                channel_stats = self.video_detail_service.get_channel_stats(channel_id)
-                channel_time = time.time() - channel_start
-                logger.info(f"📺 YouTube 채널 통계 API 호출 완료 ({channel_time:.2f}초)")
-            
-            # 분석에 필요한 데이터 구조화
-            optimization_data = {
-                "video": {
-                    "title": video_details.get('title', ''),
-                    "description": video_details.get('description', ''),
-                    "tags": video_details.get('tags', []),
-                    "publishedAt": video_details.get('publishedAt', ''),
-                    "duration": video_details.get('duration', ''),
-                    "viewCount": video_details.get('viewCount', 0),
-                    "likeCount": video_details.get('likeCount', 0),
-                    "commentCount": video_details.get('commentCount', 0),
-                    "thumbnails": video_details.get('thumbnails', {})
-                },
-                "channel": {
-                    "name": video_details.get('channelTitle', ''),
-                    "subscriberCount": channel_stats.get('subscriberCount', 0),
-                    "totalViewCount": channel_stats.get('viewCount', 0),
-                    "totalVideoCount": channel_stats.get('videoCount', 0)
-                }
-            }
-            
+            if inputs is None:
+                inputs = await self.collect_algorithm_optimization_inputs(video_id, skip_vector_save)
+
             # JSON 형식으로 context 생성
-            context = json.dumps(optimization_data, ensure_ascii=False, indent=2)
-            
-            # 유사한 이전 알고리즘 최적화 분석 사례 검색 (skip_vector_save가 False인 경우만)
-            if not skip_vector_save:
-                query_text = f"제목: {video_details.get('title', '')}, 설명: {video_details.get('description', '')[:200]}"
-                similar_chunks = await self.content_chunk_repository.search_similar_optimization(
-                    query_text=query_text,
-                    limit=3
-                )
-                
-                # 이전 분석 사례가 있으면 context에 추가
-                if similar_chunks:
-                    previous_cases = "\n\n---\n\n".join([chunk.get("content", "") for chunk in similar_chunks])
-                    context += f"\n\n## 유사 영상의 이전 최적화 분석 사례:\n{previous_cases}"
-            
-            query = "이 유튜브 영상의 알고리즘 최적화 상태를 분석하고 구체적인 개선 방안을 제시해주세요."
+            context = json.dumps(inputs["data"], ensure_ascii=False, indent=2)
+
+            # 이전 분석 사례가 있으면 context에 추가
+            if inputs["previous_cases"]:
+                context += f"\n\n## 유사 영상의 이전 최적화 분석 사례:\n{inputs['previous_cases']}"
             
             # 프롬프트 템플릿 가져오기 및 LLM 실행
             llm_start = time.time()
             prompt_template = PromptTemplateManager.get_algorithm_optimization_prompt()
-            result = self.execute_llm_chain(context, query, prompt_template)
+            result = await self.aexecute_llm_chain(context, OPTIMIZATION_QUERY, prompt_template)
             llm_time = time.time() - llm_start
             logger.info(f"🤖 알고리즘 최적화 LLM 실행 완료 ({llm_time:.2f}초)")
             
@@ -254,6 +549,10 @@ class RagServiceImpl(RagService):
             
 
     def analyze_realtime_trends(self, limit: int = 5, geo: str = "KR") -> Dict:
+        return _run_sync(self.aanalyze_realtime_trends(limit, geo))
+
+    @traced("rag_service.analyze_realtime_trends")
+    async def aanalyze_realtime_trends(self, limit: int = 5, geo: str = "KR") -> Dict:
         """
         실시간 트렌드를 분석하여 YouTube 콘텐츠에 적합한 형태로 반환
         
@@ -267,7 +566,7 @@ class RagServiceImpl(RagService):
         # 1. Google Trends에서 실시간 트렌드 가져오기 (Google Trends API)
         trends_start = time.time()
         logger.info("📈 Google Trends 실시간 트렌드 API 호출 중...")
-        raw_trends = self.trend_service.get_realtime_trends(limit=limit*2, geo=geo)  # 여유있게 가져오기
+        raw_trends = await asyncio.to_thread(self.trend_service.get_realtime_trends, limit=limit*2, geo=geo)  # 여유있게 가져오기
         trends_time = time.time() - trends_start
         logger.info(f"📈 Google Trends 실시간 트렌드 API 호출 완료 ({trends_time:.2f}초) - {len(raw_trends) if raw_trends else 0}개 트렌드")
         
@@ -290,7 +589,7 @@ class RagServiceImpl(RagService):
         # 5. LLM 실행 및 결과 파싱
         llm_start = time.time()
         logger.info("🤖 실시간 트렌드 분석 LLM 실행 중...")
-        result_str = self.execute_llm_chain(
+        result_str = await self.aexecute_llm_chain(
             context=json.dumps(context, ensure_ascii=False),
             query=query,
             prompt_template_str=prompt_template
@@ -307,7 +606,11 @@ class RagServiceImpl(RagService):
     
     
 
-    def analyze_channel_trends(
+    def analyze_channel_trends(self, channel_concept: str, target_audience: str) -> Dict:
+        return _run_sync(self.aanalyze_channel_trends(channel_concept, target_audience))
+
+    @traced("rag_service.analyze_channel_trends")
+    async def aanalyze_channel_trends(
         self,
         channel_concept: str,
         target_audience: str
@@ -339,21 +642,14 @@ class RagServiceImpl(RagService):
         # 3. 채널 맞춤형 트렌드를 위한 특별 처리
         documents = [Document(page_content=json.dumps(context, ensure_ascii=False))]
         
-        # 필요한 모든 변수를 포함한 프롬프트 템플릿 생성
-        prompt = PromptTemplate(
-            input_variables=["input", "context", "channel_concept", "target_audience", "current_date"],
-            template=prompt_template
-        )
-        
-        chat_prompt = ChatPromptTemplate.from_messages([
-            HumanMessagePromptTemplate(prompt=prompt)
-        ])
-        
-        # 체인 실행
+        # 필요한 모든 변수를 포함한 프롬프트 템플릿으로 체인 실행
         llm_start = time.time()
         logger.info("🤖 채널 맞춤형 트렌드 분석 LLM 실행 중...")
-        combine_chain = create_stuff_documents_chain(self.llm, chat_prompt)
-        result_str = combine_chain.invoke({
+        combine_chain = self._chain(
+            prompt_template,
+            ("input", "context", "channel_concept", "target_audience", "current_date"),
+        )
+        result_str = await combine_chain.ainvoke({
             "input": query,
             "context": documents,
             "channel_concept": channel_concept,
@@ -373,38 +669,108 @@ class RagServiceImpl(RagService):
 
 
 
+    def _chain(
+        self,
+        prompt_template_str: str,
+        input_variables: Sequence[str] = ("input", "context"),
+        response_model: Optional[Type[BaseModel]] = None,
+    ) -> Runnable:
+        """
+        프롬프트 템플릿으로 만든 문서 결합 체인 (같은 템플릿이면 만들어 둔 체인 재사용)
+
+        response_model을 주면 OpenAI structured output(JSON schema)으로 응답 형식을 강제 (응답은 JSON 문자열)
+        """
+        key = (prompt_template_str, tuple(input_variables), response_model)
+        chain = self._chains.get(key)
+        if chain is None:
+            # 프롬프트 템플릿 생성
+            prompt_template = PromptTemplate(
+                input_variables=list(input_variables),
+                template=prompt_template_str
+            )
+
+            chat_prompt = ChatPromptTemplate.from_messages([
+                HumanMessagePromptTemplate(prompt=prompt_template)
+            ])
+
+            # 체인 조합
+            llm = self.llm.bind(response_format=response_model) if response_model else self.llm
+            chain = self._chains[key] = create_stuff_documents_chain(llm, chat_prompt)
+        return chain
+
     def execute_llm_chain(self, context: str, query: str, prompt_template_str: str) -> str:
+        return _run_sync(self.aexecute_llm_chain(context, query, prompt_template_str))
+
+    async def aexecute_llm_chain(self, context: str, query: str, prompt_template_str: str) -> str:
         """
-        LLM 체인을 실행하는 공통 메서드
+        LLM 체인을 실행하는 공통 메서드 (OpenAI 응답을 기다리는 동안 이벤트 루프를 막지 않음)
         :param context: LLM에 제공할 정보(youtube api를 통해 가져온 자막 등)
         :param query: 사용자 질문
         :return: LLM의 응답
         """
         documents = [Document(page_content=context)]
-        
-        # 프롬프트 템플릿 생성
-        prompt_template = PromptTemplate(
-            input_variables=["input", "context"],
-            template=prompt_template_str
-        )
+        return await self._chain(prompt_template_str).ainvoke({"input": query, "context": documents})
+    
+    async def astream_llm_chain(self, context: str, query: str, prompt_template_str: str) -> AsyncIterator[str]:
+        """
+        aexecute_llm_chain과 같은 체인을 스트리밍으로 실행해 응답을 생성되는 대로 조각 단위로 반환
 
-        chat_prompt = ChatPromptTemplate.from_messages([
-            HumanMessagePromptTemplate(prompt=prompt_template)
-        ])
+        스트리밍 호출은 LLM 응답 캐시(llm_cache)를 사용하지 않습니다. (요청 한도, 사용량 장부는 그대로 적용)
+        """
+        documents = [Document(page_content=context)]
+        async for chunk in self._chain(prompt_template_str).astream({"input": query, "context": documents}):
+            yield chunk
+
+    def execute_structured(
+        self, context: str, query: str, prompt_template_str: str, response_model: Type[BaseModel]
+    ) -> List[BaseModel]:
+        return _run_sync(self.aexecute_structured(context, query, prompt_template_str, response_model))
+
+    async def aexecute_structured(
+        self, context: str, query: str, prompt_template_str: str, response_model: Type[BaseModel]
+    ) -> List[BaseModel]:
+        """
+        응답 스키마(response_model)를 강제한 LLM 체인 실행
+
+        - 스키마는 OpenAI가 생성 단계에서 보장하므로 JSON 파싱 실패로 프롬프트 전체를 다시 요청하지 않음
+        - 응답이 길이 제한으로 잘리면 잘리기 전까지 완성된 항목만 사용
+
+        :param response_model: {"items": [...]} 형태의 응답 스키마 (core.llm.response_models)
+        :return: items 항목 목록
+        """
+        documents = [Document(page_content=context)]
+        chain = self._chain(prompt_template_str, response_model=response_model)
+        try:
+            result = await chain.ainvoke({"input": query, "context": documents})
+        except openai.LengthFinishReasonError as e:
+            result = self._truncated_content(e)
+        return parse_items(result, item_model(response_model))
+
+    async def _astructured(self, prompt: str, response_model: Type[BaseModel]) -> List[BaseModel]:
+        """완성된 프롬프트 문자열을 응답 스키마를 강제해 실행 (aexecute_structured 참고)"""
+        try:
+            result = (await self.llm.bind(response_format=response_model).ainvoke(prompt)).content
+        except openai.LengthFinishReasonError as e:
+            result = self._truncated_content(e)
+        return parse_items(result, item_model(response_model))
+
+    @staticmethod
+    def _truncated_content(error: "openai.LengthFinishReasonError") -> str:
+        """길이 제한으로 잘린 응답의 본문 (완성된 항목은 PartialArrayParser로 살림)"""
+        logger.warning(f"LLM 응답이 길이 제한으로 잘렸습니다. 완성된 항목만 사용합니다: {error}")
+        choices = getattr(error.completion, "choices", None) or []
+        return (choices[0].message.content or "") if choices else ""
 
-        # 체인 조합 및 실행
-        combine_chain = create_stuff_documents_chain(self.llm, chat_prompt)
-        result = combine_chain.invoke({"input": query, "context": documents})
-        return result
-    
     def execute_llm_direct(self, prompt: str) -> str:
+        return _run_sync(self.aexecute_llm_direct(prompt))
+
+    async def aexecute_llm_direct(self, prompt: str) -> str:
         """
         이미 완성된 프롬프트 문자열을 바로 LLM에 넣어 실행하는 함수
 
         :param prompt: 완성된 프롬프트 문자열
         :return: LLM의 응답
         """
-        # self.llm이 직접 프롬프트 문자열을 받아 실행하는 함수라고 가정
-        result = self.llm.invoke(prompt)
+        result = await self.llm.ainvoke(prompt)
         return result.content
         
\ No newline at end of file
@@ -3,8 +3,18 @@ from datetime import date
 import httpx
 from fastapi import FastAPI, HTTPException
 
+from core.utils.metrics import record_api_error
+from core.utils.tracing import traced
+from core.utils.quota_state import (
+    YOUTUBE_ANALYTICS,
+    quota_state,
+    retry_after_seconds,
+    seconds_until_pacific_midnight,
+)
+
 app = FastAPI()
 
+@traced("youtube_analytics.get_youtube_analytics_data")
 async def get_youtube_analytics_data(access_token: str, video_id: str, metrics: str, dimensions=None) -> dict:
     import logging
     logger = logging.getLogger(__name__)
@@ -21,6 +31,16 @@ async def get_youtube_analytics_data(access_token: str, video_id: str, metrics:
     if dimensions:
         url += f"&dimensions={dimensions}"
 
+    # 요청 한도 대기 중이면 호출하지 않고 바로 실패 (consumer는 이 리소스로 수신을 멈추지 않으므로 이 단계만 재시도/DLQ로 보냄)
+    remaining = quota_state.remaining([YOUTUBE_ANALYTICS])
+    if remaining > 0:
+        logger.warning(f"YouTube Analytics API 요청 한도 대기 중 ({remaining:.0f}초 남음), 호출하지 않고 실패 처리")
+        raise HTTPException(
+            status_code=429,
+            detail="YouTube Analytics API 요청 한도 대기 중입니다.",
+            headers={"Retry-After": str(int(remaining))},
+        )
+
     headers = {
         "Authorization": f"Bearer {access_token}",
         "Accept": "application/json",
@@ -30,8 +50,12 @@ async def get_youtube_analytics_data(access_token: str, video_id: str, metrics:
     async with httpx.AsyncClient(timeout=timeout) as client:
         response = await client.get(url, headers=headers)
 
+    if response.status_code != 200:
+        record_api_error("youtube_analytics", response.status_code)
+
     if response.status_code == 429:
         logger.error("YouTube Analytics API 요청 한도 초과 (429 Too Many Requests)")
+        quota_state.trip(YOUTUBE_ANALYTICS, retry_after_seconds(response.headers), "429 Too Many Requests")
         raise HTTPException(
             status_code=429,
             detail="YouTube Analytics API 요청 한도를 초과했습니다. 잠시 후 다시 시도해주세요."
@@ -49,9 +73,13 @@ async def get_youtube_analytics_data(access_token: str, video_id: str, metrics:
             error_reason = error_data.get("error", {}).get("errors", [{}])[0].get("reason", "unknown")
             if error_reason == "quotaExceeded":
                 logger.error("YouTube Analytics API 일일 할당량 초과")
+                # 일일 할당량은 태평양 시간 자정에 초기화되므로 그때까지 요청을 멈춤
+                cooldown_seconds = seconds_until_pacific_midnight()
+                quota_state.trip(YOUTUBE_ANALYTICS, cooldown_seconds, "quotaExceeded")
                 raise HTTPException(
                     status_code=403,
-                    detail="YouTube Analytics API 일일 할당량을 초과했습니다."
+                    detail="YouTube Analytics API 일일 할당량을 초과했습니다.",
+                    headers={"Retry-After": str(int(cooldown_seconds))},
                 )
         raise HTTPException(
             status_code=403,
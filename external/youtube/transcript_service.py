@@ -2,6 +2,8 @@ import os
 from dotenv import load_dotenv
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api.proxies import WebshareProxyConfig
+from core.utils.artifact_store import TRANSCRIPT, artifact_store
+from core.utils.metrics import TRANSCRIPT_FETCH, observe_stage
 
 # .env 파일 로드
 load_dotenv()
@@ -24,15 +26,29 @@ class TranscriptService:
             )
         )
 
-    def fetch_transcript(self, video_id: str, languages=['ko', 'en']) -> list:
+    def fetch_transcript(self, video_id: str, languages=['ko', 'en']) -> list[dict]:
         """
         공통: YouTubeTranscriptApi를 사용해 자막 리스트 반환
-        각 요소: FetchedTranscriptSnippet 객체 (text, start, duration 속성 포함)
+        각 요소: {'text': ..., 'start': ..., 'duration': ...}
+
+        같은 영상의 자막은 artifact_store에 보관해 리포트 처리 중 프록시를 거쳐 한 번만 조회
         """
+        return artifact_store.get_or_fetch(
+            video_id,
+            f"{TRANSCRIPT}:{','.join(languages)}",
+            lambda: self._fetch_transcript(video_id, languages),
+        )
+
+    def _fetch_transcript(self, video_id: str, languages: list) -> list[dict]:
         try:
-            transcript_list = self.ytt_api.list(video_id) # -> 가능한 자막의 언어 리스트
-            transcript = transcript_list.find_transcript(languages) # -> 기본으로 ko, en 
-            return transcript.fetch() #-> 가져오기
+            with observe_stage(TRANSCRIPT_FETCH):
+                transcript_list = self.ytt_api.list(video_id) # -> 가능한 자막의 언어 리스트
+                transcript = transcript_list.find_transcript(languages) # -> 기본으로 ko, en 
+                fetched = transcript.fetch() #-> 가져오기
+            return [
+                {"text": entry.text, "start": entry.start, "duration": entry.duration}
+                for entry in fetched
+            ]
         except Exception as e:
             print(f"자막 불러오기 실패: {e}")
             return []
@@ -55,11 +71,11 @@ class TranscriptService:
         
         formatted_lines = []
         for entry in transcription:
-            start = entry.start
-            end = start + entry.duration
+            start = entry["start"]
+            end = start + entry["duration"]
             start_fmt = self.format_time(start)
             end_fmt = self.format_time(end)
-            line = f"{entry.text} ({start_fmt} - {end_fmt})"
+            line = f"{entry['text']} ({start_fmt} - {end_fmt})"
             formatted_lines.append(line)
 
         return "\n".join(formatted_lines)
@@ -76,9 +92,9 @@ class TranscriptService:
         structured = []
         for entry in transcription:
             structured.append({
-                "text": entry.text,
-                "start_time": entry.start,
-                "end_time": entry.start + entry.duration
+                "text": entry["text"],
+                "start_time": entry["start"],
+                "end_time": entry["start"] + entry["duration"]
             })
 
         return structured
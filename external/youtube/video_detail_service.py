@@ -1,6 +1,9 @@
 from dotenv import load_dotenv
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from core.utils.artifact_store import VIDEO_DETAILS, artifact_store
+from core.utils.metrics import record_api_error
+from core.utils.tracing import traced
 import os
 from typing import Dict, Optional, List
 import logging
@@ -17,6 +20,7 @@ class VideoDetailService:
             logger.warning("YOUTUBE_API_KEY not found in environment variables")
         self.youtube = build('youtube', 'v3', developerKey=self.api_key)
     
+    @traced("youtube_data.get_video_details")
     def get_video_details(self, video_id: str) -> Dict:
         """
         영상 상세 정보 조회
@@ -28,10 +32,15 @@ class VideoDetailService:
             영상 정보 딕셔너리 (제목, 설명, 태그, 통계 등)
         """
         try:
-            response = self.youtube.videos().list(
-                part='snippet,statistics,contentDetails',
-                id=video_id
-            ).execute()
+            # 같은 영상의 상세 정보는 artifact_store에 보관해 리포트 처리 중 한 번만 조회
+            response = artifact_store.get_or_fetch(
+                video_id,
+                VIDEO_DETAILS,
+                lambda: self.youtube.videos().list(
+                    part='snippet,statistics,contentDetails',
+                    id=video_id
+                ).execute(),
+            )
             
             if not response.get('items'):
                 logger.error(f"Video {video_id} not found")
@@ -63,6 +72,7 @@ class VideoDetailService:
             }
             
         except HttpError as e:
+            record_api_error("youtube_data", e)
             if e.resp.status == 403:
                 logger.error("YouTube API quota exceeded")
             elif e.resp.status == 404:
@@ -74,6 +84,7 @@ class VideoDetailService:
             logger.error(f"Unexpected error in get_video_details: {e}")
             raise
     
+    @traced("youtube_data.get_channel_stats")
     def get_channel_stats(self, channel_id: str) -> Dict:
         """
         채널 통계 정보 조회
@@ -103,6 +114,7 @@ class VideoDetailService:
             }
             
         except HttpError as e:
+            record_api_error("youtube_data", e)
             if e.resp.status == 403:
                 logger.error("YouTube API quota exceeded")
             elif e.resp.status == 404:
@@ -114,6 +126,7 @@ class VideoDetailService:
             logger.error(f"Unexpected error in get_channel_stats: {e}")
             raise
     
+    @traced("youtube_data.get_category_benchmarks")
     def get_category_benchmarks(self, category_id: str, region_code: str = 'KR') -> Dict:
         """
         카테고리별 평균 성과 지표 계산
@@ -181,6 +194,7 @@ class VideoDetailService:
             }
             
         except HttpError as e:
+            record_api_error("youtube_data", e)
             if e.resp.status == 403:
                 logger.error("YouTube API quota exceeded")
             else:
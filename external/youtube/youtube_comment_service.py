@@ -3,6 +3,8 @@ import os
 
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from core.utils.metrics import record_api_error
+from core.utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +16,7 @@ class YoutubeCommentService:
         self.api_key = os.getenv('YOUTUBE_API_KEY')
         self.youtube = build('youtube', 'v3', developerKey=self.api_key)
     
+    @traced("youtube_data.get_comments")
     async def get_comments(self, video_id: str, report_id: int, max_comments: int = 1000) -> list[dict]:
         #특정 video의 모든 댓글을 가져오는 함수 (최대 개수 제한 추가)
         comments = []
@@ -27,6 +30,7 @@ class YoutubeCommentService:
                 maxResults=100
             ).execute()
         except HttpError as e:
+            record_api_error("youtube_data", e)
             logger.error(f"YouTube API 에러: {e}")
             if e.resp.status == 403 and 'commentsDisabled' in str(e):
                 logger.warning(f"비디오 {video_id}의 댓글이 비활성화되어 있습니다.")
@@ -74,6 +78,7 @@ class YoutubeCommentService:
                         maxResults=100
                     ).execute()
                 except HttpError as e:
+                    record_api_error("youtube_data", e)
                     if e.resp.status == 400:
                         logger.warning(f"pageToken 에러 발생, 페이지네이션 중단: {e}")
                         break  # pageToken 에러시 수집한 댓글만 반환
@@ -1,43 +1,12 @@
-import asyncio
-import logging
-from core.kafka.kafka_broker import kafka_broker
-from domain.report.service.report_consumer_impl import ReportConsumerImpl as ReportConsumer
+from core.config.kafka_config import kafka_config
+from kafka_runner import run
 
-
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-
-async def main():
-    """Kafka Consumer V1 시작"""
-    logger.info("= Kafka Consumer V1 시작...")
-  
-    report_consumer = ReportConsumer(kafka_broker)
-    report_consumer.register_handler("overview-topic", report_consumer.handle_overview)
-    report_consumer.register_handler("analysis-topic", report_consumer.handle_analysis)
-    report_consumer.register_handler("idea-topic", report_consumer.handle_idea)
-    
-    # Consumer 시작
-    topics = ["overview-topic", "analysis-topic", "idea-topic"]
-    await report_consumer.start_consuming(topics)        
-    logger.info(f"= Kafka Consumer V1 시작: {topics}")
-
-    # Kafka Broker 시작
-    await kafka_broker.start()
-    logger.info("= Kafka Broker V1 시작 완료")
-
-    try:
-        
-        while True:
-            await asyncio.sleep(1)
-    except KeyboardInterrupt:
-        logger.info("= Kafka Consumer V1 중단 요청")
-    finally:
-        
-        await report_consumer.stop_consuming()
-        await kafka_broker.close()
-        logger.info("= Kafka Consumer V1 중단 완료")
+'''
+Kafka Consumer V1 (overview, analysis, idea)
+kafka_runner.py를 사용하는 기존 실행 스크립트입니다.
+여러 프로세스로 실행하려면: python kafka_runner.py --topics overview-topic,analysis-topic,idea-topic --workers N
+'''
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
\ No newline at end of file
+    run([kafka_config.overview_topic, kafka_config.analysis_topic, kafka_config.idea_topic])
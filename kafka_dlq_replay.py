@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from faststream import Context
+from faststream.exceptions import NackMessage
+from faststream.kafka import KafkaBroker
+from faststream.kafka.message import KafkaMessage
+
+from core.config.kafka_config import kafka_config
+from core.kafka import retry_policy
+from core.kafka.message import Priority
+
+'''
+DLQ 메시지 재처리 명령어
+    python kafka_dlq_replay.py --topic overview-topic-v2 --limit 100
+
+- <topic>.dlq 에 쌓인 메시지를 원본 토픽으로 다시 발행합니다. (재시도 횟수는 0부터 다시 시작)
+- 재발행한 메시지는 bulk 우선순위로 처리되어 사용자 요청을 앞지르지 않습니다.
+- 별도 consumer group(<group>-dlq-replay)으로 읽으므로 한 번 재처리한 메시지는 다시 발행하지 않습니다.
+- --idle-timeout 동안 새 메시지가 없거나 --limit 개를 발행하면 종료합니다.
+'''
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+REPLAYED_HEADER = "x-replayed-from-dlq"
+
+
+async def replay(topic: str, limit: Optional[int] = None, idle_timeout: float = 10.0) -> int:
+    """
+    DLQ 메시지를 원본 토픽으로 재발행
+
+    Args:
+        topic: 원본 토픽 (예: overview-topic-v2)
+        limit: 최대 재발행 개수 (None이면 전부)
+        idle_timeout: 새 메시지가 없을 때 종료까지 대기할 시간(초)
+
+    Returns:
+        재발행한 메시지 수
+    """
+    broker = KafkaBroker(kafka_config.bootstrap_servers)
+    dlq_topic = retry_policy.dead_letter_topic(topic)
+    state = {"replayed": 0, "last_received": time.time()}
+    done = asyncio.Event()
+
+    @broker.subscriber(
+        dlq_topic,
+        group_id=f"{kafka_config.consumer_group_id}-dlq-replay",
+        auto_offset_reset="earliest",
+        auto_commit=False,
+    )
+    async def replay_processor(
+        message: Dict[str, Any],
+        kafka_message: KafkaMessage = Context("message"),
+    ):
+        state["last_received"] = time.time()
+        if limit is not None and state["replayed"] >= limit:
+            # 커밋하지 않고 남겨 두어 다음 실행에서 처리
+            done.set()
+            raise NackMessage()
+
+        headers = kafka_message.headers or {}
+        target_topic = headers.get(retry_policy.ORIGINAL_TOPIC_HEADER) or topic
+        # 장애 이후 일괄 재처리는 새로 들어오는 사용자 요청보다 뒤로 미룸
+        message = {**message, "priority": Priority.bulk.value}
+        await broker.publish(
+            message,
+            topic=target_topic,
+            key=kafka_message.raw_message.key,
+            headers={REPLAYED_HEADER: "1"},
+        )
+        state["replayed"] += 1
+        logger.info(
+            f"🔁 DLQ 메시지 재발행: {dlq_topic} -> {target_topic} "
+            f"(task_id={message.get('task_id')}, 마지막 오류: {headers.get(retry_policy.ERROR_HEADER)})"
+        )
+
+    await broker.start()
+    logger.info(f"🚀 DLQ 재처리 시작: {dlq_topic}")
+    try:
+        while not done.is_set() and time.time() - state["last_received"] < idle_timeout:
+            await asyncio.sleep(0.5)
+    finally:
+        await broker.close()
+
+    logger.info(f"✅ DLQ 재처리 완료: {state['replayed']}개 메시지 재발행")
+    return state["replayed"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DLQ 메시지 재처리")
+    parser.add_argument("--topic", required=True, help="원본 토픽 (예: overview-topic-v2)")
+    parser.add_argument("--limit", type=int, default=None, help="최대 재발행 개수")
+    parser.add_argument("--idle-timeout", type=float, default=10.0, help="새 메시지가 없을 때 종료 대기 시간(초)")
+    args = parser.parse_args()
+
+    asyncio.run(replay(args.topic, limit=args.limit, idle_timeout=args.idle_timeout))
+
+
+if __name__ == '__main__':
+    main()
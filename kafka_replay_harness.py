@@ -0,0 +1,342 @@
+import argparse
+import asyncio
+import json
+import logging
+import random
+import resource
+import signal
+import statistics
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+from faststream import Context
+from faststream.kafka import KafkaBroker, TestKafkaBroker
+from faststream.kafka.message import KafkaMessage
+
+from core.config.kafka_config import kafka_config
+from core.utils.pipeline import InMemoryStepResultStore
+
+'''
+Kafka 트래픽 녹화 / 오프라인 재생 도구
+    # 운영 토픽의 메시지를 JSONL로 녹화 (별도 consumer group이라 운영 consumer에 영향 없음)
+    python kafka_replay_harness.py record --output traffic.jsonl --limit 500
+
+    # 녹화한 메시지를 메모리 브로커(TestKafkaBroker)로 ReportConsumerImplV2 핸들러에 재생
+    python kafka_replay_harness.py replay --input traffic.jsonl --rate 20 --latency-scale 0.1
+
+- 재생 시 repository, 외부 서비스(YouTube, OpenAI, DB)는 지정한 지연 시간만 대기하는 가짜 객체로 대체합니다.
+  (consumer 계층의 변경 - 워커 풀, 스케줄링, 커밋 등 - 을 운영 Kafka 없이 비교하기 위한 용도)
+- --latencies 로 서비스 메서드별 지연 시간(초)을 JSON 파일로 덮어쓸 수 있습니다.
+- 처리량, 핸들러 지연 시간 p50/p95/p99, 최대 메모리 사용량을 출력합니다.
+'''
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 가짜 서비스 메서드별 기본 지연 시간 (초, 운영 로그의 평균 처리 시간 기준)
+DEFAULT_STUB_LATENCIES: Dict[str, float] = {
+    "report_service.fetch_transcript": 1.0,
+    "report_service.create_summary": 5.0,
+    "report_service.analyze_viewer_retention": 5.0,
+    "report_service.analyze_optimization": 6.0,
+    "report_service.analyze_trends_and_save": 4.0,
+    "comment_service.fetch_comments": 1.5,
+    "comment_service.classify_comments": 5.0,
+    "comment_service.summarize_classified_comments": 1.5,
+    "video_service.analyze_metrics": 1.5,
+    "idea_service.create_idea": 7.0,
+}
+# 목록에 없는 메서드(repository 조회/저장 등)의 지연 시간 (초)
+DEFAULT_CALL_LATENCY = 0.005
+
+
+class StubComponent:
+    """
+    서비스/repository 대신 사용하는 가짜 객체
+
+    어떤 메서드를 호출해도 지정한 지연 시간(±50% 무작위)만큼 대기한 뒤 returns에 등록된 값(없으면 None)을 반환합니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        latencies: Dict[str, float],
+        latency_scale: float,
+        rng: random.Random,
+        returns: Optional[Dict[str, Callable[..., Any]]] = None,
+    ):
+        self._name = name
+        self._latencies = latencies
+        self._latency_scale = latency_scale
+        self._rng = rng
+        self._returns = returns or {}
+
+    def __getattr__(self, method: str):
+        if method.startswith("_"):
+            raise AttributeError(method)
+
+        async def call(*args, **kwargs):
+            latency = self._latencies.get(f"{self._name}.{method}", DEFAULT_CALL_LATENCY)
+            await asyncio.sleep(latency * self._latency_scale * self._rng.uniform(0.5, 1.5))
+            factory = self._returns.get(method)
+            return factory(*args, **kwargs) if factory else None
+
+        return call
+
+
+def build_stub_consumer(broker: KafkaBroker, latencies: Dict[str, float], latency_scale: float, seed: int):
+    """외부 의존성을 가짜 객체로 바꾼 ReportConsumerImplV2 생성"""
+    from domain.report.service.report_consumer import ReportConsumer
+    from domain.report.service.report_consumer_impl_v2 import ReportConsumerImplV2
+    from domain.task.model.task import Status
+
+    # 실제 서비스 생성(API 키, DB 연결 설정 필요)을 건너뛰고 consumer 공통 설정만 초기화
+    consumer = ReportConsumerImplV2.__new__(ReportConsumerImplV2)
+    ReportConsumer.__init__(consumer, broker)
+
+    rng = random.Random(seed)
+
+    def stub(name: str, **returns: Callable[..., Any]) -> StubComponent:
+        return StubComponent(name, latencies, latency_scale, rng, returns)
+
+    consumer.report_repository = stub("report_repository", find_by_id=lambda id: SimpleNamespace(id=id, video_id=id))
+    consumer.video_repository = stub(
+        "video_repository",
+        find_by_id=lambda id: SimpleNamespace(id=id, channel_id=id, video_id=f"replay-{id}", title=f"replay-{id}"),
+    )
+    consumer.channel_repository = stub("channel_repository", find_by_id=lambda id: SimpleNamespace(id=id))
+    consumer.task_repository = stub(
+        "task_repository",
+        find_by_id=lambda id: SimpleNamespace(
+            id=id,
+            overview_status=Status.PENDING,
+            analysis_status=Status.PENDING,
+            idea_status=Status.PENDING,
+        ),
+    )
+    consumer.processed_message_repository = stub("processed_message_repository", claim=lambda *args, **kwargs: True)
+    # 파이프라인 단계 결과는 메모리에 저장 (같은 report의 다른 토픽 메시지가 summary 등을 재사용)
+    consumer.report_step_result_repository = InMemoryStepResultStore()
+    consumer.report_usage_repository = stub("report_usage_repository")
+    for name in (
+        "rag_service",
+        "content_chunk_repository",
+        "comment_service",
+        "report_service",
+        "trend_keyword_repository",
+        "idea_service",
+        "youtube_comment_service",
+        "video_service",
+    ):
+        setattr(consumer, name, stub(name))
+    return consumer
+
+
+def _percentile(values: List[float], percent: int) -> float:
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+async def record(topics: List[str], output: str, limit: Optional[int] = None, idle_timeout: Optional[float] = None) -> int:
+    """
+    토픽 메시지를 JSONL 파일로 녹화
+
+    Args:
+        topics: 녹화할 토픽 목록
+        output: 저장할 JSONL 파일 경로 (한 줄에 {"topic", "timestamp", "key", "message"})
+        limit: 최대 녹화 개수 (None이면 중단할 때까지)
+        idle_timeout: 새 메시지가 없을 때 종료까지 대기할 시간(초, None이면 무제한)
+
+    Returns:
+        녹화한 메시지 수
+    """
+    broker = KafkaBroker(kafka_config.bootstrap_servers)
+    state = {"recorded": 0, "last_received": time.time()}
+    done = asyncio.Event()
+
+    with open(output, "a", encoding="utf-8") as file:
+
+        @broker.subscriber(
+            *topics,
+            group_id=f"{kafka_config.consumer_group_id}-recorder",
+            auto_offset_reset="latest",
+        )
+        async def record_processor(
+            message: Dict[str, Any],
+            kafka_message: KafkaMessage = Context("message"),
+        ):
+            if done.is_set():
+                return
+            raw = kafka_message.raw_message
+            file.write(json.dumps({
+                "topic": raw.topic,
+                "timestamp": raw.timestamp,
+                "key": raw.key.decode() if isinstance(raw.key, bytes) else raw.key,
+                "message": message,
+            }, ensure_ascii=False) + "\n")
+            state["recorded"] += 1
+            state["last_received"] = time.time()
+            if limit is not None and state["recorded"] >= limit:
+                done.set()
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, done.set)
+
+        await broker.start()
+        logger.info(f"🎥 녹화 시작: {topics} -> {output}")
+        try:
+            while not done.is_set():
+                if idle_timeout is not None and time.time() - state["last_received"] >= idle_timeout:
+                    break
+                await asyncio.sleep(0.5)
+        finally:
+            await broker.close()
+
+    logger.info(f"✅ 녹화 완료: {state['recorded']}개 메시지")
+    return state["recorded"]
+
+
+async def replay(
+    input_path: str,
+    rate: Optional[float] = None,
+    speed: float = 1.0,
+    latencies: Optional[Dict[str, float]] = None,
+    latency_scale: float = 1.0,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    녹화한 메시지를 메모리 브로커로 재생하고 처리 성능 측정
+
+    Args:
+        input_path: 녹화한 JSONL 파일 경로
+        rate: 초당 발행 메시지 수 (None이면 녹화된 간격 / speed, 0이면 최대한 빠르게)
+        speed: 녹화된 간격으로 재생할 때의 배속
+        latencies: 가짜 서비스 메서드별 지연 시간(초) 덮어쓰기
+        latency_scale: 모든 가짜 지연 시간에 곱할 배수
+        seed: 지연 시간 무작위 값 시드
+
+    Returns:
+        측정 결과 (처리량, 지연 시간 백분위, 최대 메모리)
+    """
+    with open(input_path, encoding="utf-8") as file:
+        records = [json.loads(line) for line in file if line.strip()]
+    if not records:
+        raise ValueError(f"재생할 메시지가 없습니다: {input_path}")
+
+    broker = KafkaBroker(kafka_config.bootstrap_servers)
+    consumer = build_stub_consumer(broker, {**DEFAULT_STUB_LATENCIES, **(latencies or {})}, latency_scale, seed)
+
+    handler_latencies: List[float] = []
+    failures = {"count": 0}
+
+    def timed(handler: Callable) -> Callable:
+        async def wrapper(message: Dict[str, Any]):
+            start = time.perf_counter()
+            try:
+                await handler(message)
+            except Exception:
+                failures["count"] += 1
+                raise
+            finally:
+                handler_latencies.append(time.perf_counter() - start)
+        return wrapper
+
+    # 녹화된 토픽 이름 그대로 구독하고, 메시지의 step에 맞는 V2 핸들러로 처리
+    topics = sorted({record["topic"] for record in records})
+    for topic in topics:
+        step = next(record["message"].get("step") for record in records if record["topic"] == topic)
+        consumer.register_handler(topic, timed(getattr(consumer, f"handle_{step}_v2")))
+    await consumer.start_consuming(topics)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    async with TestKafkaBroker(broker) as test_broker:
+        previous_timestamp = records[0].get("timestamp")
+        for record in records:
+            if rate:
+                await asyncio.sleep(1 / rate)
+            elif rate is None and record.get("timestamp") and previous_timestamp:
+                await asyncio.sleep(max(0.0, (record["timestamp"] - previous_timestamp) / 1000 / speed))
+                previous_timestamp = record["timestamp"]
+            key = record.get("key")
+            await test_broker.publish(
+                record["message"],
+                topic=record["topic"],
+                key=key.encode() if isinstance(key, str) else key,
+            )
+        await consumer.stop_consuming()
+    elapsed = time.perf_counter() - start
+    _, peak_heap = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        "messages": len(records),
+        "failed": failures["count"],
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_second": round(len(handler_latencies) / elapsed, 3) if elapsed else 0.0,
+        "latency_p50_seconds": round(_percentile(handler_latencies, 50), 3),
+        "latency_p95_seconds": round(_percentile(handler_latencies, 95), 3),
+        "latency_p99_seconds": round(_percentile(handler_latencies, 99), 3),
+        "peak_heap_mb": round(peak_heap / 1024 / 1024, 2),
+        # Linux 기준 KB 단위
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 2),
+    }
+    logger.info(f"📊 재생 결과: {json.dumps(result, ensure_ascii=False)}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kafka 트래픽 녹화 / 오프라인 재생")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="토픽 메시지를 JSONL로 녹화")
+    record_parser.add_argument(
+        "--topics",
+        default=",".join([kafka_config.overview_topic_v2, kafka_config.analysis_topic_v2, kafka_config.idea_topic_v2]),
+        help="녹화할 토픽 목록 (쉼표로 구분)",
+    )
+    record_parser.add_argument("--output", required=True, help="저장할 JSONL 파일 경로 (이어서 기록)")
+    record_parser.add_argument("--limit", type=int, default=None, help="최대 녹화 개수")
+    record_parser.add_argument("--idle-timeout", type=float, default=None, help="새 메시지가 없을 때 종료 대기 시간(초)")
+
+    replay_parser = subparsers.add_parser("replay", help="녹화한 메시지를 메모리 브로커로 재생")
+    replay_parser.add_argument("--input", required=True, help="녹화한 JSONL 파일 경로")
+    replay_parser.add_argument("--rate", type=float, default=None, help="초당 발행 메시지 수 (0: 최대한 빠르게, 생략: 녹화된 간격)")
+    replay_parser.add_argument("--speed", type=float, default=1.0, help="녹화된 간격으로 재생할 때의 배속")
+    replay_parser.add_argument("--latencies", default=None, help="서비스 메서드별 지연 시간(초) JSON 파일")
+    replay_parser.add_argument("--latency-scale", type=float, default=1.0, help="모든 가짜 지연 시간에 곱할 배수")
+    replay_parser.add_argument("--seed", type=int, default=0, help="지연 시간 무작위 값 시드")
+    replay_parser.add_argument("--report", default=None, help="측정 결과를 저장할 JSON 파일 경로")
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        topics = [topic.strip() for topic in args.topics.split(",") if topic.strip()]
+        asyncio.run(record(topics, args.output, limit=args.limit, idle_timeout=args.idle_timeout))
+        return
+
+    latencies = None
+    if args.latencies:
+        with open(args.latencies, encoding="utf-8") as file:
+            latencies = json.load(file)
+    result = asyncio.run(replay(
+        args.input,
+        rate=args.rate,
+        speed=args.speed,
+        latencies=latencies,
+        latency_scale=args.latency_scale,
+        seed=args.seed,
+    ))
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as file:
+            json.dump(result, file, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
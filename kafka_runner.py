@@ -0,0 +1,146 @@
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import signal
+from typing import Dict, List, Tuple
+
+from core.config.kafka_config import kafka_config
+
+'''
+통합 Kafka Consumer 실행 명령어
+    python kafka_runner.py --topics overview-topic-v2,analysis-topic-v2,idea-topic-v2 --workers 4
+
+- 지정한 토픽들을 구독하는 프로세스를 --workers 개 만큼 실행합니다.
+- 모든 프로세스는 같은 consumer group을 사용하므로 파티션이 프로세스들에 나뉘어 할당됩니다.
+- 각 프로세스는 자신만의 이벤트 루프, 브로커, 서비스 인스턴스를 가집니다.
+'''
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# 토픽별 (Consumer 버전, 핸들러 메서드 이름)
+TOPIC_HANDLERS: Dict[str, Tuple[str, str]] = {
+    kafka_config.overview_topic: ("v1", "handle_overview"),
+    kafka_config.analysis_topic: ("v1", "handle_analysis"),
+    kafka_config.idea_topic: ("v1", "handle_idea"),
+    kafka_config.overview_topic_v2: ("v2", "handle_overview_v2"),
+    kafka_config.analysis_topic_v2: ("v2", "handle_analysis_v2"),
+    kafka_config.idea_topic_v2: ("v2", "handle_idea_v2"),
+}
+
+
+def _build_consumers(broker, topics: List[str]) -> list:
+    """토픽 목록에 필요한 Consumer 객체들을 만들고 핸들러를 등록"""
+    # 프로세스마다 서비스 싱글톤을 새로 만들도록 여기서 import
+    from domain.report.service.report_consumer_impl import ReportConsumerImpl
+    from domain.report.service.report_consumer_impl_v2 import ReportConsumerImplV2
+
+    consumer_classes = {"v1": ReportConsumerImpl, "v2": ReportConsumerImplV2}
+    consumers = {}
+    for topic in topics:
+        version, handler_name = TOPIC_HANDLERS[topic]
+        if version not in consumers:
+            consumers[version] = (consumer_classes[version](broker), [])
+        consumer, consumer_topics = consumers[version]
+        consumer.register_handler(topic, getattr(consumer, handler_name))
+        consumer_topics.append(topic)
+    return list(consumers.values())
+
+
+async def consume(topics: List[str], worker_index: int = 0):
+    """현재 프로세스에서 토픽 소비 (SIGINT/SIGTERM 수신 시 정상 종료)"""
+    from core.kafka.kafka_broker import kafka_broker
+    from core.utils.metrics import start_metrics_server
+
+    if kafka_config.consumer_metrics_port:
+        start_metrics_server(kafka_config.consumer_metrics_port + worker_index)
+
+    consumers = _build_consumers(kafka_broker, topics)
+    for consumer, consumer_topics in consumers:
+        await consumer.start_consuming(consumer_topics)
+
+    await kafka_broker.start()
+    logger.info(f"✅ [worker {worker_index}] Kafka Consumer 시작 완료: {topics}")
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    try:
+        await stop_event.wait()
+        logger.info(f"⏹️  [worker {worker_index}] 중단 요청")
+    finally:
+        # 처리 중인 메시지를 끝내고 오프셋을 커밋한 뒤 브로커 종료
+        for consumer, _ in consumers:
+            await consumer.stop_consuming()
+        await kafka_broker.close()
+        logger.info(f"✅ [worker {worker_index}] Kafka Consumer 중단 완료")
+
+
+def _run_worker(topics: List[str], worker_index: int):
+    """자식 프로세스 진입점"""
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(consume(topics, worker_index))
+
+
+def run(topics: List[str], workers: int = 1):
+    """
+    토픽 소비 프로세스 실행
+
+    Args:
+        topics: 구독할 토픽 목록
+        workers: 실행할 프로세스 수 (1이면 현재 프로세스에서 실행)
+    """
+    unknown = [topic for topic in topics if topic not in TOPIC_HANDLERS]
+    if unknown:
+        raise ValueError(f"핸들러가 없는 토픽입니다: {unknown}")
+
+    if workers <= 1:
+        asyncio.run(consume(topics))
+        return
+
+    # spawn으로 실행해 부모 프로세스의 이벤트 루프나 커넥션을 물려받지 않도록 함
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_run_worker, args=(topics, index), name=f"kafka-worker-{index}")
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    logger.info(f"🚀 Kafka Consumer 프로세스 {workers}개 시작: {topics}")
+
+    def _forward_signal(signum, frame):
+        logger.info(f"⏹️  종료 신호 수신 ({signal.Signals(signum).name}), 워커 프로세스에 전달")
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGINT, _forward_signal)
+    signal.signal(signal.SIGTERM, _forward_signal)
+
+    for process in processes:
+        process.join()
+        if process.exitcode:
+            logger.error(f"❌ {process.name} 비정상 종료 (exit code: {process.exitcode})")
+    logger.info("✅ 모든 Kafka Consumer 프로세스 종료 완료")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="통합 Kafka Consumer 실행기")
+    parser.add_argument(
+        "--topics",
+        default=",".join([kafka_config.overview_topic_v2, kafka_config.analysis_topic_v2, kafka_config.idea_topic_v2]),
+        help="구독할 토픽 목록 (쉼표로 구분)",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="실행할 프로세스 수")
+    args = parser.parse_args()
+
+    topics = [topic.strip() for topic in args.topics.split(",") if topic.strip()]
+    run(topics, workers=args.workers)
+
+
+if __name__ == '__main__':
+    main()
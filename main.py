@@ -1,9 +1,10 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from core.config.database_config import test_pg_connection, test_mysql_connection
 from domain.report.controller.report_controller import router as report_router
 from response.code.status.success_status import SuccessStatus
 from response.api_response import ApiResponse
 from core.kafka.kafka_broker import kafka_broker
+from core.utils.metrics import metrics_response
 
 '''
 서버 시작 명령어: fastapi dev main.py
@@ -47,4 +48,8 @@ async def health_check():
     """Docker 헬스체크용 엔드포인트"""
     return ApiResponse.on_success(SuccessStatus._OK, {"status": "UP"})
 
-
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 메트릭 엔드포인트"""
+    body, content_type = metrics_response()
+    return Response(content=body, media_type=content_type)
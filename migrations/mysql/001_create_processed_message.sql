@@ -0,0 +1,15 @@
+-- 메시지 중복 처리 방지용 처리 이력 테이블
+-- (task_id, step) 단위로 한 번만 처리되도록 consumer가 선점(IN_PROGRESS) 후 결과(COMPLETED/FAILED)를 기록
+CREATE TABLE IF NOT EXISTS processed_message (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    task_id BIGINT NOT NULL,
+    -- overview, analysis, idea
+    step VARCHAR(50) NOT NULL,
+    -- IN_PROGRESS, COMPLETED, FAILED
+    status VARCHAR(20) NOT NULL,
+    -- 선점 시각 (오래된 IN_PROGRESS는 다른 consumer가 다시 선점 가능)
+    claimed_at DATETIME(6) NOT NULL,
+    created_at DATETIME(6),
+    updated_at DATETIME(6),
+    CONSTRAINT uk_processed_message_task_step UNIQUE (task_id, step)
+);
@@ -0,0 +1,19 @@
+-- 보고서 파이프라인 단계별 결과 테이블
+-- (report_id, step) 단위로 결과를 저장해 재시도 시 실패했거나 입력이 바뀐 단계만 다시 실행
+CREATE TABLE IF NOT EXISTS report_step_result (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    report_id BIGINT NOT NULL,
+    -- transcript, comments_fetch, classification, comment_summary, summary, metrics, leave_analysis, optimization, trends, ideas
+    step VARCHAR(50) NOT NULL,
+    -- in_progress, completed, failed
+    status VARCHAR(20) NOT NULL,
+    -- 단계 입력(의존 단계 결과, 설정, 버전) 해시
+    fingerprint CHAR(64) NOT NULL,
+    -- 단계 결과 (JSON)
+    output LONGTEXT,
+    -- 선점 시각 (오래된 in_progress는 다른 consumer가 다시 선점 가능)
+    claimed_at DATETIME(6) NOT NULL,
+    created_at DATETIME(6),
+    updated_at DATETIME(6),
+    CONSTRAINT uk_report_step_result_report_step UNIQUE (report_id, step)
+);
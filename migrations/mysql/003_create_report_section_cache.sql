@@ -0,0 +1,14 @@
+-- 리포트 섹션 결과 캐시 테이블
+-- 섹션 입력 지문 단위로 LLM 결과를 저장해 같은 영상의 리포트를 다시 만들 때 재사용
+CREATE TABLE IF NOT EXISTS report_section_cache (
+    -- 섹션 입력(자막/댓글 해시, 통계 구간, 프롬프트 버전, 모델 이름 등) 해시
+    fingerprint CHAR(64) PRIMARY KEY,
+    -- summary, comment_classification, comment_summary, optimization, ideas
+    section VARCHAR(50) NOT NULL,
+    -- 섹션 결과 (JSON)
+    output LONGTEXT NOT NULL,
+    expires_at DATETIME(6) NOT NULL,
+    created_at DATETIME(6),
+    updated_at DATETIME(6),
+    INDEX idx_report_section_cache_expires_at (expires_at)
+);
@@ -0,0 +1,19 @@
+-- 리포트 LLM / 임베딩 사용량 테이블
+-- (report_id, step, kind, model) 단위로 토큰 수, 호출 시간, 예상 비용을 누적 (재시도하면 더해짐)
+CREATE TABLE IF NOT EXISTS report_usage (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    report_id BIGINT NOT NULL,
+    -- transcript, summary, classification, comment_summary, optimization, trends, ideas, ...
+    step VARCHAR(50) NOT NULL,
+    -- llm, embedding
+    kind VARCHAR(20) NOT NULL,
+    model VARCHAR(100) NOT NULL,
+    calls INT NOT NULL DEFAULT 0,
+    prompt_tokens BIGINT NOT NULL DEFAULT 0,
+    completion_tokens BIGINT NOT NULL DEFAULT 0,
+    latency_ms DOUBLE NOT NULL DEFAULT 0,
+    cost_usd DECIMAL(12, 6) NOT NULL DEFAULT 0,
+    created_at DATETIME(6),
+    updated_at DATETIME(6),
+    CONSTRAINT uk_report_usage_report_step_kind_model UNIQUE (report_id, step, kind, model)
+);
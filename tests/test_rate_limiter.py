@@ -0,0 +1,149 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from core.utils import rate_limiter
+from core.utils.rate_limiter import (
+    LocalBucketState,
+    RateLimitCallbackHandler,
+    TokenBucketRateLimiter,
+    _refill,
+    _shortfall_seconds,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock)
+    return clock
+
+
+def _tokens(limiter: TokenBucketRateLimiter) -> float:
+    return limiter.state._bucket(limiter.name, limiter.rpm, limiter.tpm)[1]
+
+
+def test_refill_is_proportional_to_elapsed_time_and_capped():
+    assert _refill(0.0, 0.0, 30, rpm=60, tpm=600) == (30.0, 300.0)
+    assert _refill(50.0, 500.0, 60, rpm=60, tpm=600) == (60.0, 600.0)
+
+
+def test_shortfall_seconds():
+    assert _shortfall_seconds(1.0, 600.0, 600, rpm=60, tpm=600) == 0
+    assert _shortfall_seconds(0.5, 600.0, 100, rpm=60, tpm=600) == pytest.approx(0.5)
+    assert _shortfall_seconds(5.0, 100.0, 400, rpm=60, tpm=600) == pytest.approx(30.0)
+
+
+def test_bucket_refills_over_time(clock):
+    limiter = TokenBucketRateLimiter("test", rpm=60, tpm=600, state=LocalBucketState())
+
+    asyncio.run(limiter.acquire_tokens(600))
+    assert _tokens(limiter) == 0
+
+    clock.now += 30
+    assert _tokens(limiter) == pytest.approx(300)
+    clock.now += 60
+    assert _tokens(limiter) == pytest.approx(600)
+
+
+def test_settle_returns_unused_and_charges_extra_tokens(clock):
+    limiter = TokenBucketRateLimiter("test", rpm=60, tpm=600, state=LocalBucketState(), estimated_tokens=100)
+
+    asyncio.run(limiter.acquire_tokens(200))
+    assert _tokens(limiter) == 400
+
+    # 예상(200)보다 덜 쓴 토큰은 반납
+    limiter.settle(50, 200)
+    assert _tokens(limiter) == 550
+    # 예상보다 더 쓴 토큰은 추가 차감
+    limiter.settle(300, 100)
+    assert _tokens(limiter) == 350
+    # 실제 사용량으로 예상 토큰 수(이동 평균) 갱신
+    assert limiter.estimated_tokens == int(int(100 * 0.9 + 50 * 0.1) * 0.9 + 300 * 0.1)
+
+
+def test_settle_never_exceeds_bucket_capacity(clock):
+    limiter = TokenBucketRateLimiter("test", rpm=60, tpm=600, state=LocalBucketState())
+
+    limiter.settle(0, 500)
+    assert _tokens(limiter) == 600
+
+
+def test_waiting_request_runs_after_refill():
+    limiter = TokenBucketRateLimiter("test", rpm=0, tpm=6000, state=LocalBucketState())
+
+    async def scenario():
+        await limiter.acquire_tokens(6000)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        # 버킷이 비었으므로 60토큰(0.6초)이 채워질 때까지 대기
+        await limiter.acquire_tokens(60)
+        return loop.time() - start
+
+    assert asyncio.run(scenario()) >= 0.5
+
+
+class _FakeChatModel(BaseChatModel):
+    """호출 중에 다른 호출이 예상 토큰 수를 바꾼 상황을 흉내 내는 모델"""
+
+    limiter: TokenBucketRateLimiter
+    total_tokens: int = 150
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.limiter.estimated_tokens = 5000
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content="ok"))],
+            llm_output={"token_usage": {"prompt_tokens": 100, "completion_tokens": self.total_tokens - 100}},
+        )
+
+
+@pytest.fixture
+def chat_limiter(monkeypatch, clock):
+    limiter = TokenBucketRateLimiter("test_chat", rpm=60, tpm=6000, state=LocalBucketState(), estimated_tokens=1000)
+    monkeypatch.setattr(rate_limiter, "chat_rate_limiter", limiter)
+    return limiter
+
+
+def test_callback_settles_against_amount_reserved_for_the_run(chat_limiter):
+    llm = _FakeChatModel(limiter=chat_limiter, rate_limiter=chat_limiter, callbacks=[RateLimitCallbackHandler()])
+
+    asyncio.run(llm.ainvoke("질문"))
+
+    # 호출 전 1000 토큰을 차감하고 실제로 150 토큰을 썼으므로 850 토큰 반납 (바뀐 예상치 5000과 무관)
+    assert _tokens(chat_limiter) == 6000 - 150
+    assert chat_limiter._reservations == {}
+
+
+def test_callback_settles_sync_calls(chat_limiter):
+    llm = _FakeChatModel(limiter=chat_limiter, rate_limiter=chat_limiter, callbacks=[RateLimitCallbackHandler()])
+
+    llm.invoke("질문")
+
+    assert _tokens(chat_limiter) == 6000 - 150
+    assert chat_limiter._reservations == {}
+
+
+def test_callback_skips_runs_without_reservation(chat_limiter):
+    handler = RateLimitCallbackHandler()
+    result = ChatResult(generations=[], llm_output={"token_usage": {"prompt_tokens": 100, "completion_tokens": 50}})
+
+    # 캐시 응답처럼 acquire 없이 끝난 호출은 정산하지 않음
+    handler.on_llm_end(result, run_id=uuid4())
+
+    assert _tokens(chat_limiter) == 6000
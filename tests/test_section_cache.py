@@ -0,0 +1,62 @@
+import asyncio
+from typing import Dict, Optional
+
+from core.utils.llm_cache import bypass_llm_cache
+from core.utils.section_cache import SectionCache, SectionCacheStore, prompt_version, stats_bucket
+
+
+class _MemoryStore(SectionCacheStore):
+    def __init__(self):
+        self.results: Dict[str, str] = {}
+
+    async def find(self, fingerprint: str) -> Optional[str]:
+        return self.results.get(fingerprint)
+
+    async def put(self, fingerprint: str, section: str, output: str, ttl_seconds: int):
+        self.results[fingerprint] = output
+
+
+def _compute(calls: list):
+    async def compute():
+        calls.append(len(calls) + 1)
+        return {"result": len(calls)}
+    return compute
+
+
+def test_same_inputs_reuse_stored_result():
+    cache = SectionCache(_MemoryStore())
+    calls: list = []
+
+    async def scenario():
+        first = await cache.get_or_compute("summary", {"transcript": "a"}, _compute(calls))
+        second = await cache.get_or_compute("summary", {"transcript": "a"}, _compute(calls))
+        changed = await cache.get_or_compute("summary", {"transcript": "b"}, _compute(calls))
+        return first, second, changed
+
+    assert asyncio.run(scenario()) == ({"result": 1}, {"result": 1}, {"result": 2})
+
+
+def test_bypass_recomputes_and_refreshes_stored_result():
+    cache = SectionCache(_MemoryStore())
+    calls: list = []
+
+    async def scenario():
+        await cache.get_or_compute("summary", {"transcript": "a"}, _compute(calls))
+        with bypass_llm_cache():
+            regenerated = await cache.get_or_compute("summary", {"transcript": "a"}, _compute(calls))
+        reused = await cache.get_or_compute("summary", {"transcript": "a"}, _compute(calls))
+        return regenerated, reused
+
+    # 다시 생성 요청은 저장된 결과를 쓰지 않고, 새 결과가 이후 요청에 재사용됨
+    assert asyncio.run(scenario()) == ({"result": 2}, {"result": 2})
+
+
+def test_prompt_version_includes_query():
+    assert prompt_version("template") == prompt_version("template")
+    assert prompt_version("template", "질문 1") != prompt_version("template", "질문 2")
+
+
+def test_stats_bucket_rounds_to_two_significant_digits():
+    assert stats_bucket(12345) == 12000
+    assert stats_bucket("987") == 990
+    assert stats_bucket(None) == 0
@@ -0,0 +1,55 @@
+from core.llm.response_models import CommentEmotion, CommentEmotionBatch, Idea, IdeaList
+from core.llm.structured_output import PartialArrayParser, item_model, parse_items
+
+
+def test_item_model():
+    assert item_model(CommentEmotionBatch) is CommentEmotion
+    assert item_model(IdeaList) is Idea
+
+
+def test_feed_returns_items_as_they_complete():
+    parser = PartialArrayParser(CommentEmotion)
+    text = '{"items": [{"id": 1, "emotion": 1}, {"id": 2, "emotion": 4}]}'
+
+    fed = [parser.feed(text[i:i + 7]) for i in range(0, len(text), 7)]
+
+    assert [item.id for chunk in fed for item in chunk] == [1, 2]
+    assert [item.id for item in parser.items] == [1, 2]
+    assert parser.completed
+
+
+def test_strings_with_brackets_and_escaped_quotes():
+    parser = PartialArrayParser(Idea)
+    parser.feed('{"items": [{"title": "a}]\\"{", "description": "[x]", "tags": ["}"]}]}')
+
+    assert len(parser.items) == 1
+    assert parser.items[0].title == 'a}]"{'
+    assert parser.items[0].tags == ["}"]
+    assert parser.completed
+
+
+def test_truncated_response_keeps_completed_items():
+    items = parse_items('{"items": [{"id": 1, "emotion": 2}, {"id": 2, "emo', CommentEmotion)
+
+    assert [(item.id, item.emotion) for item in items] == [(1, 2)]
+
+
+def test_invalid_items_are_dropped_and_counted():
+    parser = PartialArrayParser(CommentEmotion)
+    parser.feed('{"items": [{"id": 1, "emotion": 9}, {"id": 2, "emotion": 3}]}')
+
+    assert [item.id for item in parser.items] == [2]
+    assert parser.invalid == 1
+
+
+def test_bare_array_in_code_fence():
+    items = parse_items('```json\n[{"id": 5, "emotion": 3}]\n```', CommentEmotion)
+
+    assert [item.id for item in items] == [5]
+
+
+def test_text_without_array_yields_nothing():
+    parser = PartialArrayParser(CommentEmotion)
+
+    assert parser.feed("응답을 생성할 수 없습니다.") == []
+    assert not parser.completed
@@ -0,0 +1,81 @@
+import asyncio
+import re
+
+import pytest
+
+from core.llm.outline_stream import OutlineMerger, _to_roman
+from core.llm.transcript_segments import amap_segments, plan_segments, split_transcript
+from core.utils.rate_limiter import estimate_tokens
+
+
+def _transcript(lines: int) -> str:
+    return "\n".join(f"자막 문장 {i} 입니다. (0:{i % 60:02d} - 0:{(i + 1) % 60:02d})" for i in range(lines))
+
+
+class _FakeSummarizer:
+    """구간 요약 LLM 호출만 흉내 내는 함수 (앞 구간일수록 늦게 끝나도록 지연)"""
+
+    def __init__(self, segments: int):
+        self.segments = segments
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, index: int, segment: str) -> str:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01 * (self.segments - index))
+        self.running -= 1
+        return f"다음은 개요입니다:\n\nI. 구간 {index + 1}\n{segment.splitlines()[0]}\n"
+
+
+def test_plan_segments_single_shot_under_budget():
+    transcript = _transcript(5)
+    assert plan_segments(transcript, 500, 200) == [transcript]
+
+
+def test_plan_segments_splits_over_budget():
+    transcript = _transcript(80)
+    segments = plan_segments(transcript, 500, 200)
+
+    assert estimate_tokens(transcript) > 500
+    assert segments == split_transcript(transcript, 200)
+    assert all(sum(estimate_tokens(line) for line in segment.splitlines()) <= 200 for segment in segments)
+
+
+def test_map_reduce_summary_keeps_segment_order():
+    segments = plan_segments(_transcript(80), 500, 200)
+    summarize = _FakeSummarizer(len(segments))
+
+    async def run() -> str:
+        merger = OutlineMerger()
+        return "".join([merger.add(outline) async for outline in amap_segments(segments, summarize, 2)]).strip()
+
+    summary = asyncio.run(run())
+
+    headers = re.findall(r"^([IVXLC]+)\. 구간 (\d+)$", summary, re.MULTILINE)
+    assert headers == [(_to_roman(index), str(index)) for index in range(1, len(segments) + 1)]
+    assert summarize.max_running <= 2
+
+
+def test_amap_segments_cancels_remaining_segments_on_failure():
+    started = []
+    cancelled = []
+
+    async def summarize(index: int, segment: str) -> str:
+        started.append(index)
+        if index == 0:
+            raise RuntimeError("요약 실패")
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(index)
+            raise
+        return segment
+
+    async def run():
+        async for _ in amap_segments(["a", "b", "c"], summarize, 3):
+            pass
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+    assert cancelled == [1, 2]
@@ -0,0 +1,51 @@
+import re
+
+from core.llm.outline_stream import OutlineMerger
+from core.llm.transcript_segments import segment_time_range, split_transcript
+from core.utils.rate_limiter import estimate_tokens
+
+
+def _transcript(lines: int) -> str:
+    return "\n".join(f"자막 문장 {i} 입니다. ({i // 6}:{(i * 10) % 60:02d} - {(i + 1) // 6}:{((i + 1) * 10) % 60:02d})" for i in range(lines))
+
+
+def test_split_transcript_keeps_segments_within_budget():
+    transcript = _transcript(200)
+    segments = split_transcript(transcript, 300)
+
+    assert len(segments) > 1
+    for segment in segments:
+        assert sum(estimate_tokens(line) for line in segment.splitlines()) <= 300
+    # 자막 줄 경계에서만 나누므로 이어 붙이면 원래 자막과 같음
+    assert "\n".join(segments) == transcript
+
+
+def test_split_transcript_keeps_oversized_line_as_its_own_segment():
+    long_line = "가" * 1000 + " (0:00 - 0:10)"
+    segments = split_transcript(f"짧은 줄 (0:00 - 0:05)\n{long_line}\n짧은 줄 (0:10 - 0:15)", 50)
+
+    assert segments == ["짧은 줄 (0:00 - 0:05)", long_line, "짧은 줄 (0:10 - 0:15)"]
+
+
+def test_split_transcript_skips_blank_lines():
+    assert split_transcript("\n첫 줄\n\n  \n둘째 줄\n", 1000) == ["첫 줄\n둘째 줄"]
+
+
+def test_segment_time_range():
+    assert segment_time_range("첫 줄 (0:00 - 0:05)\n마지막 줄 (1:02:10 - 1:02:15)") == ("0:00", "1:02:15")
+    assert segment_time_range("시간 없는 줄") is None
+
+
+def test_outline_merger_renumbers_sections_in_order():
+    merger = OutlineMerger()
+    merged = "".join([
+        merger.add("다음은 개요입니다:\n\nI. 도입 (0:00 - 0:20)\n내용\n\nII. 본론 (0:20 - 0:40)\n내용\n"),
+        merger.add("다음은 개요입니다:\n\nI. 전개 (0:40 - 1:00)\n내용\n\n## II. 결론 (1:00 - 1:20)\n내용\n"),
+    ]).strip()
+
+    assert re.findall(r"^[ #]*([IVXLC]+)\. (\S+)", merged, re.MULTILINE) == [
+        ("I", "도입"), ("II", "본론"), ("III", "전개"), ("IV", "결론"),
+    ]
+    # 안내 문장은 첫 구간 것만 유지
+    assert merged.count("다음은 개요입니다") == 1
+    assert merger.sections == 4
@@ -0,0 +1,83 @@
+import argparse
+import json
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+'''
+리포트 처리 구간(trace) 조회 명령어
+    TRACE_EXPORTER=jsonl python kafka_runner.py ...   # 구간을 traces.jsonl에 기록
+    python trace_report.py --input traces.jsonl --report-id 123 --chrome report-123.json
+
+- 지정한 report_id의 구간을 부모/자식 트리와 소요 시간으로 출력합니다.
+- --chrome 으로 Chrome Trace Event 형식 파일을 만들면 chrome://tracing 또는 https://ui.perfetto.dev 에서 플레임 차트로 볼 수 있습니다.
+'''
+
+
+def load_spans(path: str, report_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """JSONL 파일에서 구간 조회 (report_id를 지정하면 해당 리포트의 trace에 속한 구간만)"""
+    with open(path, encoding="utf-8") as f:
+        spans = [json.loads(line) for line in f if line.strip()]
+    if report_id is None:
+        return spans
+    trace_ids = {
+        span["trace_id"] for span in spans
+        if str(span.get("attributes", {}).get("report_id")) == str(report_id)
+    }
+    return [span for span in spans if span["trace_id"] in trace_ids]
+
+
+def to_chrome_trace(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Chrome Trace Event 형식으로 변환 (trace 하나를 한 줄(tid)에 표시)"""
+    tids = {trace_id: index for index, trace_id in enumerate(sorted({span["trace_id"] for span in spans}))}
+    return {
+        "traceEvents": [
+            {
+                "name": span["name"],
+                "ph": "X",
+                "ts": span["start_ns"] / 1000,
+                "dur": ((span["end_ns"] or span["start_ns"]) - span["start_ns"]) / 1000,
+                "pid": 1,
+                "tid": tids[span["trace_id"]],
+                "args": {**span.get("attributes", {}), "status": span.get("status"), "error": span.get("error")},
+            }
+            for span in spans
+        ],
+        "displayTimeUnit": "ms",
+    }
+
+
+def print_tree(spans: List[Dict[str, Any]]):
+    """부모/자식 트리와 소요 시간 출력"""
+    span_ids = {span["span_id"] for span in spans}
+    children = defaultdict(list)
+    for span in spans:
+        parent_id = span.get("parent_id") if span.get("parent_id") in span_ids else None
+        children[parent_id].append(span)
+
+    def visit(span: Dict[str, Any], depth: int):
+        mark = " ❌" if span.get("status") == "error" else ""
+        print(f"{'  ' * depth}{span['name']} {span['duration_ms'] / 1000:.2f}초{mark}")
+        for child in sorted(children[span["span_id"]], key=lambda item: item["start_ns"]):
+            visit(child, depth + 1)
+
+    for root in sorted(children[None], key=lambda item: item["start_ns"]):
+        visit(root, 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="리포트 처리 구간 조회")
+    parser.add_argument("--input", default="traces.jsonl", help="JsonlSpanExporter가 기록한 파일")
+    parser.add_argument("--report-id", type=int, default=None, help="조회할 report_id (없으면 전체)")
+    parser.add_argument("--chrome", default=None, help="Chrome Trace Event 형식으로 저장할 파일")
+    args = parser.parse_args()
+
+    spans = load_spans(args.input, args.report_id)
+    print_tree(spans)
+    if args.chrome:
+        with open(args.chrome, "w", encoding="utf-8") as f:
+            json.dump(to_chrome_trace(spans), f, ensure_ascii=False)
+        print(f"플레임 차트 파일 저장: {args.chrome} ({len(spans)}개 구간)")
+
+
+if __name__ == '__main__':
+    main()